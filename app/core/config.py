@@ -23,6 +23,54 @@ class Settings:
     def openai_max_tokens(self) -> int:
         return int(os.getenv("OPENAI_MAX_TOKENS", "4096"))
 
+    @property
+    def llm_stream_enabled(self) -> bool:
+        return os.getenv("LLM_STREAM_ENABLED", "false").lower() in ("true", "1", "yes")
+
+    @property
+    def llm_adaptive_max_tokens(self) -> bool:
+        return os.getenv("LLM_ADAPTIVE_MAX_TOKENS", "true").lower() in ("true", "1", "yes")
+
+    @property
+    def llm_min_max_tokens(self) -> int:
+        return int(os.getenv("LLM_MIN_MAX_TOKENS", "64"))
+
+    @property
+    def lazy_game_start(self) -> bool:
+        return os.getenv("LAZY_GAME_START", "false").lower() in ("true", "1", "yes")
+
+    @property
+    def game_token_expire_minutes(self) -> int:
+        return int(os.getenv("GAME_TOKEN_EXPIRE_MINUTES", "120"))
+
+    @property
+    def answer_cache_backend(self) -> str:
+        return os.getenv("ANSWER_CACHE_BACKEND", "memory").lower()
+
+    @property
+    def answer_cache_max_entries(self) -> int:
+        return int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "10000"))
+
+    @property
+    def answer_cache_ttl_seconds(self) -> float:
+        return float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+
+    @property
+    def answer_cache_path(self) -> str:
+        return os.getenv("ANSWER_CACHE_PATH", "answer_cache.db")
+
+    @property
+    def llm_hedge_enabled(self) -> bool:
+        return os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("true", "1", "yes")
+
+    @property
+    def llm_hedge_delay(self) -> float:
+        return float(os.getenv("LLM_HEDGE_DELAY", "1.5"))
+
+    @property
+    def llm_hedge_max_requests(self) -> int:
+        return int(os.getenv("LLM_HEDGE_MAX_REQUESTS", "3"))
+
     @property
     def root_password(self) -> str:
         return os.getenv("ROOT_PASSWORD", "change_me_on_first_login")
@@ -42,6 +90,114 @@ class Settings:
     def access_token_expire_minutes(self) -> int:
         return int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
+    @property
+    def auth_cache_ttl_seconds(self) -> float:
+        return float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+
+    @property
+    def auth_cache_max_entries(self) -> int:
+        return int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+    @property
+    def auth_token_claims(self) -> bool:
+        return os.getenv("AUTH_TOKEN_CLAIMS", "false").lower() in ("true", "1", "yes")
+
+    @property
+    def password_pool_kind(self) -> str:
+        return os.getenv("PASSWORD_POOL_KIND", "thread")
+
+    @property
+    def password_pool_workers(self) -> int:
+        return int(os.getenv("PASSWORD_POOL_WORKERS", "4"))
+
+    @property
+    def password_pool_max_queue(self) -> int:
+        return int(os.getenv("PASSWORD_POOL_MAX_QUEUE", "64"))
+
+    @property
+    def database_url(self) -> str:
+        return os.getenv("DATABASE_URL", "sqlite:///database.db")
+
+    @property
+    def database_async(self) -> str:
+        return os.getenv("DATABASE_ASYNC", "auto").lower()
+
+    @property
+    def db_pool_size(self) -> int:
+        return int(os.getenv("DB_POOL_SIZE", "20"))
+
+    @property
+    def db_max_overflow(self) -> int:
+        return int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+    @property
+    def db_pool_timeout(self) -> float:
+        return float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+    @property
+    def db_pool_recycle(self) -> int:
+        return int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    @property
+    def db_pool_pre_ping(self) -> bool:
+        return os.getenv("DB_POOL_PRE_PING", "true").lower() in ("true", "1", "yes")
+
+    @property
+    def db_auto_migrate(self) -> bool:
+        return os.getenv("DB_AUTO_MIGRATE", "true").lower() in ("true", "1", "yes")
+
+    @property
+    def move_group_commit(self) -> bool:
+        return os.getenv("MOVE_GROUP_COMMIT", "false").lower() in ("true", "1", "yes")
+
+    @property
+    def move_group_commit_delay_ms(self) -> float:
+        return float(os.getenv("MOVE_GROUP_COMMIT_DELAY_MS", "5"))
+
+    @property
+    def move_group_commit_max_batch(self) -> int:
+        return int(os.getenv("MOVE_GROUP_COMMIT_MAX_BATCH", "64"))
+
+    @property
+    def reaper_interval_seconds(self) -> float:
+        return float(os.getenv("REAPER_INTERVAL_SECONDS", "3600"))
+
+    @property
+    def reaper_lock_file(self) -> str:
+        return os.getenv("REAPER_LOCK_FILE", "reaper.lock")
+
+    @property
+    def abandoned_session_ttl_seconds(self) -> float:
+        return float(os.getenv("ABANDONED_SESSION_TTL_SECONDS", "86400"))
+
+    @property
+    def game_archive_after_days(self) -> float:
+        return float(os.getenv("GAME_ARCHIVE_AFTER_DAYS", "30"))
+
+    @property
+    def sqlite_journal_mode(self) -> str:
+        return os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+
+    @property
+    def sqlite_synchronous(self) -> str:
+        return os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+
+    @property
+    def sqlite_busy_timeout_ms(self) -> int:
+        return int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    @property
+    def sqlite_cache_size_kib(self) -> int:
+        return int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+
+    @property
+    def sqlite_mmap_size(self) -> int:
+        return int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    @property
+    def metrics_enabled(self) -> bool:
+        return os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "yes")
+
     @property
     def debug(self) -> bool:
         return os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
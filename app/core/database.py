@@ -0,0 +1,187 @@
+"""
+Database engine factory.
+Builds the SQLAlchemy engines from Settings, with SQLite pragmas applied on
+every new connection and the connection pool sized from configuration.
+
+Requests use an async session (aiosqlite or asyncpg) when the driver for
+DATABASE_URL is installed, and otherwise a sync Session behind the same
+awaitable interface, with each call run in the thread pool.
+"""
+
+import importlib.util
+from collections.abc import Callable, Sequence
+from typing import Any, Optional, TypeVar, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def sqlite_pragmas(in_memory: bool = False) -> dict[str, object]:
+    """Pragmas run on each new SQLite connection, in order."""
+    pragmas: dict[str, object] = {
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "synchronous": settings.sqlite_synchronous,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.sqlite_cache_size_kib,
+    }
+    if not in_memory:
+        pragmas = {
+            "journal_mode": settings.sqlite_journal_mode,
+            **pragmas,
+            "mmap_size": settings.sqlite_mmap_size,
+        }
+    return pragmas
+
+
+def _engine_options(url: URL, kwargs: dict[str, Any]) -> bool:
+    """Fill in connect and pool kwargs for url; returns whether it is SQLite."""
+    is_sqlite = url.get_backend_name() == "sqlite"
+    if is_sqlite:
+        connect_args = kwargs.setdefault("connect_args", {})
+        connect_args.setdefault("check_same_thread", False)
+    else:
+        kwargs.setdefault("pool_recycle", settings.db_pool_recycle)
+        kwargs.setdefault("pool_pre_ping", settings.db_pool_pre_ping)
+    if not _is_memory(url) and "poolclass" not in kwargs:
+        kwargs.setdefault("pool_size", settings.db_pool_size)
+        kwargs.setdefault("max_overflow", settings.db_max_overflow)
+        kwargs.setdefault("pool_timeout", settings.db_pool_timeout)
+    return is_sqlite
+
+
+def _is_memory(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _install_pragmas(engine: Engine, url: URL) -> None:
+    pragmas = sqlite_pragmas(_is_memory(url))
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def sync_url(database_url: str) -> URL:
+    """database_url with any async driver replaced by the default sync one."""
+    url = make_url(database_url)
+    return url.set(drivername=url.get_backend_name())
+
+
+def async_url(database_url: str) -> Optional[URL]:
+    """The async-driver form of database_url, or None if unavailable or disabled."""
+    mode = settings.database_async
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    # An in-memory database is private to its connection, so it cannot be
+    # shared between a sync and an async engine.
+    if mode == "false" or driver is None or _is_memory(url):
+        return None
+    if importlib.util.find_spec(driver) is None:
+        if mode == "true":
+            raise RuntimeError(f"DATABASE_ASYNC=true but {driver} is not installed")
+        return None
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}")
+
+
+def create_db_engine(database_url: Optional[str] = None, **kwargs: Any) -> Engine:
+    """
+    Create the sync engine for database_url (default: DATABASE_URL).
+
+    File-backed and server databases get a QueuePool of DB_POOL_SIZE
+    connections plus DB_MAX_OVERFLOW, per worker process; server connections
+    are also recycled after DB_POOL_RECYCLE seconds and pinged before use.
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    Extra kwargs go to create_engine.
+    """
+    url = sync_url(database_url or settings.database_url)
+    is_sqlite = _engine_options(url, kwargs)
+    engine = create_engine(url, **kwargs)
+    if is_sqlite:
+        _install_pragmas(engine, url)
+    return engine
+
+
+def create_async_db_engine(database_url: Optional[str] = None, **kwargs: Any) -> AsyncEngine:
+    """Create the async engine for database_url, with the same pool and pragmas."""
+    url = async_url(database_url or settings.database_url)
+    if url is None:
+        raise RuntimeError("No async driver available for DATABASE_URL")
+    is_sqlite = _engine_options(url, kwargs)
+    engine = create_async_engine(url, **kwargs)
+    if is_sqlite:
+        _install_pragmas(engine.sync_engine, url)
+    return engine
+
+
+class SyncSessionAdapter:
+    """
+    A sync Session behind the awaitable subset of AsyncSession the app uses.
+
+    Statement execution and commits run in the thread pool, so a sync driver
+    never blocks the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: object) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Sequence[object]) -> None:
+        self.sync_session.add_all(instances)
+
+    def in_transaction(self) -> bool:
+        return self.sync_session.in_transaction()
+
+    def get_bind(self) -> Any:
+        return self.sync_session.get_bind()
+
+    async def get(self, entity: type[T], ident: Any) -> Optional[T]:
+        return await run_in_threadpool(self.sync_session.get, entity, ident)
+
+    async def exec(self, statement: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.exec, statement)
+
+    async def execute(self, statement: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.execute, statement)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance: object) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, func: Callable[..., T], *args: Any) -> T:
+        return await run_in_threadpool(func, self.sync_session, *args)
+
+
+DBSession = Union[AsyncSession, SyncSessionAdapter]
+
+
+def sibling_session(db: DBSession) -> DBSession:
+    """A new session of the same kind as db, on the same engine."""
+    if isinstance(db, SyncSessionAdapter):
+        return SyncSessionAdapter(Session(db.get_bind(), expire_on_commit=False))
+    return AsyncSession(db.bind, expire_on_commit=False)
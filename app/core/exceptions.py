@@ -148,6 +148,23 @@ class MaxQuestionsReachedError(GameError):
         super().__init__(detail="Maximum questions reached")
 
 
+class ConcurrentMoveError(GameError):
+    """Raised when another request wrote this game's move for the same round first."""
+
+    def __init__(self):
+        super().__init__(
+            detail="Another question for this game was answered at the same time, please try again",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+
+class InvalidGameTokenError(GameError):
+    """Raised when a game token is malformed, tampered with or expired."""
+
+    def __init__(self):
+        super().__init__(detail="Invalid or expired game token")
+
+
 class UnauthorizedGameAccessError(AuthorizationError):
     """Raised when user tries to access another user's game."""
 
@@ -204,3 +221,14 @@ class DatabaseError(AppException):
 
     def __init__(self, detail: str = "Database operation failed"):
         super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
+
+
+class PasswordServiceBusyError(AppException):
+    """Raised when the password worker pool queue is full."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
@@ -7,8 +7,11 @@ from datetime import datetime
 from typing import Any, Dict
 
 from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
+from app.core.metrics import route_metrics
+
 router = APIRouter(tags=["Health"])
 
 
@@ -65,12 +68,12 @@ async def readiness_check():
 
     # Check database
     try:
-        from sqlmodel import Session, text
+        from sqlmodel import text
 
-        from app.models import engine
+        from app.models import open_session
 
-        with Session(engine) as session:
-            session.exec(text("SELECT 1"))
+        async with open_session() as session:
+            await session.execute(text("SELECT 1"))
         checks["database"] = {"status": "healthy", "message": "Database connection OK"}
     except Exception as e:
         checks["database"] = {"status": "unhealthy", "message": str(e)}
@@ -104,3 +107,17 @@ async def readiness_check():
         timestamp=datetime.utcnow().isoformat() + "Z",
         checks=checks,
     )
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus Metrics",
+    description="Per-route request counts, latency and cost breakdown in Prometheus format",
+)
+async def metrics():
+    """
+    Prometheus scrape endpoint.
+    Returns the per-route totals recorded by MetricsMiddleware.
+    """
+    return PlainTextResponse(route_metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,218 @@
+"""
+Per-route request costs in Prometheus text format.
+
+MetricsMiddleware gives each HTTP request a RequestCost in a context variable.
+SQLAlchemy cursor events add each query's count and time to it, and the LLM
+call, the Random god's delay and bcrypt add their wall time through timed().
+When the response is done, the costs are added to the totals of the
+request's route, and /metrics renders them. Recording costs a few
+perf_counter calls per query and request, so it stays on in production.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+# RequestCost fields exported as http_request_<name>_seconds_total
+TIMED = {
+    "db": "running database queries",
+    "llm": "waiting on LLM answers",
+    "random_delay": "waiting out the Random god's simulated delay",
+    "bcrypt": "hashing and verifying passwords, including the pool queue",
+}
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestCost:
+    """What one request has spent so far."""
+
+    __slots__ = ("queries", "db", "llm", "random_delay", "bcrypt")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db = 0.0
+        self.llm = 0.0
+        self.random_delay = 0.0
+        self.bcrypt = 0.0
+
+
+_current: ContextVar[Optional[RequestCost]] = ContextVar("request_cost", default=None)
+
+
+@contextmanager
+def timed(kind: str) -> Iterator[None]:
+    """Add the block's wall time to the current request's cost of that kind ("llm", ...)."""
+    cost = _current.get()
+    if cost is None:
+        yield
+        return
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(cost, kind, getattr(cost, kind) + time.perf_counter() - began)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+    cost = _current.get()
+    started = conn.info.get("metrics_query_started")
+    if cost is None or not started:
+        return
+    cost.queries += 1
+    cost.db += time.perf_counter() - started.pop()
+
+
+class Histogram:
+    """Prometheus histogram: per-bucket counts, their sum and their count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class RouteStats:
+    """Totals for one route and method."""
+
+    def __init__(self) -> None:
+        self.statuses: dict[int, int] = {}
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.seconds = dict.fromkeys(TIMED, 0.0)
+
+    def add(self, status: int, seconds: float, cost: RequestCost) -> None:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.duration.observe(seconds)
+        self.queries.observe(cost.queries)
+        for kind in TIMED:
+            self.seconds[kind] += getattr(cost, kind)
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+class RouteMetrics:
+    """Request costs per (method, route template); recorded and read on the event loop."""
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, cost: RequestCost):
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats()
+        stats.add(status, seconds, cost)
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        routes = sorted(self.routes.items())
+        lines = [
+            "# HELP http_requests_total HTTP requests by route, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(
+                    f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}'
+                )
+        lines += [
+            "# HELP http_request_duration_seconds Wall time of HTTP requests.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in routes:
+            lines += stats.duration.samples("http_request_duration_seconds", _labels(method, route))
+        lines += [
+            "# HELP http_request_db_queries Database queries per HTTP request.",
+            "# TYPE http_request_db_queries histogram",
+        ]
+        for (method, route), stats in routes:
+            lines += stats.queries.samples("http_request_db_queries", _labels(method, route))
+        for kind, help_text in TIMED.items():
+            name = f"http_request_{kind}_seconds_total"
+            lines += [
+                f"# HELP {name} Time HTTP requests spent {help_text}.",
+                f"# TYPE {name} counter",
+            ]
+            for (method, route), stats in routes:
+                lines.append(f"{name}{{{_labels(method, route)}}} {stats.seconds[kind]}")
+        return "\n".join(lines) + "\n"
+
+
+route_metrics = RouteMetrics()
+
+
+def _route_of(scope: Scope) -> str:
+    """The matched route's path template, so /history/{session_id} is one series."""
+    route: Any = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if isinstance(path, str) else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request's cost into route_metrics."""
+
+    def __init__(self, app: ASGIApp, metrics: RouteMetrics = route_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        cost = RequestCost()
+        token = _current.set(cost)
+        began = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - began
+            _current.reset(token)
+            self.metrics.record(scope["method"], _route_of(scope), status, seconds, cost)
@@ -1,21 +1,42 @@
 import asyncio
 import json
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Literal, Optional
 
-import bcrypt
 import jwt
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from sqlmodel import Session, col, select
 
 from app.core.config import settings
+from app.core.database import DBSession
 from app.core.health import router as health_router
 from app.core.logging import setup_logging
-from app.models import GameSession, User, create_db_and_tables, engine
+from app.core.metrics import MetricsMiddleware, timed
+from app.migrations import run_migrations
+from app.models import GameMove, GameSession, GameSessionArchive, User, engine, open_session
+from app.services.auth_cache import AuthPrincipal, auth_cache
 from app.services.game_service import game_engine
+from app.services.game_state import GameState
+from app.services.game_token import issue_game_token, read_game_token
+from app.services.llm_service import llm_service
+from app.services.password_service import hash_password, password_hasher
+from app.services.prompts import PromptTemplates
+from app.services.reaper import reaper
+from app.services.stats_service import global_stats, list_user_stats
 
 setup_logging(
     level=settings.log_level,
@@ -32,27 +53,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(MetricsMiddleware)
 
 
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
-
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+# How often streaming /game/ask variants send a progress event while waiting
+STREAM_HEARTBEAT_SECONDS = 1.0
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+async def get_db() -> AsyncIterator[DBSession]:
+    async with open_session() as session:
+        yield session
 
 
-def get_db():
-    with Session(engine) as session:
-        yield session
+async def load_principal(user_id: str, db: DBSession) -> Optional[AuthPrincipal]:
+    """The user's auth state from the cache, loading the User row on a miss."""
+    principal = auth_cache.get(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            return None
+        principal = AuthPrincipal.from_user(user)
+        auth_cache.set(principal)
+    return principal
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: DBSession = Depends(get_db)
+) -> AuthPrincipal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -66,21 +97,33 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except jwt.PyJWTError:
         raise credentials_exception
 
-    user = db.get(User, user_id)
-    if user is None:
+    principal = None
+    if settings.auth_token_claims and auth_cache.trusts_claims(user_id, payload.get("iat")):
+        principal = AuthPrincipal.from_claims(payload)
+    if principal is None:
+        principal = await load_principal(user_id, db)
+    if principal is None:
         raise credentials_exception
-    if user.is_disabled:
+    if principal.is_disabled:
         raise HTTPException(status_code=403, detail="User account is disabled")
+    return principal
+
+
+async def get_user_row(current_user: AuthPrincipal, db: DBSession) -> User:
+    """The full User row, for the few routes that need more than auth state."""
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
     return user
 
 
-def get_current_user_ready(current_user: User = Depends(get_current_user)):
+def get_current_user_ready(current_user: AuthPrincipal = Depends(get_current_user)):
     if current_user.must_change_password:
         raise HTTPException(status_code=403, detail="Password change required")
     return current_user
 
 
-def get_admin_user(current_user: User = Depends(get_current_user_ready)):
+def get_admin_user(current_user: AuthPrincipal = Depends(get_current_user_ready)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
@@ -113,13 +156,16 @@ class TutorialUpdateRequest(BaseModel):
 
 
 class AskQuestionRequest(BaseModel):
-    session_id: int
+    # A game is named by its session id, or by the game token of a lazy start
+    session_id: Optional[int] = None
+    game_token: Optional[str] = None
     god_index: int
     question: str
 
 
 class GuessRequest(BaseModel):
-    session_id: int
+    session_id: Optional[int] = None
+    game_token: Optional[str] = None
     guesses: list[str]
 
 
@@ -166,26 +212,39 @@ def init_root_user(db: Session):
 
 @app.on_event("startup")
 def on_startup():
-    create_db_and_tables()
+    if settings.db_auto_migrate:
+        run_migrations(engine)
+    PromptTemplates.precompute()
     with Session(engine) as db:
         init_root_user(db)
 
 
+@app.on_event("startup")
+async def start_reaper():
+    reaper.start(settings.reaper_interval_seconds)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await reaper.stop()
+    password_hasher.shutdown()
+
+
 @app.post("/register", response_model=TokenResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: DBSession = Depends(get_db)):
     if user_data.username.lower() == "root":
         raise HTTPException(status_code=400, detail="Cannot register with reserved username")
 
-    user = db.get(User, user_data.username)
+    user = await db.get(User, user_data.username)
     if user:
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await password_hasher.hash(user_data.password)
     new_user = User(id=user_data.username, hashed_password=hashed_pw)
     db.add(new_user)
-    db.commit()
+    await db.commit()
 
-    access_token = create_access_token(data={"sub": new_user.id})
+    access_token = issue_access_token(new_user)
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -195,14 +254,14 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @app.post("/token", response_model=TokenResponse)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.get(User, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: DBSession = Depends(get_db)):
+    user = await db.get(User, form_data.username)
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     if user.is_disabled:
         raise HTTPException(status_code=403, detail="User account is disabled")
 
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = issue_access_token(user)
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -211,32 +270,44 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     }
 
 
-def create_access_token(data: dict[str, object]):
+def create_access_token(data: dict[str, object]) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    now = datetime.utcnow()
+    expire = now + timedelta(minutes=settings.access_token_expire_minutes)
+    to_encode.update({"exp": expire, "iat": now})
+    encoded_jwt: str = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
+def issue_access_token(user: User) -> str:
+    data: dict[str, object] = {"sub": user.id}
+    if settings.auth_token_claims:
+        data.update(AuthPrincipal.from_user(user).to_claims())
+    return create_access_token(data)
+
+
 @app.get("/users/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: AuthPrincipal = Depends(get_current_user), db: DBSession = Depends(get_db)
+):
+    user = await get_user_row(current_user, db)
     return UserResponse(
-        id=current_user.id,
-        is_admin=current_user.is_admin,
-        must_change_password=current_user.must_change_password,
-        tutorial_completed=current_user.tutorial_completed,
-        created_at=current_user.created_at,
+        id=user.id,
+        is_admin=user.is_admin,
+        must_change_password=user.must_change_password,
+        tutorial_completed=user.tutorial_completed,
+        created_at=user.created_at,
     )
 
 
 @app.post("/auth/change-password")
 async def change_password(
     req: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user),
+    db: DBSession = Depends(get_db),
 ):
-    if not verify_password(req.current_password, current_user.hashed_password):
+    user = await get_user_row(current_user, db)
+    if not await password_hasher.verify(req.current_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
 
     if req.current_password == req.new_password:
@@ -245,10 +316,11 @@ async def change_password(
             detail="New password must be different from current password",
         )
 
-    current_user.hashed_password = hash_password(req.new_password)
-    current_user.must_change_password = False
-    db.add(current_user)
-    db.commit()
+    user.hashed_password = await password_hasher.hash(req.new_password)
+    user.must_change_password = False
+    db.add(user)
+    await db.commit()
+    auth_cache.invalidate(user.id)
 
     return {"message": "Password changed successfully"}
 
@@ -256,113 +328,269 @@ async def change_password(
 @app.patch("/users/me/tutorial")
 async def update_tutorial_status(
     req: TutorialUpdateRequest,
-    current_user: User = Depends(get_current_user_ready),
-    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user_ready),
+    db: DBSession = Depends(get_db),
 ):
-    current_user.tutorial_completed = req.completed
-    db.add(current_user)
-    db.commit()
-    return {"tutorial_completed": current_user.tutorial_completed}
+    user = await get_user_row(current_user, db)
+    user.tutorial_completed = req.completed
+    db.add(user)
+    await db.commit()
+    auth_cache.invalidate(user.id)
+    return {"tutorial_completed": user.tutorial_completed}
 
 
 @app.post("/game/start")
 async def start_game(
-    current_user: User = Depends(get_current_user_ready), db: Session = Depends(get_db)
+    current_user: AuthPrincipal = Depends(get_current_user_ready), db: DBSession = Depends(get_db)
 ):
-    session = game_engine.start_new_game(current_user.id, db)
+    if settings.lazy_game_start:
+        return {
+            "session_id": None,
+            "game_token": issue_game_token(current_user.id, GameState.deal()),
+            "message": "Game started. Identify the gods!",
+        }
+    session = await game_engine.start_new_game(current_user.id, db)
     return {
         "session_id": session.session_id,
         "message": "Game started. Identify the gods!",
     }
 
 
-@app.post("/game/ask")
-async def ask_god(
-    req: AskQuestionRequest,
-    current_user: User = Depends(get_current_user_ready),
-    db: Session = Depends(get_db),
-):
-    session = db.get(GameSession, req.session_id)
+async def _load_game(
+    session_id: Optional[int], game_token: Optional[str], current_user: AuthPrincipal, db: DBSession
+) -> GameSession:
+    """
+    The game a request names. A game token whose game has no row yet gives
+    the unsaved session, which the engine writes with the first question or guess.
+    """
+    if game_token is not None:
+        user_id, token_id, state = read_game_token(game_token)
+        if user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not your game session")
+        statement = select(GameSession).where(GameSession.game_token_id == token_id)
+        session = (await db.exec(statement)).first()
+        return session or game_engine.lazy_session(user_id, token_id, state)
+    if session_id is None:
+        raise HTTPException(status_code=422, detail="session_id or game_token is required")
+    session = await db.get(GameSession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     if session.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your game session")
+    return session
+
+
+async def _get_playable_session(
+    req: AskQuestionRequest, current_user: AuthPrincipal, db: DBSession
+) -> GameSession:
+    session = await _load_game(req.session_id, req.game_token, current_user, db)
     if session.is_completed:
         raise HTTPException(status_code=400, detail="Game already completed")
+    return session
+
+
+async def _answer_question(
+    session: GameSession, req: AskQuestionRequest, db: DBSession
+) -> dict[str, object]:
+    """Ask the god and wait out any Random-god delay; raises ValueError on game errors."""
+    result = await game_engine.process_question(session, req.god_index, req.question, db)
+    response = {
+        "answer": result["answer"],
+        "questions_left": 3 - session.current_question_count,
+        "history": result["history"],
+    }
+    delay = result.get("simulated_delay")
+    if isinstance(delay, (int, float)):
+        # Hand the connection back to the pool before the Random god waits.
+        await db.close()
+        with timed("random_delay"):
+            await asyncio.sleep(delay)
+    return response
+
+
+async def _answer_events(
+    session: GameSession, req: AskQuestionRequest, db: DBSession
+) -> AsyncIterator[tuple[str, dict[str, object]]]:
+    """
+    Yield (event, data) pairs for one question: ack, progress heartbeats, then
+    answer or error. The event sequence is the same for every god, so it does
+    not reveal which one is Random.
+    """
+    yield "ack", {
+        "session_id": req.session_id,
+        "god_index": req.god_index,
+        "question": req.question,
+    }
+    started = time.monotonic()
+    task = asyncio.ensure_future(_answer_question(session, req, db))
+    try:
+        while True:
+            yield "progress", {
+                "status": "thinking",
+                "elapsed": round(time.monotonic() - started, 1),
+            }
+            done, _ = await asyncio.wait({task}, timeout=STREAM_HEARTBEAT_SECONDS)
+            if done:
+                break
+    finally:
+        if not task.done():
+            task.cancel()
 
     try:
-        result = game_engine.process_question(session, req.god_index, req.question, db)
-        delay = result.get("simulated_delay")
-        if isinstance(delay, (int, float)):
-            await asyncio.sleep(delay)
-        return {
-            "answer": result["answer"],
-            "questions_left": 3 - session.current_question_count,
-            "history": result["history"],
-        }
+        yield "answer", task.result()
+    except ValueError as e:
+        yield "error", {"status_code": 400, "detail": str(e)}
+    except HTTPException as e:
+        yield "error", {"status_code": e.status_code, "detail": e.detail}
+
+
+@app.post("/game/ask")
+async def ask_god(
+    req: AskQuestionRequest,
+    current_user: AuthPrincipal = Depends(get_current_user_ready),
+    db: DBSession = Depends(get_db),
+):
+    session = await _get_playable_session(req, current_user, db)
+    try:
+        return await _answer_question(session, req, db)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/game/ask/stream")
+async def ask_god_stream(
+    req: AskQuestionRequest,
+    current_user: AuthPrincipal = Depends(get_current_user_ready),
+    db: DBSession = Depends(get_db),
+):
+    """Server-Sent Events variant of /game/ask."""
+    session = await _get_playable_session(req, current_user, db)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event, data in _answer_events(session, req, db):
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _parse_ask_message(payload: object) -> AskQuestionRequest:
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=422, detail="Expected a JSON object")
+    try:
+        return AskQuestionRequest(**payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+
+
+@app.websocket("/game/ws")
+async def game_websocket(websocket: WebSocket, token: str = "", db: DBSession = Depends(get_db)):
+    """
+    WebSocket variant of /game/ask.
+
+    Authenticate with ?token=<access token>, then send AskQuestionRequest
+    JSON messages; each one is answered with {"event": ..., "data": ...}
+    messages using the same events as /game/ask/stream.
+    """
+    try:
+        current_user = get_current_user_ready(await get_current_user(token=token, db=db))
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            # Each message is a unit of work of its own: end the last one's
+            # transaction and drop what it loaded, so the game is read again
+            # as HTTP requests on it may have left it meanwhile.
+            await db.close()
+            try:
+                req = _parse_ask_message(payload)
+                session = await _get_playable_session(req, current_user, db)
+            except HTTPException as e:
+                error = {"status_code": e.status_code, "detail": e.detail}
+                await websocket.send_json({"event": "error", "data": error})
+                continue
+
+            async for event, data in _answer_events(session, req, db):
+                await websocket.send_json({"event": event, "data": data})
+    except WebSocketDisconnect:
+        pass
+
+
 @app.post("/game/submit")
 async def submit_guess(
     req: GuessRequest,
-    current_user: User = Depends(get_current_user_ready),
-    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user_ready),
+    db: DBSession = Depends(get_db),
 ):
-    session = db.get(GameSession, req.session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if session.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not your game session")
-
-    result = game_engine.submit_guess(session, req.guesses, db)
-
-    identities = json.loads(session.god_identities)
-    language = json.loads(session.language_map)
+    session = await _load_game(req.session_id, req.game_token, current_user, db)
+    state = game_engine.game_state(session)
+    try:
+        result = await game_engine.submit_guess(session, req.guesses, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"win": result, "identities": identities, "language_map": language}
+    return {"win": result, "identities": state.identities, "language_map": state.language_map}
 
 
 @app.get("/history", response_model=list[GameHistoryItem])
 async def get_history(
+    response: Response,
     limit: int = 20,
-    offset: int = 0,
-    current_user: User = Depends(get_current_user_ready),
-    db: Session = Depends(get_db),
+    before: Optional[int] = None,
+    current_user: AuthPrincipal = Depends(get_current_user_ready),
+    db: DBSession = Depends(get_db),
 ):
-    statement = (
-        select(GameSession)
-        .where(GameSession.user_id == current_user.id)
-        .order_by(col(GameSession.session_id).desc())
-        .offset(offset)
-        .limit(limit)
+    """
+    List the user's played games, newest first.
+
+    Pages are keyed by session id: pass the X-Next-Cursor header of one page as
+    `before` to get the next, so every page is an index range scan. Archived
+    games are read the same way and merged in.
+    """
+    has_moves = select(GameMove.session_id).where(GameMove.session_id == GameSession.session_id)
+    statement = select(GameSession).where(
+        GameSession.user_id == current_user.id, has_moves.exists()
     )
-    results = db.exec(statement).all()
-
-    history_data = []
-    for game in results:
-        move_history = json.loads(game.move_history) if game.move_history else []
-        if len(move_history) > 0:
-            history_data.append(
-                {
-                    "id": game.session_id,
-                    "date": game.created_at.isoformat(),
-                    "win": game.is_win,
-                    "completed": game.is_completed,
-                    "questions_asked": game.current_question_count,
-                }
-            )
-    return history_data
+    archived = select(GameSessionArchive).where(GameSessionArchive.user_id == current_user.id)
+    if before is not None:
+        statement = statement.where(col(GameSession.session_id) < before)
+        archived = archived.where(col(GameSessionArchive.session_id) < before)
+    statement = statement.order_by(col(GameSession.session_id).desc()).limit(limit)
+    archived = archived.order_by(col(GameSessionArchive.session_id).desc()).limit(limit)
+    games = [*(await db.exec(statement)).all(), *(await db.exec(archived)).all()]
+    results = sorted(games, key=lambda game: game.session_id or 0, reverse=True)[:limit]
+
+    if len(results) == limit and results:
+        response.headers["X-Next-Cursor"] = str(results[-1].session_id)
+    return [
+        {
+            "id": game.session_id,
+            "date": game.created_at.isoformat(),
+            "win": game.is_win,
+            "completed": game.is_completed,
+            "questions_asked": game.current_question_count,
+        }
+        for game in results
+    ]
 
 
 @app.get("/history/{session_id}", response_model=GameDetailResponse)
 async def get_game_detail(
     session_id: int,
-    current_user: User = Depends(get_current_user_ready),
-    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user_ready),
+    db: DBSession = Depends(get_db),
 ):
-    session = db.get(GameSession, session_id)
+    session: GameSession | GameSessionArchive | None = await db.get(GameSession, session_id)
+    archived = session is None
+    if archived:
+        session = await db.get(GameSessionArchive, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
 
@@ -372,92 +600,89 @@ async def get_game_detail(
     if not session.is_completed:
         raise HTTPException(status_code=400, detail="Cannot view details of incomplete game")
 
+    state = game_engine.game_state(session)
     return GameDetailResponse(
         id=session.session_id,
         date=session.created_at.isoformat(),
         win=session.is_win,
         completed=session.is_completed,
-        god_identities=json.loads(session.god_identities),
-        language_map=json.loads(session.language_map),
-        move_history=json.loads(session.move_history) if session.move_history else [],
-        user_guesses=(
-            json.loads(session.user_guesses)
-            if hasattr(session, "user_guesses") and session.user_guesses
-            else None
-        ),
+        god_identities=state.identities,
+        language_map=state.language_map,
+        move_history=[
+            move.to_dict() for move in await game_engine.get_moves(session_id, db, archived)
+        ],
+        user_guesses=json.loads(session.user_guesses) if session.user_guesses else None,
     )
 
 
 @app.get("/admin/users")
 async def admin_get_users(
+    response: Response,
     limit: int = 50,
-    offset: int = 0,
-    admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
+    sort: Literal["id", "created_at", "total_games", "wins", "win_rate"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    after: Optional[str] = None,
+    admin_user: AuthPrincipal = Depends(get_admin_user),
+    db: DBSession = Depends(get_db),
 ):
-    statement = select(User).offset(offset).limit(limit)
-    users = db.exec(statement).all()
-
-    user_stats = []
-    for user in users:
-        games = db.exec(select(GameSession).where(GameSession.user_id == user.id)).all()
-        # Only count games where at least one question was asked
-        active_games = [g for g in games if g.current_question_count > 0]
-        completed_games = [g for g in active_games if g.is_completed]
-        total_games = len(active_games)
-        wins = sum(1 for g in completed_games if g.is_win)
-
-        user_stats.append(
-            {
-                "id": user.id,
-                "is_admin": user.is_admin,
-                "is_disabled": user.is_disabled,
-                "created_at": user.created_at.isoformat(),
-                "total_games": total_games,
-                "wins": wins,
-                "win_rate": (wins / len(completed_games) * 100) if completed_games else 0,
-            }
-        )
+    """
+    List users with game totals, sorted in SQL.
 
-    return user_stats
+    Pass the X-Next-Cursor header of one page as `after` (with the same sort
+    and order) to get the next page.
+    """
+    try:
+        users, next_cursor = await list_user_stats(
+            db, limit, sort=sort, descending=order == "desc", after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 
 @app.get("/admin/stats")
 async def admin_get_stats(
-    admin_user: User = Depends(get_admin_user), db: Session = Depends(get_db)
+    admin_user: AuthPrincipal = Depends(get_admin_user), db: DBSession = Depends(get_db)
 ):
-    total_users = len(db.exec(select(User)).all())
-    all_games = db.exec(select(GameSession)).all()
-    active_games = [g for g in all_games if g.current_question_count > 0]
-    total_games = len(active_games)
-    completed_games = [g for g in active_games if g.is_completed]
-    total_wins = sum(1 for g in completed_games if g.is_win)
+    return await global_stats(db)
 
+
+@app.get("/admin/metrics")
+async def admin_get_metrics(admin_user: AuthPrincipal = Depends(get_admin_user)):
     return {
-        "total_users": total_users,
-        "total_games": total_games,
-        "completed_games": len(completed_games),
-        "total_wins": total_wins,
-        "overall_win_rate": ((total_wins / len(completed_games) * 100) if completed_games else 0),
+        "password_pool": password_hasher.stats(),
+        "llm_hedging": dict(game_engine.hedge_stats),
+        "move_group_commit": game_engine.move_writer.stats(),
+        "answer_cache": (
+            llm_service.answer_cache.stats() if llm_service.answer_cache is not None else None
+        ),
+        "llm_coalescing": llm_service.inflight.stats(),
+        "answer_latency": llm_service.latency_model.stats(),
+        "llm_usage": llm_service.usage_summary(),
+        "auth_cache": auth_cache.stats(),
+        "reaper": reaper.stats(),
     }
 
 
 @app.patch("/admin/users/{user_id}/disable")
 async def admin_toggle_user(
     user_id: str,
-    admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
+    admin_user: AuthPrincipal = Depends(get_admin_user),
+    db: DBSession = Depends(get_db),
 ):
     if user_id == "root":
         raise HTTPException(status_code=400, detail="Cannot disable root user")
 
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     user.is_disabled = not user.is_disabled
     db.add(user)
-    db.commit()
+    await db.commit()
+    auth_cache.invalidate(user.id)
 
     return {"id": user.id, "is_disabled": user.is_disabled}
 
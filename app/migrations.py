@@ -0,0 +1,242 @@
+"""
+Versioned schema migrations.
+
+The schema_version table records the migrations a database has had. A new
+database gets the current schema from the models and is stamped with every
+version; an existing one runs its pending migrations in order. Databases
+created before schema_version existed run all of them, so each migration must
+be a no-op against a schema that already has its change.
+
+Usage: python -m app.migrations [--status]
+"""
+
+import argparse
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    column,
+    inspect,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel
+
+from app.models import (
+    GameMove,
+    GameMoveArchive,
+    GameSession,
+    GameSessionArchive,
+    User,
+    UserStats,
+    backfill_user_stats,
+    engine,
+    migrate_move_history,
+)
+from app.services.game_state import GameState
+
+logger = logging.getLogger(__name__)
+
+# Key of the PostgreSQL advisory lock held while migrating, so nodes that
+# start together apply each migration once.
+ADVISORY_LOCK_KEY = 7_301_355
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Session], object]
+
+
+def _table(model: type[SQLModel]) -> Table:
+    """The metadata Table a model maps to."""
+    return SQLModel.metadata.tables[str(model.__tablename__)]
+
+
+def create_indexes(db: Session, *names: str) -> None:
+    """Create the named model indexes the database does not have yet."""
+    connection = db.connection()
+    for model_table in SQLModel.metadata.sorted_tables:
+        for index in model_table.indexes:
+            if index.name in names:
+                index.create(connection, checkfirst=True)
+
+
+def _create_base_schema(db: Session) -> None:
+    tables = [_table(model) for model in (User, GameSession, GameMove, UserStats)]
+    SQLModel.metadata.create_all(db.connection(), tables=tables)
+    create_indexes(db, "ix_user_id", "ix_gamesession_user_id_session_id", "ix_gamemove_session_id")
+
+
+def compact_game_setup(db: Session) -> None:
+    """
+    Replace GameSession's god_identities/language_map JSON with god_order and
+    language_swapped.
+
+    There are at most six distinct identity lists and two language maps, so
+    each is decoded once in Python and every row is rewritten by a single
+    UPDATE. Each step checks the columns first, so an interrupted run resumes.
+    """
+    connection = db.connection()
+    columns = {c["name"] for c in inspect(connection).get_columns(_table(GameSession).name)}
+    if "god_identities" not in columns:
+        return
+    if "god_order" not in columns:
+        connection.execute(
+            text("ALTER TABLE gamesession ADD COLUMN god_order SMALLINT NOT NULL DEFAULT 0")
+        )
+    if "language_swapped" not in columns:
+        connection.execute(
+            text(
+                "ALTER TABLE gamesession ADD COLUMN language_swapped BOOLEAN NOT NULL DEFAULT false"
+            )
+        )
+
+    legacy = table(
+        _table(GameSession).name,
+        column("god_identities"),
+        column("language_map"),
+        column("god_order"),
+        column("language_swapped"),
+    )
+    orders, swaps = {}, {}
+    for identities, language_map in connection.execute(
+        select(legacy.c.god_identities, legacy.c.language_map).distinct()
+    ):
+        try:
+            state = GameState.from_json(identities, language_map)
+        except (ValueError, KeyError, TypeError):
+            # Rows the game engine never wrote; they keep the default setup.
+            logger.warning(f"Skipping undecodable game setup {identities!r} {language_map!r}")
+            continue
+        orders[identities] = state.order
+        swaps[language_map] = state.swapped
+    if orders:
+        connection.execute(
+            update(legacy).values(
+                god_order=case(orders, value=legacy.c.god_identities, else_=0),
+                language_swapped=case(swaps, value=legacy.c.language_map, else_=False),
+            )
+        )
+    connection.execute(text("ALTER TABLE gamesession DROP COLUMN god_identities"))
+    connection.execute(text("ALTER TABLE gamesession DROP COLUMN language_map"))
+
+
+def _create_archive_tables(db: Session) -> None:
+    tables = [_table(GameSessionArchive), _table(GameMoveArchive)]
+    SQLModel.metadata.create_all(db.connection(), tables=tables)
+
+
+def _add_game_token_id(db: Session) -> None:
+    connection = db.connection()
+    columns = {c["name"] for c in inspect(connection).get_columns(_table(GameSession).name)}
+    if "game_token_id" not in columns:
+        connection.execute(text("ALTER TABLE gamesession ADD COLUMN game_token_id VARCHAR"))
+    create_indexes(db, "ix_gamesession_game_token_id")
+
+
+MIGRATIONS = [
+    Migration(1, "create tables and history indexes", _create_base_schema),
+    Migration(2, "move legacy move_history into GameMove", migrate_move_history),
+    Migration(3, "backfill UserStats counters", backfill_user_stats),
+    Migration(
+        4,
+        "index GameSession.created_at",
+        lambda db: create_indexes(db, "ix_gamesession_created_at"),
+    ),
+    Migration(5, "store the game setup as god_order and language_swapped", compact_game_setup),
+    Migration(6, "create the game archive tables", _create_archive_tables),
+    Migration(7, "add GameSession.game_token_id", _add_game_token_id),
+]
+
+
+def applied_versions(db: Session) -> set[int]:
+    connection = db.connection()
+    if not inspect(connection).has_table(schema_version.name):
+        return set()
+    return set(connection.execute(select(schema_version.c.version)).scalars())
+
+
+def _upgrade(bind: Engine) -> list[int]:
+    with Session(bind) as db:
+        fresh = not inspect(db.connection()).has_table(_table(User).name)
+        if fresh:
+            SQLModel.metadata.create_all(db.connection())
+        schema_version.create(db.connection(), checkfirst=True)
+        done = applied_versions(db)
+        db.commit()
+
+        applied = []
+        for migration in MIGRATIONS:
+            if migration.version in done:
+                continue
+            if not fresh:
+                logger.info(f"Applying migration {migration.version}: {migration.description}")
+                migration.upgrade(db)
+            db.connection().execute(
+                schema_version.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+            db.commit()
+            applied.append(migration.version)
+        return applied
+
+
+def run_migrations(bind: Optional[Engine] = None) -> list[int]:
+    """Bring the database up to the latest version; returns the versions applied."""
+    bind = bind or engine
+    if bind.dialect.name != "postgresql":
+        return _upgrade(bind)
+    with bind.connect() as lock:
+        lock.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        lock.commit()
+        try:
+            return _upgrade(bind)
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            lock.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--status", action="store_true", help="list migrations without applying")
+    args = parser.parse_args()
+
+    if args.status:
+        with Session(engine) as db:
+            done = applied_versions(db)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.version in done else "pending"
+            print(f"{migration.version:>4}  {state:<8} {migration.description}")
+        return
+    applied = run_migrations()
+    print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
-import os
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 
-from sqlmodel import Field, SQLModel, create_engine
+from sqlalchemy import Index, SmallInteger, UniqueConstraint, case, func, insert, update
+from sqlmodel import Field, Session, SQLModel, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import (
+    DBSession,
+    SyncSessionAdapter,
+    async_url,
+    create_async_db_engine,
+    create_db_engine,
+)
 
 # Database Models
 
@@ -17,27 +30,174 @@ class User(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-class GameSession(SQLModel, table=True):
-    session_id: Optional[int] = Field(default=None, primary_key=True)
+class GameSessionBase(SQLModel):
+    """Columns shared by GameSession and its archived copy, GameSessionArchive."""
+
     user_id: str = Field(foreign_key="user.id")
 
-    god_identities: str = Field(default="[]")
-    language_map: str = Field(default="{}")
+    # The game setup as GameState stores it: an index into GOD_ORDERS and
+    # whether Da means Yes (see app/services/game_state.py).
+    god_order: int = Field(default=0, sa_type=SmallInteger)
+    language_swapped: bool = Field(default=False)
 
     current_question_count: int = Field(default=0)
-    move_history: str = Field(default="[]")
     user_guesses: Optional[str] = Field(default=None)
 
     is_completed: bool = Field(default=False)
     is_win: bool = Field(default=False)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class GameSession(GameSessionBase, table=True):
+    session_id: Optional[int] = Field(default=None, primary_key=True)
+    # Legacy JSON move list; moves now live in GameMove (see migrate_move_history).
+    move_history: str = Field(default="[]")
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    # Id of the game token a lazily started game was written from (see
+    # app/services/game_token.py), so replaying the token finds this row.
+    game_token_id: Optional[str] = Field(default=None)
+
+
+# Serves the per-user history listing, newest first. As its leading column,
+# user_id needs no index of its own.
+Index(
+    "ix_gamesession_user_id_session_id",
+    GameSession.user_id,
+    col(GameSession.session_id).desc(),
+)
+Index("ix_gamesession_game_token_id", col(GameSession.game_token_id), unique=True)
+
+
+class GameMoveBase(SQLModel):
+    """Columns shared by GameMove and its archived copy, GameMoveArchive."""
+
+    round: int
+    god_index: int
+    question: str
+    answer: str
+    is_masked: bool = Field(default=False)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "round": self.round,
+            "god_index": self.god_index,
+            "question": self.question,
+            "answer": self.answer,
+            "is_masked": self.is_masked,
+        }
+
+
+class GameMove(GameMoveBase, table=True):
+    __table_args__ = (UniqueConstraint("session_id", "round"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    session_id: int = Field(foreign_key="gamesession.session_id", index=True)
+
+
+class GameSessionArchive(GameSessionBase, table=True):
+    """Older games moved out of GameSession by the reaper (app/services/reaper.py)."""
+
+    session_id: int = Field(primary_key=True)
+    created_at: datetime
+
+
+Index(
+    "ix_gamesessionarchive_user_id_session_id",
+    GameSessionArchive.user_id,
+    col(GameSessionArchive.session_id).desc(),
+)
+
+
+class GameMoveArchive(GameMoveBase, table=True):
+    """Moves of the games in GameSessionArchive."""
+
+    id: int = Field(primary_key=True)
+    session_id: int = Field(foreign_key="gamesessionarchive.session_id", index=True)
+
+
+class UserStats(SQLModel, table=True):
+    """Per-user game counters, kept in step with GameSession by GameEngine."""
+
+    user_id: str = Field(foreign_key="user.id", primary_key=True)
+    # Games with at least one answered question
+    games: int = Field(default=0)
+    completed_games: int = Field(default=0)
+    wins: int = Field(default=0)
 
 
 # Database Connection
-database_url = os.getenv("DATABASE_URL", "sqlite:///database.db")
-connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
-engine = create_engine(database_url, connect_args=connect_args)
+engine = create_db_engine()
+async_engine = create_async_db_engine() if async_url(settings.database_url) else None
+
+
+@asynccontextmanager
+async def open_session() -> AsyncIterator[DBSession]:
+    """Session for request handlers: async when the driver allows, else the adapted sync one."""
+    if async_engine is not None:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+    else:
+        with Session(engine, expire_on_commit=False) as session:
+            yield SyncSessionAdapter(session)
+
+
+def migrate_move_history(db: Session) -> int:
+    """
+    Move legacy JSON move_history blobs into GameMove rows.
+
+    Each session is converted and cleared in the same transaction, so running
+    this again (or after a crash) never duplicates moves. Returns the number of
+    sessions migrated.
+    """
+    # Only the two columns this needs, so it also runs on older GameSession shapes.
+    legacy = db.exec(
+        select(GameSession.session_id, GameSession.move_history).where(
+            GameSession.move_history != "[]", GameSession.move_history != ""
+        )
+    ).all()
+    for session_id, move_history in legacy:
+        for move in json.loads(move_history):
+            db.add(
+                GameMove(
+                    session_id=session_id,
+                    round=move["round"],
+                    god_index=move["god_index"],
+                    question=move["question"],
+                    answer=move["answer"],
+                    is_masked=move.get("is_masked", False),
+                )
+            )
+        db.exec(  # type: ignore[call-overload]
+            update(GameSession)
+            .where(col(GameSession.session_id) == session_id)
+            .values(move_history="[]")
+        )
+        db.commit()
+    return len(legacy)
+
 
+def backfill_user_stats(db: Session) -> int:
+    """
+    Fill UserStats from GameSession when the table is still empty.
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    Runs as a single INSERT ... SELECT, so it either fills every user or none.
+    Returns the number of users filled.
+    """
+    if db.exec(select(UserStats.user_id).limit(1)).first() is not None:
+        return 0
+    active = col(GameSession.current_question_count) > 0
+    completed = active & col(GameSession.is_completed)
+    aggregate = (
+        select(
+            GameSession.user_id,
+            func.count(case((active, 1))),
+            func.count(case((completed, 1))),
+            func.count(case((completed & col(GameSession.is_win), 1))),
+        )
+        .where(active)
+        .group_by(col(GameSession.user_id))
+    )
+    result = db.connection().execute(
+        insert(UserStats).from_select(["user_id", "games", "completed_games", "wins"], aggregate)
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,275 @@
+"""
+Answer cache for the LLM service.
+The god prompts are deterministic, so a repeated question in the same game
+context can reuse the earlier answer instead of calling the LLM again.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " ?!.。？！"
+
+
+def normalize_question(question: str) -> str:
+    """Collapse whitespace, case and trailing punctuation so rephrasings share a key."""
+    collapsed = _WHITESPACE.sub(" ", question).strip().casefold()
+    return collapsed.rstrip(_TRAILING_PUNCTUATION)
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Everything the LLM sees that can change a god's answer."""
+
+    model: str
+    god_identity: str
+    all_identities: tuple[str, ...]
+    god_index: Optional[int]
+    yes_word: str
+    no_word: str
+    question: str
+
+    @classmethod
+    def build(
+        cls,
+        model: str,
+        god_identity: str,
+        all_identities: Optional[list[str]],
+        god_index: Optional[int],
+        yes_word: str,
+        no_word: str,
+        question: str,
+    ) -> "AnswerKey":
+        return cls(
+            model=model,
+            god_identity=god_identity,
+            all_identities=tuple(all_identities or ()),
+            god_index=god_index,
+            yes_word=yes_word,
+            no_word=no_word,
+            question=normalize_question(question),
+        )
+
+    def digest(self) -> str:
+        payload = json.dumps(
+            [
+                self.model,
+                self.god_identity,
+                list(self.all_identities),
+                self.god_index,
+                self.yes_word,
+                self.no_word,
+                self.question,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Storage for cached answers with LRU eviction and an optional TTL."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float = 0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.evictions = 0
+
+    def _expires_at(self) -> float:
+        return self.clock() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+
+    def _is_expired(self, expires_at: float) -> bool:
+        return expires_at > 0 and expires_at <= self.clock()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None when missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries, including ones not yet purged."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0, clock=time.time):
+        super().__init__(max_entries, ttl_seconds, clock)
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self._is_expired(expires_at):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._expires_at())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """LRU cache stored in a SQLite file so answers survive restarts."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float = 0, clock=time.time):
+        super().__init__(max_entries, ttl_seconds, clock)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answer_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_answer_cache_last_used ON answer_cache (last_used)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row: Optional[tuple[str, float]] = self._conn.execute(
+                "SELECT value, expires_at FROM answer_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if self._is_expired(expires_at):
+                self._conn.execute("DELETE FROM answer_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE answer_cache SET last_used = ? WHERE key = ?", (self.clock(), key)
+            )
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            now = self.clock()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answer_cache (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, self._expires_at(), now),
+            )
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM answer_cache WHERE key IN ("
+                    "SELECT key FROM answer_cache ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM answer_cache")
+
+    def _count(self) -> int:
+        count: int = self._conn.execute("SELECT COUNT(*) FROM answer_cache").fetchone()[0]
+        return count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class AnswerCache:
+    """Answer cache front end that tracks hit/miss statistics."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(self, key: AnswerKey) -> Optional[str]:
+        try:
+            value = self.backend.get(key.digest())
+        except sqlite3.Error as e:
+            logger.warning(f"Answer cache read failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: AnswerKey, answer: str) -> None:
+        try:
+            self.backend.set(key.digest(), answer)
+            self.stores += 1
+        except sqlite3.Error as e:
+            logger.warning(f"Answer cache write failed: {e}")
+
+    def stats(self) -> dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.backend.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_answer_cache(
+    backend: str, max_entries: int, ttl_seconds: float, path: str
+) -> Optional[AnswerCache]:
+    """Build the configured answer cache, or None when caching is disabled."""
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return AnswerCache(MemoryCacheBackend(max_entries, ttl_seconds))
+    if backend == "sqlite":
+        return AnswerCache(SQLiteCacheBackend(path, max_entries, ttl_seconds))
+    raise ValueError(f"Unknown answer cache backend: {backend}")
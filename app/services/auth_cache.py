@@ -0,0 +1,126 @@
+"""
+Auth state cache for request authentication.
+Keeps the fields authorization depends on for recently seen users, so an
+authenticated request does not have to load the User row every time.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """The authenticated user as far as authorization is concerned."""
+
+    id: str
+    is_admin: bool = False
+    is_disabled: bool = False
+    must_change_password: bool = False
+
+    @classmethod
+    def from_user(cls, user) -> "AuthPrincipal":
+        return cls(
+            id=user.id,
+            is_admin=user.is_admin,
+            is_disabled=user.is_disabled,
+            must_change_password=user.must_change_password,
+        )
+
+    def to_claims(self) -> dict[str, object]:
+        """Token claims carrying this state (disabled users never get a token)."""
+        return {"adm": self.is_admin, "pwc": self.must_change_password}
+
+    @classmethod
+    def from_claims(cls, payload: dict[str, object]) -> Optional["AuthPrincipal"]:
+        """The principal a token's claims describe, or None if it has none."""
+        user_id, is_admin, must_change = payload.get("sub"), payload.get("adm"), payload.get("pwc")
+        if not (isinstance(user_id, str) and isinstance(is_admin, bool)):
+            return None
+        if not isinstance(must_change, bool):
+            return None
+        return cls(id=user_id, is_admin=is_admin, must_change_password=must_change)
+
+
+class AuthStateCache:
+    """
+    Bounded LRU of AuthPrincipal by user id, each entry kept ttl_seconds.
+
+    invalidate() drops a user's entry and remembers when, so token claims
+    issued before the change are no longer trusted on this process. Other
+    processes see the change once their entry expires. A TTL of 0 disables
+    caching.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[AuthPrincipal, float]] = OrderedDict()
+        self._invalidated: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[AuthPrincipal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= self.clock():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, principal: AuthPrincipal) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (principal, self.clock() + self.ttl_seconds)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidated[user_id] = self.clock()
+            self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self.max_entries:
+                self._invalidated.popitem(last=False)
+
+    def trusts_claims(self, user_id: str, issued_at: object) -> bool:
+        """Whether claims issued at issued_at (token iat) postdate any local invalidation."""
+        if not isinstance(issued_at, (int, float)):
+            return False
+        with self._lock:
+            invalidated_at = self._invalidated.get(user_id)
+        return invalidated_at is None or issued_at > invalidated_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+
+    def stats(self) -> dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+auth_cache = AuthStateCache(
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
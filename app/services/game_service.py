@@ -1,49 +1,94 @@
+import asyncio
 import json
 import logging
-import random
+import time
 
-from sqlmodel import Session
-
-from app.core.exceptions import LLMAnswerError
-from app.models import GameSession
-from app.services.llm_service import llm_service
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import col, select
 
+from app.core.config import settings
+from app.core.database import DBSession
+from app.core.exceptions import ConcurrentMoveError, LLMAnswerError, LLMError
+from app.core.metrics import timed
+from app.models import GameMove, GameMoveArchive, GameSession, GameSessionArchive
+from app.services.game_state import GameState
+from app.services.group_commit import GroupCommitWriter, MoveWrite
+from app.services.llm_service import GodAnswer, llm_service
+from app.services.stats_service import bump_user_stats
 
 logger = logging.getLogger(__name__)
 
 
+def _task_outcome(task: "asyncio.Task[GodAnswer]") -> GodAnswer | LLMError:
+    """Return a finished ask task's answer, or its LLM error; re-raise anything else."""
+    exc = task.exception()
+    if exc is None:
+        return task.result()
+    if isinstance(exc, LLMError):
+        return exc
+    raise exc
+
+
 class GameEngine:
     GOD_TYPES = ["True", "False", "Random"]
     MAX_UNKNOWN_RETRIES = 2
 
-    def start_new_game(self, user_id: str, db: Session) -> GameSession:
-        identities = self.GOD_TYPES.copy()
-        random.shuffle(identities)
+    def __init__(self):
+        self.hedge_stats = {"questions": 0, "hedges_sent": 0, "hedges_won": 0}
+        self.move_writer = GroupCommitWriter(
+            settings.move_group_commit_delay_ms / 1000, settings.move_group_commit_max_batch
+        )
 
-        words = ["Ja", "Da"]
-        random.shuffle(words)
-        language_map = {"Yes": words[0], "No": words[1]}
+    def game_state(self, session: GameSession | GameSessionArchive) -> GameState:
+        """The session's god order and language map."""
+        return GameState.from_session(session)
 
+    async def start_new_game(self, user_id: str, db: DBSession) -> GameSession:
+        state = GameState.deal()
         session = GameSession(
             user_id=user_id,
-            god_identities=json.dumps(identities),
-            language_map=json.dumps(language_map),
-            move_history=json.dumps([]),
+            god_order=state.order,
+            language_swapped=state.swapped,
             current_question_count=0,
         )
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        # Committing flushes the row and fills in its session_id. Every other
+        # column was set here and request sessions don't expire on commit, so
+        # there is nothing to re-read.
+        await db.commit()
         return session
 
-    def process_question(
-        self, session: GameSession, god_index: int, question: str, db: Session
+    @staticmethod
+    def lazy_session(user_id: str, token_id: str, state: GameState) -> GameSession:
+        """The unsaved GameSession of a lazily started game, written with its first move."""
+        return GameSession(
+            user_id=user_id,
+            god_order=state.order,
+            language_swapped=state.swapped,
+            current_question_count=0,
+            game_token_id=token_id,
+        )
+
+    @staticmethod
+    async def _insert_lazy_session(session: GameSession, db: DBSession) -> None:
+        db.add(session)
+        try:
+            await db.flush()
+        except IntegrityError:
+            # Another request wrote this game's row from the same token first.
+            await db.rollback()
+            raise ValueError("This game was started by another request, please try again")
+
+    async def process_question(
+        self, session: GameSession, god_index: int, question: str, db: DBSession
     ) -> dict[str, object]:
         if session.current_question_count >= 3:
             raise ValueError("Max questions reached")
 
-        identities = json.loads(session.god_identities)
-        language_map = json.loads(session.language_map)
+        state = self.game_state(session)
+        identities = state.identities
+        language_map = state.language_map
         target_god = identities[god_index]
 
         simulated_delay: float | None = None
@@ -51,79 +96,45 @@ class GameEngine:
         if target_god == "Random":
             simulated_delay = llm_service.get_simulated_delay()
 
+        started = time.monotonic()
         try:
-            answer = "Unknown"
-            max_attempts = self.MAX_UNKNOWN_RETRIES + 1
-            for attempt in range(max_attempts):
-                answer = llm_service.ask_god(
-                    target_god,
-                    language_map,
-                    question,
-                    all_identities=identities,
-                    god_index=god_index,
-                )
-                if answer != "Unknown":
-                    logger.info(
-                        "Resolved answer on attempt %s/%s for god_index=%s",
-                        attempt + 1,
-                        max_attempts,
-                        god_index,
+            with timed("llm"):
+                if settings.llm_hedge_enabled and target_god != "Random":
+                    reply = await self._ask_hedged(
+                        target_god, language_map, question, identities, god_index
+                    )
+                else:
+                    reply = await self._ask_with_retries(
+                        target_god, language_map, question, identities, god_index
                     )
-                    break
-                logger.warning(
-                    "Received Unknown on attempt %s/%s for god_index=%s; retrying",
-                    attempt + 1,
-                    max_attempts,
-                    god_index,
-                )
         except LLMAnswerError:
             raise ValueError(
                 "The God seems to be daydreaming and didn't give a clear answer. Please rephrase your question or try again!"
             )
+        if target_god != "Random" and not reply.cached:
+            # Cached and coalesced answers would teach the model their shortcut.
+            llm_service.record_answer_latency(target_god, time.monotonic() - started)
+        answer = reply.text
 
-        history = json.loads(session.move_history)
-        round_number = len(history) + 1
-
-        if answer == "Unknown":
-            logger.warning(
-                "Answer remains Unknown after %s attempts for god_index=%s; masking this round without consuming question count",
-                self.MAX_UNKNOWN_RETRIES + 1,
-                god_index,
-            )
-            history.append(
-                {
-                    "round": round_number,
-                    "god_index": god_index,
-                    "question": question,
-                    "answer": answer,
-                    "is_masked": True,
-                }
-            )
-            session.move_history = json.dumps(history)
-            db.add(session)
-            db.commit()
-            db.refresh(session)
-            return {
-                "answer": answer,
-                "history": history,
-                "simulated_delay": simulated_delay,
-            }
-
-        history.append(
-            {
-                "round": round_number,
-                "god_index": god_index,
-                "question": question,
-                "answer": answer,
-                "is_masked": False,
-            }
+        inserted = False
+        if session.session_id is None:
+            inserted = True
+            history = []
+            await self._insert_lazy_session(session, db)
+        else:
+            history = [move.to_dict() for move in await self.get_moves(session.session_id, db)]
+        assert session.session_id is not None
+        move = GameMove(
+            session_id=session.session_id,
+            round=len(history) + 1,
+            god_index=god_index,
+            question=question,
+            answer=answer,
+            is_masked=answer == "Unknown",
         )
+        history.append(move.to_dict())
 
-        session.move_history = json.dumps(history)
-        session.current_question_count += 1
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+        await self._save_move(session, move, inserted, db)
 
         return {
             "answer": answer,
@@ -131,16 +142,188 @@ class GameEngine:
             "simulated_delay": simulated_delay,
         }
 
-    def submit_guess(self, session: GameSession, user_guess: list[str], db: Session) -> bool:
-        actual_identities = json.loads(session.god_identities)
+    async def _save_move(
+        self, session: GameSession, move: GameMove, inserted: bool, db: DBSession
+    ) -> None:
+        """Commit the move and, unless it was masked, the session's question count."""
+        question_count = None
+        if move.is_masked:
+            logger.warning(
+                "Answer remains Unknown after %s attempts for god_index=%s; masking this round without consuming question count",
+                self.MAX_UNKNOWN_RETRIES + 1,
+                move.god_index,
+            )
+        else:
+            question_count = session.current_question_count + 1
+
+        if settings.move_group_commit and not inserted:
+            # End the read transaction, then commit with whichever batch this joins.
+            await db.commit()
+            write = MoveWrite(move.model_dump(exclude={"id"}), session.user_id, question_count)
+            try:
+                await self.move_writer.write(db, write)
+            except IntegrityError:
+                # The writer retried it alone; a concurrent ask took its round.
+                raise ConcurrentMoveError()
+            if question_count is not None:
+                set_committed_value(session, "current_question_count", question_count)
+        else:
+            if question_count is not None:
+                if question_count == 1:
+                    await bump_user_stats(db, session.user_id, games=1)
+                session.current_question_count = question_count
+                db.add(session)
+            db.add(move)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # A concurrent ask on this game took the same round number.
+                await db.rollback()
+                raise ConcurrentMoveError()
+
+    @staticmethod
+    async def get_moves(
+        session_id: int, db: DBSession, archived: bool = False
+    ) -> list[GameMove] | list[GameMoveArchive]:
+        model = GameMoveArchive if archived else GameMove
+        statement = select(model).where(model.session_id == session_id).order_by(col(model.round))
+        return list((await db.exec(statement)).all())
+
+    async def _ask_with_retries(
+        self,
+        target_god: str,
+        language_map: dict[str, str],
+        question: str,
+        identities: list[str],
+        god_index: int,
+    ) -> GodAnswer:
+        answer = GodAnswer("Unknown")
+        max_attempts = self.MAX_UNKNOWN_RETRIES + 1
+        for attempt in range(max_attempts):
+            answer = await llm_service.ask_god(
+                target_god,
+                language_map,
+                question,
+                all_identities=identities,
+                god_index=god_index,
+            )
+            if answer.text != "Unknown":
+                logger.info(
+                    "Resolved answer on attempt %s/%s for god_index=%s",
+                    attempt + 1,
+                    max_attempts,
+                    god_index,
+                )
+                break
+            logger.warning(
+                "Received Unknown on attempt %s/%s for god_index=%s; retrying",
+                attempt + 1,
+                max_attempts,
+                god_index,
+            )
+        return answer
+
+    async def _ask_hedged(
+        self,
+        target_god: str,
+        language_map: dict[str, str],
+        question: str,
+        identities: list[str],
+        god_index: int,
+    ) -> GodAnswer:
+        """
+        Race up to LLM_HEDGE_MAX_REQUESTS concurrent requests for one answer.
+
+        A hedge is launched whenever LLM_HEDGE_DELAY elapses without an answer,
+        or immediately when a request comes back Unknown. The first answer that
+        is not Unknown wins and the remaining requests are cancelled.
+        """
+        max_requests = max(1, settings.llm_hedge_max_requests)
+        delay = max(0.0, settings.llm_hedge_delay)
+        pending: dict[asyncio.Task[GodAnswer], int] = {}
+        launched = 0
+        error: LLMError | None = None
 
-        is_correct = user_guess == actual_identities
+        def launch() -> None:
+            nonlocal launched
+            # Hedges must reach the LLM independently, so only the first request
+            # may join an identical in-flight call.
+            task = asyncio.ensure_future(
+                llm_service.ask_god(
+                    target_god,
+                    language_map,
+                    question,
+                    all_identities=identities,
+                    god_index=god_index,
+                    coalesce=launched == 0,
+                )
+            )
+            pending[task] = launched
+            launched += 1
+
+        self.hedge_stats["questions"] += 1
+        launch()
+        try:
+            while pending:
+                timeout = delay if launched < max_requests else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    attempt = pending.pop(task)
+                    answer = _task_outcome(task)
+                    if isinstance(answer, LLMError):
+                        error = error or answer
+                        continue
+                    if answer.text != "Unknown":
+                        if attempt > 0:
+                            self.hedge_stats["hedges_won"] += 1
+                        logger.info(
+                            "Resolved answer from request %s/%s for god_index=%s",
+                            attempt + 1,
+                            max_requests,
+                            god_index,
+                        )
+                        return answer
+                    logger.warning(
+                        "Received Unknown from request %s/%s for god_index=%s",
+                        attempt + 1,
+                        max_requests,
+                        god_index,
+                    )
+                if launched < max_requests:
+                    launch()
+        finally:
+            self.hedge_stats["hedges_sent"] += launched - 1
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if error is not None:
+            raise error
+        return GodAnswer("Unknown")
 
+    async def submit_guess(
+        self, session: GameSession, user_guess: list[str], db: DBSession
+    ) -> bool:
+        is_correct = user_guess == self.game_state(session).identities
+        if session.session_id is None:
+            await self._insert_lazy_session(session, db)
+
+        if session.current_question_count > 0:
+            # Guesses may be resubmitted, so apply the change against the previous result.
+            was_win = session.is_completed and session.is_win
+            await bump_user_stats(
+                db,
+                session.user_id,
+                completed_games=0 if session.is_completed else 1,
+                wins=int(is_correct) - int(was_win),
+            )
         session.is_completed = True
         session.is_win = is_correct
         session.user_guesses = json.dumps(user_guess)
         db.add(session)
-        db.commit()
+        await db.commit()
 
         return is_correct
 
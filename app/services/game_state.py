@@ -0,0 +1,64 @@
+"""
+Game setup encoding.
+A game's god order is one of the six orders of True, False and Random, and its
+language map is either Ja=Yes or Da=Yes, so the whole setup is a permutation
+index and one bit. GameSession stores exactly that (god_order and
+language_swapped); GameState turns it back into the identity list and language
+map the engine and the API use.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from itertools import permutations
+from typing import Optional
+
+from app.models import GameSession, GameSessionArchive
+from app.services.prompts import GOD_IDENTITIES
+from app.services.prompts.canonical import CANONICAL_NO, CANONICAL_YES
+
+GOD_ORDERS: tuple[tuple[str, ...], ...] = tuple(permutations(GOD_IDENTITIES))
+
+_rng = random.Random()
+
+
+@dataclass(frozen=True, slots=True)
+class GameState:
+    """God order (index into GOD_ORDERS) and whether Da means Yes."""
+
+    order: int
+    swapped: bool
+
+    @classmethod
+    def deal(cls, rng: Optional[random.Random] = None) -> "GameState":
+        """A uniformly random god order and language map for a new game."""
+        rng = rng or _rng
+        return _STATES[rng.randrange(len(GOD_ORDERS))][rng.random() < 0.5]
+
+    @classmethod
+    def from_session(cls, session: GameSession | GameSessionArchive) -> "GameState":
+        return _STATES[session.god_order][session.language_swapped]
+
+    @classmethod
+    def from_json(cls, god_identities: str, language_map: str) -> "GameState":
+        """Decode the JSON columns GameSession used before the compact encoding."""
+        order = GOD_ORDERS.index(tuple(json.loads(god_identities)))
+        swapped: bool = json.loads(language_map)["Yes"] != CANONICAL_YES
+        return _STATES[order][swapped]
+
+    @property
+    def identities(self) -> list[str]:
+        return list(GOD_ORDERS[self.order])
+
+    @property
+    def language_map(self) -> dict[str, str]:
+        if self.swapped:
+            return {"Yes": CANONICAL_NO, "No": CANONICAL_YES}
+        return {"Yes": CANONICAL_YES, "No": CANONICAL_NO}
+
+
+# There are only 12 states, so every game shares one of these.
+_STATES = tuple(
+    tuple(GameState(order, swapped) for swapped in (False, True))
+    for order in range(len(GOD_ORDERS))
+)
@@ -0,0 +1,70 @@
+"""
+Stateless game tokens for lazy game start.
+With LAZY_GAME_START, /game/start deals a game without writing it and hands
+the setup to the client in a signed token. The setup is encrypted, so the
+player cannot read the gods' identities from it, and the GameSession row is
+only inserted with the game's first question or guess.
+"""
+
+import base64
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional
+
+import jwt
+
+from app.core.config import settings
+from app.core.exceptions import InvalidGameTokenError
+from app.services.game_state import GOD_ORDERS, GameState
+
+TOKEN_TYPE = "game"
+# Each of the 6 god orders with either language map
+SETUP_COUNT = len(GOD_ORDERS) * 2
+
+
+def _derived_key(label: bytes) -> bytes:
+    """A key of its own per use, so game tokens never verify as access tokens."""
+    return hmac.new(settings.secret_key.encode(), label, hashlib.sha256).digest()
+
+
+def _setup_pad(token_id: str) -> int:
+    """
+    Keyed pseudorandom offset for one token.
+
+    The setup index is sent as (index + pad) mod 12, a one-time pad keyed by
+    the secret key and the token's random id.
+    """
+    digest = hmac.new(_derived_key(b"game-setup"), token_id.encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest, "big") % SETUP_COUNT
+
+
+def issue_game_token(user_id: str, state: GameState, now: Optional[datetime] = None) -> str:
+    now = now or datetime.utcnow()
+    token_id = base64.urlsafe_b64encode(secrets.token_bytes(12)).decode()
+    index = state.order * 2 + int(state.swapped)
+    payload = {
+        "typ": TOKEN_TYPE,
+        "sub": user_id,
+        "jti": token_id,
+        "setup": (index + _setup_pad(token_id)) % SETUP_COUNT,
+        "iat": now,
+        "exp": now + timedelta(minutes=settings.game_token_expire_minutes),
+    }
+    return jwt.encode(payload, _derived_key(b"game-token"), algorithm=settings.algorithm)
+
+
+def read_game_token(token: str) -> tuple[str, str, GameState]:
+    """Verify a game token; returns (user id, token id, state)."""
+    try:
+        payload = jwt.decode(token, _derived_key(b"game-token"), algorithms=[settings.algorithm])
+    except jwt.PyJWTError:
+        raise InvalidGameTokenError()
+    user_id, token_id, setup = payload.get("sub"), payload.get("jti"), payload.get("setup")
+    if payload.get("typ") != TOKEN_TYPE or not isinstance(user_id, str):
+        raise InvalidGameTokenError()
+    if not isinstance(token_id, str) or not isinstance(setup, int):
+        raise InvalidGameTokenError()
+    index = (setup - _setup_pad(token_id)) % SETUP_COUNT
+    return user_id, token_id, GameState(index // 2, bool(index % 2))
@@ -0,0 +1,168 @@
+"""
+Group commit for game moves.
+Under many concurrent players each /game/ask commits its own transaction, and
+on SQLite they all queue for the single writer lock. With MOVE_GROUP_COMMIT the
+move and question count of concurrent requests are written together: the
+first request of a batch waits up to the batch delay (or until the batch is
+full), then writes the whole batch in one transaction, and every request in it
+returns only after that commit.
+"""
+
+import asyncio
+import contextvars
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from app.core.database import DBSession, sibling_session
+from app.models import GameMove, GameSession, UserStats
+from app.services.stats_service import user_stats_upsert
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MoveWrite:
+    """One answered question: the move, and the session's new question count if it used one."""
+
+    move: dict[str, Any]
+    user_id: str
+    question_count: Optional[int]
+
+    @property
+    def first_question(self) -> bool:
+        return self.question_count == 1
+
+
+def apply_move_writes(db: Session, writes: list[MoveWrite]) -> None:
+    """Write a batch of moves, question counts and UserStats bumps without committing."""
+    connection = db.connection()
+    connection.execute(insert(GameMove), [write.move for write in writes])
+    counts = [
+        {"id": write.move["session_id"], "count": write.question_count}
+        for write in writes
+        if write.question_count is not None
+    ]
+    if counts:
+        connection.execute(
+            update(GameSession)
+            .where(col(GameSession.session_id) == bindparam("id"))
+            .values(current_question_count=bindparam("count")),
+            counts,
+        )
+    new_games = Counter(write.user_id for write in writes if write.first_question)
+    dialect = connection.dialect.name
+    for user_id, games in new_games.items():
+        upsert = user_stats_upsert(dialect, user_id, games=games)
+        if upsert is not None:
+            connection.execute(upsert)
+            continue
+        updated = connection.execute(
+            update(UserStats)
+            .where(col(UserStats.user_id) == user_id)
+            .values(games=UserStats.games + games)
+        )
+        if updated.rowcount == 0:
+            db.add(UserStats(user_id=user_id, games=games))
+
+
+class GroupCommitWriter:
+    """Batches MoveWrites from concurrent requests into shared transactions."""
+
+    def __init__(self, max_delay: float, max_batch: int):
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._pending: list[tuple[DBSession, MoveWrite, asyncio.Future[None]]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.writes = 0
+        self.largest_batch = 0
+
+    async def write(self, db: DBSession, write: MoveWrite) -> None:
+        """Queue write and return once the transaction holding it has committed."""
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((db, write, done))
+        if self._full is None:
+            # A task of its own, so a cancelled request never strands the batch,
+            # and with an empty context, so the request that opened the batch
+            # isn't billed for its queries in /metrics.
+            self._full = asyncio.Event()
+            task = asyncio.get_running_loop().create_task(
+                self._commit_batch(self._full), context=contextvars.Context()
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        await done
+
+    async def _commit_batch(self, full: asyncio.Event) -> None:
+        try:
+            await asyncio.wait_for(full.wait(), self.max_delay)
+        except asyncio.TimeoutError:
+            pass
+        # Requests keep joining the batch while the previous one commits.
+        async with self._lock:
+            batch, self._pending, self._full = self._pending, [], None
+            try:
+                await self._commit(batch)
+            finally:
+                for _, _, done in batch:
+                    if not done.done():
+                        done.set_exception(RuntimeError("Group commit did not finish"))
+
+    async def _commit(self, batch: list[tuple[DBSession, MoveWrite, asyncio.Future[None]]]) -> None:
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        # Requests normally share one engine; each engine gets its own transaction.
+        groups: dict[int, list[tuple[DBSession, MoveWrite, asyncio.Future[None]]]] = {}
+        for item in batch:
+            groups.setdefault(id(item[0].get_bind()), []).append(item)
+        for items in groups.values():
+            try:
+                await self._run(items[0][0], [write for _, write, _ in items])
+            except Exception as e:
+                logger.warning(f"Group commit of {len(items)} moves failed, retrying singly: {e}")
+                for item in items:
+                    await self._commit_one(*item)
+                continue
+            for _, _, done in items:
+                if not done.done():
+                    done.set_result(None)
+
+    async def _commit_one(
+        self, db: DBSession, write: MoveWrite, done: "asyncio.Future[None]"
+    ) -> None:
+        try:
+            await self._run(db, [write])
+        except Exception as e:
+            if not done.done():
+                done.set_exception(e)
+            return
+        if not done.done():
+            done.set_result(None)
+
+    @staticmethod
+    async def _run(db: DBSession, writes: list[MoveWrite]) -> None:
+        writer = sibling_session(db)
+        try:
+            await writer.run_sync(apply_move_writes, writes)
+            await writer.commit()
+        finally:
+            await writer.close()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "largest_batch": self.largest_batch,
+            "mean_batch": self.writes / self.batches if self.batches else 0.0,
+        }
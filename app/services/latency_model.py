@@ -0,0 +1,111 @@
+"""
+Answer latency model for the gods.
+Tracks the observed answer-time distribution per model and god type with a
+streaming quantile sketch, so the Random god can wait for a duration drawn
+from the same distribution as the LLM-backed gods.
+"""
+
+import math
+import random
+from typing import Optional
+
+MIN_MODEL_SAMPLES = 20
+FALLBACK_DELAY_RANGE = (1.0, 5.0)
+
+
+class LatencySketch:
+    """
+    Log-bucketed quantile sketch with bounded relative error.
+
+    Values are counted in buckets whose bounds grow geometrically, so memory
+    stays small (a few hundred buckets between 1ms and minutes) while any
+    quantile is accurate to within relative_accuracy.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(max(value, self.min_value)) / self._log_gamma)
+
+    def _bounds(self, bucket: int) -> tuple[float, float]:
+        return self.gamma ** (bucket - 1), self.gamma**bucket
+
+    def add(self, value: float) -> None:
+        bucket = self._bucket(value)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+
+    def _locate(self, rank: float) -> int:
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen > rank:
+                return bucket
+        return max(self._buckets)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        bucket = self._locate(q * (self.count - 1))
+        return 2 * self.gamma**bucket / (self.gamma + 1)
+
+    def sample(self, rng: random.Random) -> Optional[float]:
+        """Draw a value distributed like the recorded ones."""
+        if self.count == 0:
+            return None
+        low, high = self._bounds(self._locate(rng.random() * self.count))
+        return rng.uniform(low, high)
+
+
+class LatencyModel:
+    """Answer-time sketches keyed by (model, god type)."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._sketches: dict[tuple[str, str], LatencySketch] = {}
+        self._rng = rng or random.SystemRandom()
+
+    def record(self, model: str, god_type: str, seconds: float) -> None:
+        key = (model, god_type)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = LatencySketch()
+        sketch.add(seconds)
+
+    def sample_delay(self, model: str) -> float:
+        """
+        Draw a Random-god delay from the answer times of the LLM-backed gods.
+
+        A sketch is picked in proportion to its sample count, which is the same
+        as sampling the combined True/False distribution for this model.
+        """
+        sketches = [
+            sketch for (sketch_model, _), sketch in self._sketches.items() if sketch_model == model
+        ]
+        total = sum(sketch.count for sketch in sketches)
+        if total < MIN_MODEL_SAMPLES:
+            return self._rng.uniform(*FALLBACK_DELAY_RANGE)
+
+        pick = self._rng.random() * total
+        for sketch in sketches:
+            pick -= sketch.count
+            if pick < 0:
+                break
+        delay = sketch.sample(self._rng)
+        assert delay is not None
+        return delay
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        return {
+            f"{model}/{god_type}": {
+                "count": sketch.count,
+                "p50": sketch.quantile(0.5),
+                "p90": sketch.quantile(0.9),
+                "p99": sketch.quantile(0.99),
+            }
+            for (model, god_type), sketch in self._sketches.items()
+        }
@@ -3,58 +3,122 @@ Refactored LLM service with modular prompt system.
 Simplified logic, better maintainability, and clear separation of concerns.
 """
 
-import collections
 import logging
 import random
-import time
+from dataclasses import dataclass
 
 import openai
+from openai.types.chat import ChatCompletionMessageParam
 
 from app.core.config import settings
 from app.core.exceptions import LLMAnswerError, LLMTimeoutError
+from app.services.answer_cache import AnswerKey, create_answer_cache
+from app.services.latency_model import LatencyModel
 from app.services.prompts import PromptConfig, PromptTemplates
+from app.services.prompts.canonical import CANONICAL_NO, CANONICAL_YES, CanonicalFrame
 from app.services.prompts.validator import PromptValidator
+from app.services.singleflight import SingleFlight
+from app.services.token_budget import TokenBudget, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
-MAX_LATENCY_SAMPLES = 10
+
+@dataclass
+class Completion:
+    """Text of one LLM completion and how many tokens it used."""
+
+    content: str
+    tokens: int
+    truncated: bool = False
+
+
+@dataclass(frozen=True)
+class GodAnswer:
+    """A god's answer; cached when it came without an LLM request of its own."""
+
+    text: str
+    cached: bool = False
 
 
 class LLMService:
     """Refactored LLM service with modular prompt system."""
 
     def __init__(self):
-        self.client = openai.OpenAI(
+        self.client = openai.AsyncOpenAI(
             api_key=settings.openai_api_key, base_url=settings.openai_base_url
         )
         self.model = settings.openai_model
         self.temperature = settings.openai_temperature
         self.max_tokens = settings.openai_max_tokens
-        self._latency_window: collections.deque[float] = collections.deque(
-            maxlen=MAX_LATENCY_SAMPLES
+        self.latency_model = LatencyModel()
+        self.answer_cache = create_answer_cache(
+            settings.answer_cache_backend,
+            max_entries=settings.answer_cache_max_entries,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+            path=settings.answer_cache_path,
+        )
+        self.inflight: SingleFlight[str] = SingleFlight()
+        self.token_budget = TokenBudget(
+            ceiling=self.max_tokens,
+            floor=settings.llm_min_max_tokens,
+            enabled=settings.llm_adaptive_max_tokens,
+        )
+        self.usage_stats = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "completion_tokens": 0,
+            "early_stops": 0,
+            # Tokens the adaptive budget took off the OPENAI_MAX_TOKENS ceiling:
+            # reserved per request, not tokens the model would have generated.
+            "max_tokens_reduction": 0,
+        }
+
+    def _record_usage(self, usage: object, fallback_completion_tokens: int = 0) -> None:
+        """Accumulate token usage, including provider prompt-cache hits."""
+        self.usage_stats["requests"] += 1
+        if usage is None:
+            # Streams stopped early never receive the final usage chunk.
+            self.usage_stats["completion_tokens"] += fallback_completion_tokens
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        self.usage_stats["prompt_tokens"] += prompt_tokens
+        self.usage_stats["cached_prompt_tokens"] += cached_tokens
+        self.usage_stats["completion_tokens"] += completion_tokens
+        logger.info(
+            f"LLM usage: prompt_tokens={prompt_tokens} cached_tokens={cached_tokens} "
+            f"completion_tokens={completion_tokens}"
         )
 
-    @property
-    def avg_latency(self) -> float | None:
-        if len(self._latency_window) < 3:
-            return None
-        return sum(self._latency_window) / len(self._latency_window)
+    def usage_summary(self) -> dict[str, object]:
+        prompt_tokens = self.usage_stats["prompt_tokens"]
+        return {
+            **self.usage_stats,
+            "prompt_cache_hit_rate": (
+                self.usage_stats["cached_prompt_tokens"] / prompt_tokens if prompt_tokens else 0.0
+            ),
+            "token_budget": self.token_budget.stats(),
+        }
+
+    def record_answer_latency(self, god_identity: str, seconds: float) -> None:
+        """Record how long an LLM-backed god took to answer, as seen by the player."""
+        self.latency_model.record(self.model, god_identity, seconds)
 
     def get_simulated_delay(self) -> float:
-        avg = self.avg_latency
-        if avg is not None:
-            jitter = random.uniform(-avg * 0.3, avg * 0.3)
-            return max(0.5, avg + jitter)
-        return random.uniform(1.0, 5.0)
+        return self.latency_model.sample_delay(self.model)
 
-    def ask_god(
+    async def ask_god(
         self,
         god_identity: str,
         language_map: dict[str, str],
         user_question: str,
         all_identities: list[str] | None = None,
         god_index: int | None = None,
-    ) -> str:
+        coalesce: bool = True,
+    ) -> GodAnswer:
         """
         Ask a god a question and get their answer.
 
@@ -64,9 +128,11 @@ class LLMService:
             user_question: The question to ask
             all_identities: List of all three gods' identities (optional)
             god_index: Index of this god in the list (optional)
+            coalesce: Share an identical in-flight LLM request if one exists
 
         Returns:
-            The god's answer (yes_word, no_word, or "Unknown")
+            The god's answer (yes_word, no_word, or "Unknown"), marked cached
+            when it came from the answer cache or another caller's request
 
         Raises:
             LLMAnswerError: If LLM fails to provide valid answer
@@ -74,45 +140,83 @@ class LLMService:
         yes_word = language_map["Yes"]
         no_word = language_map["No"]
 
+        # Handle Random god specially (no LLM needed)
+        if god_identity == "Random":
+            return GodAnswer(random.choice([yes_word, no_word]))
+
+        # Test/development fallback to keep local and CI runs deterministic.
+        if settings.openai_api_key in {"", "mock-key"}:
+            return GodAnswer(yes_word)
+
+        # Ask in the canonical Ja=Yes frame so both language maps share answers
+        frame = CanonicalFrame.for_language_map(language_map)
+        canonical_question = frame.to_canonical(user_question)
+
         # Build prompt configuration
         config = PromptConfig(
-            yes_word=yes_word,
-            no_word=no_word,
+            yes_word=CANONICAL_YES,
+            no_word=CANONICAL_NO,
             god_identity=god_identity,
             all_identities=all_identities,
             god_index=god_index,
         )
 
-        # Handle Random god specially (no LLM needed)
-        if god_identity == "Random":
-            return random.choice([yes_word, no_word])
+        cache_key = AnswerKey.build(
+            self.model,
+            god_identity,
+            all_identities,
+            god_index,
+            CANONICAL_YES,
+            CANONICAL_NO,
+            canonical_question,
+        )
+        if self.answer_cache is not None:
+            cached = self.answer_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Answer cache hit for question: {user_question}")
+                return GodAnswer(frame.from_canonical(cached), cached=True)
 
-        # Test/development fallback to keep local and CI runs deterministic.
-        if settings.openai_api_key in {"", "mock-key"}:
-            return yes_word
+        requested = False
+
+        async def request() -> str:
+            nonlocal requested
+            requested = True
+            answer = await self._request_answer(config, canonical_question)
+            if self.answer_cache is not None and answer != "Unknown":
+                self.answer_cache.set(cache_key, answer)
+            return answer
+
+        if coalesce:
+            answer = await self.inflight.do(cache_key, request)
+        else:
+            answer = await request()
+        return GodAnswer(frame.from_canonical(answer), cached=not requested)
+
+    async def _request_answer(self, config: PromptConfig, user_question: str) -> str:
+        """Send the prompt to the LLM and validate the boxed answer."""
+        god_identity = config.god_identity
+        yes_word = config.yes_word
+        no_word = config.no_word
 
         # Build prompt using template system
         forced_answer = random.choice([yes_word, no_word]) if god_identity == "Random" else None
         system_prompt = PromptTemplates.build_prompt(config, forced_answer)
+        messages: list[ChatCompletionMessageParam] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_question},
+        ]
 
         try:
-            start_time = time.monotonic()
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_question},
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            elapsed = time.monotonic() - start_time
-            self._latency_window.append(elapsed)
-
-            content_raw = response.choices[0].message.content
-            if not isinstance(content_raw, str):
-                raise LLMAnswerError("LLM returned empty content")
-            content = content_raw.strip()
+            budget = self.token_budget.max_tokens(god_identity)
+            completion = await self._complete(messages, budget, yes_word, no_word)
+            if completion.truncated and budget < self.max_tokens:
+                logger.warning(
+                    f"Answer truncated at max_tokens={budget}; retrying with {self.max_tokens}"
+                )
+                self.token_budget.record(god_identity, completion.tokens, truncated=True)
+                completion = await self._complete(messages, self.max_tokens, yes_word, no_word)
+            self.token_budget.record(god_identity, completion.tokens, completion.truncated)
+            content = completion.content.strip()
 
             if settings.debug:
                 logger.info(f"[DEBUG] God Identity: {god_identity}")
@@ -152,5 +256,82 @@ class LLMService:
             logger.error(f"LLM error: {e}")
             raise LLMAnswerError(f"LLM execution failed: {str(e)}")
 
+    async def _complete(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        max_tokens: int,
+        yes_word: str,
+        no_word: str,
+    ) -> Completion:
+        self.usage_stats["max_tokens_reduction"] += self.max_tokens - max_tokens
+        if settings.llm_stream_enabled:
+            return await self._complete_streaming(messages, max_tokens, yes_word, no_word)
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+        )
+        usage = getattr(response, "usage", None)
+        self._record_usage(usage)
+
+        choice = response.choices[0]
+        content = choice.message.content
+        if not isinstance(content, str):
+            raise LLMAnswerError("LLM returned empty content")
+        tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(content)
+        truncated = getattr(choice, "finish_reason", None) == "length"
+        return Completion(content, tokens, truncated)
+
+    async def _complete_streaming(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        max_tokens: int,
+        yes_word: str,
+        no_word: str,
+    ) -> Completion:
+        """
+        Stream the completion and stop at the first boxed yes or no word.
+
+        Closing the stream drops the connection, which ends generation on the
+        provider side, so the tokens after the answer are never produced.
+        """
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parts: list[str] = []
+        usage = None
+        finish_reason = None
+        try:
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                delta = choice.delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                if "}" in delta and PromptValidator.first_definite_answer(
+                    "".join(parts), yes_word, no_word
+                ):
+                    self.usage_stats["early_stops"] += 1
+                    logger.info(f"Early stop after {len(parts)} chunks (max_tokens={max_tokens})")
+                    break
+        finally:
+            await stream.close()
+
+        content = "".join(parts)
+        self._record_usage(usage, fallback_completion_tokens=len(parts))
+        tokens = getattr(usage, "completion_tokens", None) or len(parts)
+        return Completion(content, tokens, truncated=finish_reason == "length")
+
 
 llm_service = LLMService()
@@ -0,0 +1,121 @@
+"""
+Password hashing service.
+Runs bcrypt on a bounded worker pool so logins never stall the event loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import bcrypt
+
+from app.core.config import settings
+from app.core.exceptions import PasswordServiceBusyError
+from app.core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def hash_password(password: str) -> str:
+    salt = bcrypt.gensalt()
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+class PasswordHasher:
+    """Offloads bcrypt work to a dedicated thread or process pool."""
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password pool kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a password function on the pool.
+
+        Raises:
+            PasswordServiceBusyError: If the pool and its queue are full
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordServiceBusyError()
+            self._pending += 1
+            self._submitted += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+        start_time = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            with timed("bcrypt"):
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.monotonic() - start_time
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._busy_seconds += elapsed
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "peak_pending": self._peak_pending,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_latency_ms": (
+                    self._busy_seconds / self._completed * 1000 if self._completed else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    kind=settings.password_pool_kind,
+    max_workers=settings.password_pool_workers,
+    max_queue=settings.password_pool_max_queue,
+)
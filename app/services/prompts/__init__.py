@@ -1,10 +1,18 @@
 """
 Prompt templates for the Three Gods Riddle LLM service.
 Modular, maintainable prompt system with clear separation of concerns.
+
+Prompts are laid out for provider-side prefix caching: the shared rules come
+first and are byte-identical for every request, the god's role follows, and
+everything that varies per session (words, identities, forced answers) is
+appended at the end.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from itertools import permutations
+from typing import Dict, List, Optional, Tuple
+
+from app.services.prompts.canonical import CANONICAL_NO, CANONICAL_YES
 
 
 @dataclass
@@ -18,20 +26,64 @@ class PromptConfig:
     god_index: Optional[int] = None
 
 
+PromptKey = Tuple[str, Optional[Tuple[str, ...]], Optional[int], str, str]
+
+GOD_IDENTITIES = ("True", "False", "Random")
+
+SHARED_RULES = """You are playing the Three Gods logic puzzle. Your language has two words: a YES-word and a NO-word. Which actual word is which is given at the end of these instructions.
+
+CRITICAL OUTPUT FORMAT:
+- You MUST output ONLY one word inside \\boxed{Answer}
+- Valid answers: \\boxed{YES-word}, \\boxed{NO-word} (written as the actual words), or \\boxed{Unknown}
+- If the question is paradoxical or unanswerable, output \\boxed{Unknown}"""
+
+TRUTH_GOD_ROLE = """You are the God of Truth. You ALWAYS tell the truth.
+
+ANSWERING RULES:
+1. Evaluate if the question is TRUE or FALSE
+2. If TRUE → answer with the YES-word
+3. If FALSE → answer with the NO-word
+4. If paradoxical/unanswerable → answer \\boxed{Unknown}
+
+SPECIAL CASE - Nested "Would you say" questions:
+For questions like "If I asked you P, would you answer X?":
+- Extract proposition P and target word X
+- If P is TRUE → answer \\boxed{X} (whatever X is)
+- If P is FALSE → answer opposite of X
+This works because you always tell the truth about what you would say."""
+
+FALSE_GOD_ROLE = """You are the God of Falsehood. You ALWAYS lie.
+
+ANSWERING RULES:
+1. Evaluate if the question is TRUE or FALSE
+2. If TRUE → you must LIE → answer with the NO-word
+3. If FALSE → you must LIE → answer with the YES-word
+4. If paradoxical/unanswerable → answer \\boxed{Unknown}
+
+SPECIAL CASE - Nested "Would you say" questions:
+For questions like "If I asked you P, would you answer X?":
+- Extract proposition P and target word X
+- If P is TRUE → answer \\boxed{X} (whatever X is)
+- If P is FALSE → answer opposite of X
+This works because the double-negative cancels out for liars."""
+
+RANDOM_GOD_ROLE = (
+    """You are the Random God. You answer randomly, ignoring the question's truth value."""
+)
+
+
 class PromptTemplates:
     """Centralized prompt templates for the Three Gods game."""
 
-    @staticmethod
-    def get_base_rules(yes_word: str, no_word: str) -> str:
-        """Base rules that apply to all gods."""
-        return f"""You are playing the Three Gods logic puzzle. There are two words in your language:
-- '{yes_word}' (one of these means Yes, the other means No)
-- '{no_word}' (one of these means Yes, the other means No)
+    _precomputed: Dict[PromptKey, str] = {}
 
-CRITICAL OUTPUT FORMAT:
-- You MUST output ONLY one word inside \\boxed{{Answer}}
-- Valid answers: \\boxed{{{yes_word}}}, \\boxed{{{no_word}}}, or \\boxed{{Unknown}}
-- If the question is paradoxical or unanswerable, output \\boxed{{Unknown}}"""
+    @staticmethod
+    def get_word_context(yes_word: str, no_word: str) -> str:
+        """Per-session words, placed after the static rules."""
+        return f"""YOUR WORDS:
+- YES-word: '{yes_word}' (means Yes)
+- NO-word: '{no_word}' (means No)
+Valid answers: \\boxed{{{yes_word}}}, \\boxed{{{no_word}}}, or \\boxed{{Unknown}}"""
 
     @staticmethod
     def get_identity_context(all_identities: Optional[List[str]], god_index: Optional[int]) -> str:
@@ -45,71 +97,67 @@ CRITICAL OUTPUT FORMAT:
             marker = "You" if i == god_index else "The other"
             lines.append(f"God {god_names[i]}: {marker} ({identity})")
 
-        return "You know all three gods' identities:\n" + "\n".join(lines) + "\n\n"
+        return "\n\nYou know all three gods' identities:\n" + "\n".join(lines)
 
     @staticmethod
-    def get_truth_god_prompt(config: PromptConfig) -> str:
-        """Prompt for the God of Truth."""
+    def _assemble(role: str, config: PromptConfig, tail: str = "") -> str:
         identity_ctx = PromptTemplates.get_identity_context(config.all_identities, config.god_index)
-        base_rules = PromptTemplates.get_base_rules(config.yes_word, config.no_word)
-
-        return f"""{identity_ctx}{base_rules}
+        word_ctx = PromptTemplates.get_word_context(config.yes_word, config.no_word)
+        return f"{SHARED_RULES}\n\n{role}\n\n{word_ctx}{identity_ctx}{tail}"
 
-You are the God of Truth. You ALWAYS tell the truth.
-
-ANSWERING RULES:
-1. Evaluate if the question is TRUE or FALSE
-2. If TRUE → answer \\boxed{{{config.yes_word}}}
-3. If FALSE → answer \\boxed{{{config.no_word}}}
-4. If paradoxical/unanswerable → answer \\boxed{{Unknown}}
-
-SPECIAL CASE - Nested "Would you say" questions:
-For questions like "If I asked you P, would you answer X?":
-- Extract proposition P and target word X
-- If P is TRUE → answer \\boxed{{X}} (whatever X is)
-- If P is FALSE → answer opposite of X
-This works because you always tell the truth about what you would say."""
+    @staticmethod
+    def get_truth_god_prompt(config: PromptConfig) -> str:
+        """Prompt for the God of Truth."""
+        return PromptTemplates._assemble(TRUTH_GOD_ROLE, config)
 
     @staticmethod
     def get_false_god_prompt(config: PromptConfig) -> str:
         """Prompt for the God of Falsehood."""
-        identity_ctx = PromptTemplates.get_identity_context(config.all_identities, config.god_index)
-        base_rules = PromptTemplates.get_base_rules(config.yes_word, config.no_word)
-
-        return f"""{identity_ctx}{base_rules}
-
-You are the God of Falsehood. You ALWAYS lie.
-
-ANSWERING RULES:
-1. Evaluate if the question is TRUE or FALSE
-2. If TRUE → you must LIE → answer \\boxed{{{config.no_word}}}
-3. If FALSE → you must LIE → answer \\boxed{{{config.yes_word}}}
-4. If paradoxical/unanswerable → answer \\boxed{{Unknown}}
-
-SPECIAL CASE - Nested "Would you say" questions:
-For questions like "If I asked you P, would you answer X?":
-- Extract proposition P and target word X
-- If P is TRUE → answer \\boxed{{X}} (whatever X is)
-- If P is FALSE → answer opposite of X
-This works because the double-negative cancels out for liars."""
+        return PromptTemplates._assemble(FALSE_GOD_ROLE, config)
 
     @staticmethod
     def get_random_god_prompt(config: PromptConfig, forced_answer: str) -> str:
         """Prompt for the Random God."""
-        identity_ctx = PromptTemplates.get_identity_context(config.all_identities, config.god_index)
-        base_rules = PromptTemplates.get_base_rules(config.yes_word, config.no_word)
-
-        return f"""{identity_ctx}{base_rules}
-
-You are the Random God. You answer randomly, ignoring the question's truth value.
+        tail = f"""
 
 For this question, you have randomly chosen to answer: '{forced_answer}'
 
 OUTPUT: \\boxed{{{forced_answer}}}"""
+        return PromptTemplates._assemble(RANDOM_GOD_ROLE, config, tail)
 
     @staticmethod
-    def build_prompt(config: PromptConfig, forced_answer: Optional[str] = None) -> str:
-        """Build the complete prompt based on god identity."""
+    def prompt_key(config: PromptConfig) -> PromptKey:
+        identities = tuple(config.all_identities) if config.all_identities else None
+        return (config.god_identity, identities, config.god_index, config.yes_word, config.no_word)
+
+    @classmethod
+    def precompute(cls) -> int:
+        """
+        Build every True/False god prompt a game can produce.
+
+        Covers the 6 identity orders × 2 LLM-backed god positions. Questions
+        are always put in the canonical Ja=Yes frame (see canonical.py), so
+        only that word assignment is ever requested. Returns the number of
+        cached prompts.
+        """
+        prompts: Dict[PromptKey, str] = {}
+        for identities in permutations(GOD_IDENTITIES):
+            for god_index, god_identity in enumerate(identities):
+                if god_identity == "Random":
+                    continue
+                config = PromptConfig(
+                    yes_word=CANONICAL_YES,
+                    no_word=CANONICAL_NO,
+                    god_identity=god_identity,
+                    all_identities=list(identities),
+                    god_index=god_index,
+                )
+                prompts[cls.prompt_key(config)] = cls._build(config)
+        cls._precomputed = prompts
+        return len(prompts)
+
+    @staticmethod
+    def _build(config: PromptConfig, forced_answer: Optional[str] = None) -> str:
         if config.god_identity == "True":
             return PromptTemplates.get_truth_god_prompt(config)
         elif config.god_identity == "False":
@@ -120,3 +168,12 @@ OUTPUT: \\boxed{{{forced_answer}}}"""
             return PromptTemplates.get_random_god_prompt(config, forced_answer)
         else:
             raise ValueError(f"Unknown god identity: {config.god_identity}")
+
+    @staticmethod
+    def build_prompt(config: PromptConfig, forced_answer: Optional[str] = None) -> str:
+        """Build the complete prompt based on god identity."""
+        if forced_answer is None:
+            cached = PromptTemplates._precomputed.get(PromptTemplates.prompt_key(config))
+            if cached is not None:
+                return cached
+        return PromptTemplates._build(config, forced_answer)
@@ -0,0 +1,42 @@
+"""
+Canonical language frame for god questions.
+Swapping Ja and Da everywhere (question, prompt and answer) leaves the puzzle
+unchanged, so every question can be put to the LLM as if Ja meant Yes.
+"""
+
+import re
+from dataclasses import dataclass
+
+CANONICAL_YES = "Ja"
+CANONICAL_NO = "Da"
+
+_WORD_PATTERN = re.compile(r"(?<![A-Za-z])(ja|da)(?![A-Za-z])", re.IGNORECASE)
+_SWAP = {"j": "d", "d": "j", "J": "D", "D": "J"}
+
+
+def _swap_word(match: re.Match[str]) -> str:
+    word = match.group(0)
+    return _SWAP[word[0]] + word[1:]
+
+
+@dataclass(frozen=True)
+class CanonicalFrame:
+    """Maps a game's language map onto the canonical Ja=Yes, Da=No frame."""
+
+    swapped: bool
+
+    @classmethod
+    def for_language_map(cls, language_map: dict[str, str]) -> "CanonicalFrame":
+        return cls(swapped=language_map["Yes"] != CANONICAL_YES)
+
+    def to_canonical(self, text: str) -> str:
+        """Rewrite Ja/Da mentions in text into the canonical frame."""
+        if not self.swapped:
+            return text
+        return _WORD_PATTERN.sub(_swap_word, text)
+
+    def from_canonical(self, answer: str) -> str:
+        """Map a canonical answer (Ja, Da or Unknown) back to the game's words."""
+        if not self.swapped or answer not in (CANONICAL_YES, CANONICAL_NO):
+            return answer
+        return CANONICAL_NO if answer == CANONICAL_YES else CANONICAL_YES
@@ -5,6 +5,8 @@ Prompt validator for testing and verification.
 import re
 from typing import Optional, Tuple
 
+BOXED_PATTERN = re.compile(r"\\boxed\{(.*?)\}")
+
 
 class PromptValidator:
     """Validates LLM responses for the Three Gods game."""
@@ -15,11 +17,29 @@ class PromptValidator:
         Extract answer from \\boxed{...} format.
         Returns the last boxed answer found (in case of multiple).
         """
-        matches = re.findall(r"\\boxed\{(.*?)\}", response)
+        matches = BOXED_PATTERN.findall(response)
         if not matches:
             return None
         return matches[-1].strip()
 
+    @staticmethod
+    def first_definite_answer(response: str, yes_word: str, no_word: str) -> Optional[str]:
+        """
+        Return the first \\boxed{...} answer that is the yes or no word, if any.
+        Used to stop a streamed completion as soon as it has answered.
+
+        \\boxed{Unknown} doesn't count: the model may still box a definite
+        answer after it, and validate_response reads the last box, so stopping
+        there would give a different answer than the full completion.
+        """
+        for match in BOXED_PATTERN.finditer(response):
+            is_valid, normalized = PromptValidator.validate_answer(
+                match.group(1).strip(), yes_word, no_word
+            )
+            if is_valid and normalized != "Unknown":
+                return normalized
+        return None
+
     @staticmethod
     def validate_answer(answer: str, yes_word: str, no_word: str) -> Tuple[bool, Optional[str]]:
         """
@@ -0,0 +1,275 @@
+"""
+Session reaper.
+/game/start inserts a GameSession on every click, and many of them never get a
+question. The reaper deletes those once they are older than the abandoned
+session TTL, and moves completed games older than the archive age, with their
+moves, into GameSessionArchive and GameMoveArchive, so the hot tables and
+their indexes only hold recent and unfinished games.
+
+Every worker schedules the reaper, but only the one holding the lock file
+(REAPER_LOCK_FILE) runs it. The lock dies with its process, so another
+worker takes over on its next tick. Workers on other hosts don't see the file;
+there, the PostgreSQL advisory lock keeps their batches apart.
+
+Usage: python -m app.services.reaper
+"""
+
+import asyncio
+import fcntl
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import IO, Optional
+
+from sqlalchemy import delete, insert, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.models import GameMove, GameMoveArchive, GameSession, GameSessionArchive, engine
+
+logger = logging.getLogger(__name__)
+
+# Key of the PostgreSQL advisory lock a batch holds, so workers reaping at the
+# same time don't move the same games.
+ADVISORY_LOCK_KEY = 7_301_356
+
+# Every archive column has a same-named column in the hot table it comes from.
+ARCHIVED_SESSION_COLUMNS = list(GameSessionArchive.model_fields)
+ARCHIVED_MOVE_COLUMNS = list(GameMoveArchive.model_fields)
+
+
+class LeaderLock:
+    """An exclusive lock on a file, held until released or the process exits."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        if self._file is None:
+            file = open(self.path, "a")
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                file.close()
+                return False
+            self._file = file
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class ReapReport:
+    """What one reaper run removed from the hot tables."""
+
+    abandoned_deleted: int = 0
+    games_archived: int = 0
+    moves_archived: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "ReapReport") -> None:
+        self.abandoned_deleted += other.abandoned_deleted
+        self.games_archived += other.games_archived
+        self.moves_archived += other.moves_archived
+        self.seconds += other.seconds
+
+
+def _lock_batch(db: Session) -> bool:
+    """Take the reaper lock for this transaction; False if another worker holds it."""
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    locked = db.connection().execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+    )
+    return bool(locked.scalar())
+
+
+def delete_abandoned_sessions(db: Session, cutoff: datetime, batch_size: int = 1000) -> int:
+    """
+    Delete sessions created before cutoff that never got a question.
+
+    They have no moves and no UserStats counts. Each batch re-checks the
+    condition, so a game that gets its first question meanwhile stays.
+    Returns the number of sessions deleted.
+    """
+    has_moves = select(GameMove.session_id).where(GameMove.session_id == GameSession.session_id)
+    unplayed = (
+        (col(GameSession.current_question_count) == 0)
+        & ~has_moves.exists()
+        & (col(GameSession.created_at) < cutoff)
+    )
+    deleted = 0
+    while _lock_batch(db):
+        ids = db.exec(
+            select(GameSession.session_id)
+            .where(unplayed)
+            .order_by(col(GameSession.session_id))
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        result = db.exec(  # type: ignore[call-overload]
+            delete(GameSession).where(col(GameSession.session_id).in_(ids), unplayed)
+        )
+        db.commit()
+        deleted += result.rowcount
+    db.rollback()
+    return deleted
+
+
+def archive_games(db: Session, cutoff: datetime, batch_size: int = 1000) -> tuple[int, int]:
+    """
+    Move completed games created before cutoff, and their moves, to the
+    archive tables. Unfinished games stay hot, where they can still be played.
+    Returns the number of games and moves moved.
+    """
+    stale = col(GameSession.is_completed) & (col(GameSession.created_at) < cutoff)
+    games = moves = 0
+    while _lock_batch(db):
+        ids = db.exec(
+            select(GameSession.session_id)
+            .where(stale)
+            .order_by(col(GameSession.session_id))
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        in_batch = col(GameSession.session_id).in_(ids)
+        moves_in_batch = col(GameMove.session_id).in_(ids)
+        session_columns = [getattr(GameSession, name) for name in ARCHIVED_SESSION_COLUMNS]
+        move_columns = [getattr(GameMove, name) for name in ARCHIVED_MOVE_COLUMNS]
+        db.exec(  # type: ignore[call-overload]
+            insert(GameSessionArchive).from_select(
+                ARCHIVED_SESSION_COLUMNS, select(*session_columns).where(in_batch)
+            )
+        )
+        moved = db.exec(  # type: ignore[call-overload]
+            insert(GameMoveArchive).from_select(
+                ARCHIVED_MOVE_COLUMNS, select(*move_columns).where(moves_in_batch)
+            )
+        )
+        db.exec(delete(GameMove).where(moves_in_batch))  # type: ignore[call-overload]
+        db.exec(delete(GameSession).where(in_batch))  # type: ignore[call-overload]
+        db.commit()
+        games += len(ids)
+        moves += moved.rowcount
+    db.rollback()
+    return games, moves
+
+
+class SessionReaper:
+    """Runs the reaper now or every interval, and keeps totals for /admin/metrics."""
+
+    def __init__(
+        self,
+        bind: Engine,
+        abandoned_ttl_seconds: float,
+        archive_after_days: float,
+        batch_size: int = 1000,
+        lock_path: Optional[str] = None,
+    ):
+        self.bind = bind
+        self.abandoned_ttl_seconds = abandoned_ttl_seconds
+        self.archive_after_days = archive_after_days
+        self.batch_size = batch_size
+        self.runs = 0
+        self.failures = 0
+        self.totals = ReapReport()
+        self.last_report: Optional[ReapReport] = None
+        # Without a lock file every scheduled reaper runs.
+        self.leader_lock = LeaderLock(lock_path) if lock_path else None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.leader_lock is None or self.leader_lock.acquire()
+
+    def run_once(self, now: Optional[datetime] = None) -> ReapReport:
+        now = now or datetime.utcnow()
+        began = time.perf_counter()
+        report = ReapReport()
+        with Session(self.bind) as db:
+            report.abandoned_deleted = delete_abandoned_sessions(
+                db, now - timedelta(seconds=self.abandoned_ttl_seconds), self.batch_size
+            )
+            if self.archive_after_days > 0:
+                report.games_archived, report.moves_archived = archive_games(
+                    db, now - timedelta(days=self.archive_after_days), self.batch_size
+                )
+        report.seconds = time.perf_counter() - began
+        self.runs += 1
+        self.totals.add(report)
+        self.last_report = report
+        logger.info(
+            f"Reaper deleted {report.abandoned_deleted} abandoned sessions and archived "
+            f"{report.games_archived} games ({report.moves_archived} moves) "
+            f"in {report.seconds:.2f}s"
+        )
+        return report
+
+    async def _run_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if not self.is_leader:
+                continue
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Reaper run failed: {e}")
+
+    def start(self, interval: float) -> None:
+        """Run every interval seconds on the running event loop (0 = never)."""
+        if interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_forever(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.leader_lock is not None:
+            self.leader_lock.release()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "leader": self.leader_lock is None or self.leader_lock.held,
+            "runs": self.runs,
+            "failures": self.failures,
+            "totals": asdict(self.totals),
+            "last_run": asdict(self.last_report) if self.last_report is not None else None,
+        }
+
+
+reaper = SessionReaper(
+    engine,
+    abandoned_ttl_seconds=settings.abandoned_session_ttl_seconds,
+    archive_after_days=settings.game_archive_after_days,
+    lock_path=settings.reaper_lock_file,
+)
+
+
+def main() -> None:
+    if reaper.leader_lock is not None:
+        # Wait for a worker's run to finish, and keep the workers out of ours.
+        reaper.leader_lock.acquire(blocking=True)
+    report = reaper.run_once()
+    print(
+        f"Deleted {report.abandoned_deleted} abandoned sessions, archived "
+        f"{report.games_archived} games and {report.moves_archived} moves "
+        f"in {report.seconds:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
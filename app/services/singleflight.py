@@ -0,0 +1,54 @@
+"""
+Single-flight request coalescing.
+Concurrent callers asking for the same key share one in-flight call and its result.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicates concurrent async calls that share a key."""
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Future[T]] = {}
+        self.calls = 0
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func for key, or join the call already in flight for it.
+
+        The shared call is shielded, so a cancelled caller never cancels the
+        upstream request that other callers are still waiting on.
+        """
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            self.leaders += 1
+            flight = asyncio.ensure_future(func())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, key: Hashable, flight: "asyncio.Future[T]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the outcome as retrieved even if every caller was cancelled.
+        if not flight.cancelled():
+            flight.exception()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "coalescing_ratio": self.coalesced / self.calls if self.calls else 0.0,
+        }
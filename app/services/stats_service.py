@@ -0,0 +1,168 @@
+"""
+Game statistics for the admin dashboard.
+Counters live in UserStats and are bumped in the same transaction as the game
+change they describe, so reading them never scans GameSession.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, cast
+
+from sqlalchemy import CursorResult, Float, case, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.dml import Insert
+from sqlmodel import col, func, select
+
+from app.core.database import DBSession
+from app.models import User, UserStats
+
+
+def user_stats_upsert(
+    dialect: str, user_id: str, games: int = 0, completed_games: int = 0, wins: int = 0
+) -> Optional[Insert]:
+    """INSERT ... ON CONFLICT statement adding deltas to a user's counters, if the dialect has one."""
+    if dialect not in ("sqlite", "postgresql"):
+        return None
+    insert = sqlite_insert if dialect == "sqlite" else pg_insert
+    statement = insert(UserStats).values(
+        user_id=user_id, games=games, completed_games=completed_games, wins=wins
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "games": UserStats.games + games,
+            "completed_games": UserStats.completed_games + completed_games,
+            "wins": UserStats.wins + wins,
+        },
+    )
+
+
+async def bump_user_stats(
+    db: DBSession, user_id: str, games: int = 0, completed_games: int = 0, wins: int = 0
+) -> None:
+    """Add deltas to a user's counters without committing."""
+    if not (games or completed_games or wins):
+        return
+    dialect = db.get_bind().dialect.name
+    upsert = user_stats_upsert(dialect, user_id, games, completed_games, wins)
+    if upsert is not None:
+        await db.execute(upsert)
+        return
+
+    # UPDATE statements give a CursorResult, which has the row count.
+    updated = cast(
+        CursorResult[Any],
+        await db.execute(
+            update(UserStats)
+            .where(col(UserStats.user_id) == user_id)
+            .values(
+                games=UserStats.games + games,
+                completed_games=UserStats.completed_games + completed_games,
+                wins=UserStats.wins + wins,
+            )
+        ),
+    )
+    if updated.rowcount == 0:
+        db.add(UserStats(user_id=user_id, games=games, completed_games=completed_games, wins=wins))
+
+
+async def global_stats(db: DBSession) -> dict[str, object]:
+    total_users = (await db.exec(select(func.count()).select_from(User))).one()
+    games, completed_games, wins = (
+        await db.exec(
+            select(
+                func.coalesce(func.sum(UserStats.games), 0),
+                func.coalesce(func.sum(UserStats.completed_games), 0),
+                func.coalesce(func.sum(UserStats.wins), 0),
+            )
+        )
+    ).one()
+    return {
+        "total_users": total_users,
+        "total_games": games,
+        "completed_games": completed_games,
+        "total_wins": wins,
+        "overall_win_rate": (wins / completed_games * 100) if completed_games else 0,
+    }
+
+
+_games = func.coalesce(UserStats.games, 0)
+_completed = func.coalesce(UserStats.completed_games, 0)
+_wins = func.coalesce(UserStats.wins, 0)
+# PostgreSQL would return NUMERIC, which neither JSON nor the cursor can hold.
+_win_rate = case((_completed > 0, _wins * 100.0 / _completed), else_=literal(0.0)).cast(Float)
+
+USER_SORT_COLUMNS = {
+    "id": col(User.id),
+    "created_at": col(User.created_at),
+    "total_games": _games,
+    "wins": _wins,
+    "win_rate": _win_rate,
+}
+
+
+def encode_cursor(value: object, user_id: str) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, user_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[object, str]:
+    """Decode a users-page cursor; raises ValueError if it is malformed."""
+    try:
+        value, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort == "created_at":
+            value = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    return value, user_id
+
+
+async def list_user_stats(
+    db: DBSession,
+    limit: int,
+    sort: str = "id",
+    descending: bool = False,
+    after: Optional[str] = None,
+) -> tuple[list[dict[str, object]], Optional[str]]:
+    """
+    One page of users with their game counters, in a single joined query.
+
+    Rows are ordered by (sort column, user id) and paged by keyset: the
+    returned cursor is the last row's key, to be passed back as `after`.
+    """
+    sort_column = USER_SORT_COLUMNS[sort]
+    key = tuple_(sort_column, col(User.id))
+    statement = select(User, _games, _wins, _win_rate).outerjoin(
+        UserStats, col(UserStats.user_id) == col(User.id)
+    )
+    if after is not None:
+        value, user_id = decode_cursor(after, sort)
+        bound = tuple_(literal(value), literal(user_id))
+        statement = statement.where(key < bound if descending else key > bound)
+    if descending:
+        statement = statement.order_by(sort_column.desc(), col(User.id).desc())
+    else:
+        statement = statement.order_by(sort_column, col(User.id))
+    rows = (await db.exec(statement.limit(limit))).all()
+
+    users = [
+        {
+            "id": user.id,
+            "is_admin": user.is_admin,
+            "is_disabled": user.is_disabled,
+            "created_at": user.created_at.isoformat(),
+            "total_games": games,
+            "wins": wins,
+            "win_rate": win_rate,
+        }
+        for user, games, wins, win_rate in rows
+    ]
+    next_cursor = None
+    if users and len(users) == limit:
+        # Each sort key is also a field of the row, under the same name.
+        next_cursor = encode_cursor(users[-1][sort], users[-1]["id"])
+    return users, next_cursor
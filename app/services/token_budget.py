@@ -0,0 +1,76 @@
+"""
+Adaptive max_tokens budget for LLM answers.
+Tracks how many completion tokens each god type actually uses and caps
+max_tokens a little above that, instead of always reserving the configured
+ceiling.
+"""
+
+from app.services.latency_model import LatencySketch
+
+MIN_BUDGET_SAMPLES = 20
+BUDGET_QUANTILE = 0.99
+BUDGET_HEADROOM = 2.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for providers that do not report usage."""
+    return len(text) // 4 + 1
+
+
+class TokenBudget:
+    """Per-god max_tokens derived from observed completion lengths."""
+
+    def __init__(self, ceiling: int, floor: int, enabled: bool = True):
+        self.ceiling = ceiling
+        self.floor = min(floor, ceiling)
+        self.enabled = enabled
+        self._sketches: dict[str, LatencySketch] = {}
+        self._truncations: dict[str, int] = {}
+        self._cooldown: dict[str, int] = {}
+
+    def max_tokens(self, god_identity: str) -> int:
+        """
+        Budget for the next answer from this god.
+
+        Uses the configured ceiling until enough answers have been seen, then
+        twice the p99 completion length, clamped to [floor, ceiling].
+        """
+        sketch = self._sketches.get(god_identity)
+        if not self.enabled or sketch is None or sketch.count < MIN_BUDGET_SAMPLES:
+            return self.ceiling
+        if self._cooldown.get(god_identity, 0) > 0:
+            return self.ceiling
+        p99 = sketch.quantile(BUDGET_QUANTILE)
+        assert p99 is not None
+        return max(self.floor, min(self.ceiling, int(p99 * BUDGET_HEADROOM) + 1))
+
+    def record(self, god_identity: str, completion_tokens: int, truncated: bool = False) -> None:
+        """
+        Record one answer's length.
+
+        A truncated answer puts that god back on the ceiling for the next
+        MIN_BUDGET_SAMPLES answers, so the sketch can catch up with the longer tail.
+        """
+        if truncated:
+            self._truncations[god_identity] = self._truncations.get(god_identity, 0) + 1
+            self._cooldown[god_identity] = MIN_BUDGET_SAMPLES
+            return
+        if self._cooldown.get(god_identity, 0) > 0:
+            self._cooldown[god_identity] -= 1
+        sketch = self._sketches.get(god_identity)
+        if sketch is None:
+            sketch = self._sketches[god_identity] = LatencySketch()
+        sketch.add(max(completion_tokens, 1))
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        return {
+            god_identity: {
+                "answers": sketch.count,
+                "p50_tokens": sketch.quantile(0.5),
+                "p99_tokens": sketch.quantile(BUDGET_QUANTILE),
+                "truncations": self._truncations.get(god_identity, 0),
+                "max_tokens": self.max_tokens(god_identity),
+                "ceiling": self.ceiling,
+            }
+            for god_identity, sketch in self._sketches.items()
+        }
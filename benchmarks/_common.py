@@ -0,0 +1,134 @@
+"""
+Shared harness for the benchmark scripts.
+Builds an in-process app client over a temporary SQLite file and a fake LLM.
+"""
+
+import asyncio
+import os
+import statistics
+import tempfile
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_FILE", "")
+
+import httpx  # noqa: E402
+from sqlmodel import Session, SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+
+from app.core.database import (  # noqa: E402
+    SyncSessionAdapter,
+    async_url,
+    create_async_db_engine,
+    create_db_engine,
+)
+from app.main import app, create_access_token, get_db, hash_password  # noqa: E402
+from app.models import User  # noqa: E402
+from app.services.llm_service import llm_service  # noqa: E402
+
+
+class FakeCompletions:
+    """Async completions API answering after a fixed latency."""
+
+    def __init__(self, latency: float, content: str = "\\boxed{Ja}"):
+        self.latency = latency
+        self.content = content
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def install_fake_llm(latency: float) -> FakeCompletions:
+    completions = FakeCompletions(latency)
+    llm_service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    llm_service.get_simulated_delay = lambda: latency  # type: ignore[method-assign]
+    return completions
+
+
+_loop = asyncio.new_event_loop()
+
+
+def run_async(coro):
+    """Run coro on one shared event loop, so timings leave out loop startup."""
+    return _loop.run_until_complete(coro)
+
+
+# Start the thread pool SyncSessionAdapter calls run in before anything is timed.
+run_async(run_in_threadpool(lambda: None))
+
+
+def make_engine(path: str, **kwargs):
+    # Request sessions hold pooled connections across awaits, so size the pool
+    # above the benchmark concurrency to avoid checkout stalls.
+    kwargs.setdefault("pool_size", 64)
+    kwargs.setdefault("max_overflow", 64)
+    engine = create_db_engine(f"sqlite:///{path}", **kwargs)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def create_user(engine, user_id: str, password: str = "benchpass123") -> dict[str, str]:
+    with Session(engine) as db:
+        db.add(User(id=user_id, hashed_password=hash_password(password)))
+        db.commit()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
+
+
+@asynccontextmanager
+async def bench_client(engine=None):
+    """
+    Yield (client, engine) with get_db bound to a temporary database.
+
+    Requests get an async session on the same file when the async driver is
+    installed, as they do in the app; engine stays sync for seeding.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = engine or make_engine(os.path.join(tmp, "bench.db"))
+        url = engine.url.render_as_string(hide_password=False)
+        async_engine = None
+        if async_url(url) is not None:
+            async_engine = create_async_db_engine(url, pool_size=64, max_overflow=64)
+
+        async def get_session_override():
+            if async_engine is None:
+                with Session(engine, expire_on_commit=False) as session:
+                    yield SyncSessionAdapter(session)
+                return
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_session_override
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                yield client, engine
+        finally:
+            app.dependency_overrides.clear()
+            if async_engine is not None:
+                await async_engine.dispose()
+            engine.dispose()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> str:
+    if not samples:
+        return "n=0"
+    return (
+        f"n={len(samples)} p50={percentile(samples, 50) * 1000:.1f}ms "
+        f"p99={percentile(samples, 99) * 1000:.1f}ms "
+        f"mean={statistics.fmean(samples) * 1000:.1f}ms"
+    )
@@ -0,0 +1,105 @@
+"""
+/admin/stats cost with a large GameSession table.
+
+Seeds N game sessions across many users, then times three ways to build the
+dashboard numbers: loading every row into Python (the old endpoint), one SQL
+aggregate over GameSession, and summing the maintained UserStats counters.
+
+Usage: python -m benchmarks.admin_stats [--games 1000000] [--users 10000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import case, func, insert
+from sqlmodel import Session, col, select
+
+from app.core.database import SyncSessionAdapter
+from app.models import GameSession, User, backfill_user_stats
+from app.services.stats_service import global_stats
+from benchmarks._common import make_engine, run_async
+
+CHUNK = 50000
+
+
+def python_stats(db: Session) -> tuple[int, int, int]:
+    all_games = db.exec(select(GameSession)).all()
+    active_games = [g for g in all_games if g.current_question_count > 0]
+    completed_games = [g for g in active_games if g.is_completed]
+    return len(active_games), len(completed_games), sum(1 for g in completed_games if g.is_win)
+
+
+def sql_stats(db: Session) -> tuple[int, int, int]:
+    active = GameSession.current_question_count > 0
+    completed = active & col(GameSession.is_completed)
+    row = db.exec(
+        select(
+            func.count(case((active, 1))),
+            func.count(case((completed, 1))),
+            func.count(case((completed & col(GameSession.is_win), 1))),
+        )
+    ).one()
+    return tuple(row)  # type: ignore[return-value]
+
+
+def counter_stats(db: Session) -> tuple[int, int, int]:
+    stats = run_async(global_stats(SyncSessionAdapter(db)))
+    return stats["total_games"], stats["completed_games"], stats["total_wins"]  # type: ignore
+
+
+def seed(engine, games: int, users: int) -> None:
+    rng = random.Random(7)
+    with Session(engine) as db:
+        db.exec(  # type: ignore[call-overload]
+            insert(User), params=[{"id": f"user{i}", "hashed_password": "x"} for i in range(users)]
+        )
+        for start in range(0, games, CHUNK):
+            rows = []
+            for _ in range(min(CHUNK, games - start)):
+                completed = rng.random() < 0.8
+                rows.append(
+                    {
+                        "user_id": f"user{rng.randrange(users)}",
+                        "current_question_count": rng.choice((0, 1, 2, 3, 3, 3)),
+                        "is_completed": completed,
+                        "is_win": completed and rng.random() < 0.4,
+                    }
+                )
+            db.exec(insert(GameSession), params=rows)  # type: ignore[call-overload]
+        db.commit()
+        backfill_user_stats(db)
+
+
+def timed(label: str, func, db: Session) -> tuple[int, int, int]:
+    began = time.perf_counter()
+    result = func(db)
+    print(f"  {label:<28} {(time.perf_counter() - began) * 1000:10.1f} ms  {result}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "stats.db"))
+        began = time.perf_counter()
+        seed(engine, args.games, args.users)
+        print(
+            f"seeded {args.games} games for {args.users} users in {time.perf_counter() - began:.1f}s"
+        )
+        with Session(engine) as db:
+            expected = timed("python (load all rows)", python_stats, db)
+            db.expunge_all()
+            assert timed("sql aggregate", sql_stats, db) == expected
+            assert timed("UserStats counters", counter_stats, db) == expected
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+/admin/users page cost: one query per user versus one joined query.
+
+Seeds users and game sessions, then builds a 50-user page the old way (a
+GameSession query per user, counted in Python) and with list_user_stats,
+reporting time and the number of SQL statements for each.
+
+Usage: python -m benchmarks.admin_users [--users 2000] [--games 200000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.database import SyncSessionAdapter
+from app.models import GameSession, User
+from app.services.stats_service import list_user_stats
+from benchmarks._common import make_engine, run_async
+from benchmarks.admin_stats import seed
+
+PAGE = 50
+
+
+def per_user_queries(db: Session) -> list[dict[str, object]]:
+    users = db.exec(select(User).order_by(User.id).limit(PAGE)).all()
+    page = []
+    for user in users:
+        games = db.exec(select(GameSession).where(GameSession.user_id == user.id)).all()
+        active_games = [g for g in games if g.current_question_count > 0]
+        completed_games = [g for g in active_games if g.is_completed]
+        wins = sum(1 for g in completed_games if g.is_win)
+        page.append({"id": user.id, "total_games": len(active_games), "wins": wins})
+    return page
+
+
+def joined_query(db: Session, sort: str = "id") -> list[dict[str, object]]:
+    page = list_user_stats(SyncSessionAdapter(db), PAGE, sort=sort, descending=sort != "id")
+    users, _ = run_async(page)
+    return users
+
+
+def measure(label: str, engine, func) -> list[dict[str, object]]:
+    statements = [0]
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    with Session(engine) as db:
+        began = time.perf_counter()
+        result = func(db)
+        elapsed = time.perf_counter() - began
+    event.remove(engine, "before_cursor_execute", count)
+    print(f"  {label:<32} {elapsed * 1000:9.1f} ms  {statements[0]:>3} queries")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--games", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "users.db"))
+        seed(engine, args.games, args.users)
+        print(f"{args.users} users, {args.games} games, page of {PAGE}")
+        old = measure("query per user (old)", engine, per_user_queries)
+        new = measure("joined UserStats query", engine, joined_query)
+        assert [(u["id"], u["total_games"], u["wins"]) for u in old] == [
+            (u["id"], u["total_games"], u["wins"]) for u in new
+        ]
+        measure("joined, sorted by win_rate", engine, lambda db: joined_query(db, "win_rate"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
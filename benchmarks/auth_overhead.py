@@ -0,0 +1,81 @@
+"""
+Per-request authentication overhead.
+
+Times get_current_user the way a request runs it (open a session, resolve the
+bearer token, close the session) for many users, with the User row loaded on
+every request, with the auth state cache, and with signed token claims.
+
+Usage: python -m benchmarks.auth_overhead [--users 200] [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import SyncSessionAdapter, async_url, create_async_db_engine
+from app.main import get_current_user, issue_access_token
+from app.models import User
+from app.services.auth_cache import auth_cache
+from benchmarks._common import make_engine, percentile
+
+
+async def measure(label: str, engine, tokens: list[str], requests: int) -> None:
+    url = engine.url.render_as_string(hide_password=False)
+    async_engine = create_async_db_engine(url) if async_url(url) else None
+    rng = random.Random(3)
+    samples = []
+    for _ in range(requests):
+        token = rng.choice(tokens)
+        began = time.perf_counter()
+        if async_engine is not None:
+            async with AsyncSession(async_engine, expire_on_commit=False) as db:
+                await get_current_user(token=token, db=db)
+        else:
+            with Session(engine, expire_on_commit=False) as session:
+                await get_current_user(token=token, db=SyncSessionAdapter(session))
+        samples.append(time.perf_counter() - began)
+    if async_engine is not None:
+        await async_engine.dispose()
+    print(
+        f"  {label:<24} p50={percentile(samples, 50) * 1e6:8.1f}us "
+        f"p99={percentile(samples, 99) * 1e6:8.1f}us"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "auth.db"))
+        user_ids = [f"player{i}" for i in range(args.users)]
+        with Session(engine) as db:
+            db.add_all([User(id=user_id, hashed_password="x") for user_id in user_ids])
+            db.commit()
+            users = [db.get(User, user_id) for user_id in user_ids]
+            plain = [issue_access_token(user) for user in users]  # type: ignore[arg-type]
+            os.environ["AUTH_TOKEN_CLAIMS"] = "true"
+            claims = [issue_access_token(user) for user in users]  # type: ignore[arg-type]
+        print(f"{args.requests} requests from {args.users} users")
+
+        ttl = auth_cache.ttl_seconds
+        auth_cache.ttl_seconds = 0
+        os.environ["AUTH_TOKEN_CLAIMS"] = "false"
+        await measure("user row per request", engine, plain, args.requests)
+        auth_cache.ttl_seconds = ttl
+        await measure(f"auth cache (ttl={ttl:g}s)", engine, plain, args.requests)
+        os.environ["AUTH_TOKEN_CLAIMS"] = "true"
+        await measure("signed claims", engine, claims, args.requests)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
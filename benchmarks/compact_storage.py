@@ -0,0 +1,142 @@
+"""
+Game setup storage: JSON columns versus god_order/language_swapped.
+
+Fills a SQLite file with GameSession rows in the old shape (identities and
+language map as JSON text), measures it, compacts it with migration 5 and
+measures again. Size is the vacuumed file; the scan counts won games whose
+first god is Random over the whole table; decode fetches rows and turns them
+into GameState the way the engine does.
+
+Usage: python -m benchmarks.compact_storage [--rows 10000000] [--decode-rows 1000000]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlmodel import Session, SQLModel
+
+from app.core.database import create_db_engine
+from app.migrations import compact_game_setup
+from app.models import User
+from app.services.game_state import GOD_ORDERS, GameState
+
+LEGACY_GAMESESSION = """
+CREATE TABLE gamesession (
+    session_id INTEGER PRIMARY KEY,
+    user_id VARCHAR NOT NULL REFERENCES user (id),
+    god_identities VARCHAR NOT NULL,
+    language_map VARCHAR NOT NULL,
+    current_question_count INTEGER NOT NULL,
+    move_history VARCHAR NOT NULL,
+    user_guesses VARCHAR,
+    is_completed BOOLEAN NOT NULL,
+    is_win BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL
+)
+"""
+
+CHUNK = 100_000
+USERS = 1000
+RANDOM_FIRST = [order for order, gods in enumerate(GOD_ORDERS) if gods[0] == "Random"]
+
+
+def fill(engine, rows: int) -> None:
+    rng = random.Random(5)
+    with Session(engine) as db:
+        db.add_all([User(id=f"player{i}", hashed_password="x") for i in range(USERS)])
+        db.commit()
+    with engine.begin() as connection:
+        connection.exec_driver_sql(LEGACY_GAMESESSION)
+    for start in range(0, rows, CHUNK):
+        batch = []
+        for _ in range(min(CHUNK, rows - start)):
+            state = GameState.deal(rng)
+            completed = rng.random() < 0.8
+            batch.append(
+                (
+                    f"player{rng.randrange(USERS)}",
+                    json.dumps(state.identities),
+                    json.dumps(state.language_map),
+                    rng.randrange(4),
+                    json.dumps(state.identities) if completed else None,
+                    completed,
+                    completed and rng.random() < 0.5,
+                )
+            )
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO gamesession (user_id, god_identities, language_map, "
+                "current_question_count, move_history, user_guesses, is_completed, is_win, "
+                "created_at) VALUES (?, ?, ?, ?, '[]', ?, ?, ?, '2025-01-01 00:00:00')",
+                batch,
+            )
+
+
+def measure(label: str, engine, rows: int, scan_sql: str, decode_sql: str, decode) -> None:
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+        pages = connection.exec_driver_sql("PRAGMA page_count").scalar()
+        page_size = connection.exec_driver_sql("PRAGMA page_size").scalar()
+        size = pages * page_size
+
+        began = time.perf_counter()
+        wins = connection.exec_driver_sql(scan_sql).scalar()
+        scan = time.perf_counter() - began
+
+        began = time.perf_counter()
+        decoded = 0
+        for row in connection.exec_driver_sql(decode_sql):
+            decode(*row)
+            decoded += 1
+        per_row = (time.perf_counter() - began) / max(decoded, 1)
+    print(
+        f"  {label:<8} size={size / 2**20:8.1f}MiB ({size / rows:5.1f} B/row) "
+        f"scan={scan * 1000:8.1f}ms (wins={wins}) decode={per_row * 1e6:5.2f}us/row"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--decode-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'games.db')}")
+        SQLModel.metadata.create_all(engine, tables=[User.__table__])
+        fill(engine, args.rows)
+        print(f"{args.rows} GameSession rows")
+
+        measure(
+            "json",
+            engine,
+            args.rows,
+            "SELECT count(*) FROM gamesession WHERE is_win AND god_identities LIKE '[\"Random\"%'",
+            f"SELECT god_identities, language_map FROM gamesession LIMIT {args.decode_rows}",
+            GameState.from_json,
+        )
+
+        began = time.perf_counter()
+        with Session(engine) as db:
+            compact_game_setup(db)
+            db.commit()
+        print(f"  migration 5 took {time.perf_counter() - began:.1f}s")
+
+        orders = ", ".join(str(order) for order in RANDOM_FIRST)
+        measure(
+            "compact",
+            engine,
+            args.rows,
+            f"SELECT count(*) FROM gamesession WHERE is_win AND god_order IN ({orders})",
+            f"SELECT god_order, language_swapped FROM gamesession LIMIT {args.decode_rows}",
+            lambda order, swapped: GameState(order, bool(swapped)),
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+SQLite write concurrency: the old bare engine versus create_db_engine.
+
+Worker threads each play games the way process_question writes them (read the
+session and its moves, insert a GameMove, bump the counters, commit) while
+reader threads list history. Reports committed moves per second and the
+number of transactions that failed with "database is locked".
+
+Usage: python -m benchmarks.db_stress [--writers 16] [--readers 4] [--seconds 5]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, col, create_engine, select
+
+from app.core.database import create_db_engine
+from app.models import GameMove, GameSession, User
+from app.services.stats_service import user_stats_upsert
+
+
+def play(engine, user_id: str, stop: threading.Event, counts: dict[str, int], lock) -> None:
+    while not stop.is_set():
+        try:
+            with Session(engine) as db:
+                game = GameSession(user_id=user_id)
+                db.add(game)
+                db.commit()
+                for round_number in range(1, 4):
+                    db.exec(select(GameMove).where(GameMove.session_id == game.session_id)).all()
+                    db.add(
+                        GameMove(
+                            session_id=game.session_id,
+                            round=round_number,
+                            god_index=round_number - 1,
+                            question="Is Ja yes?",
+                            answer="Ja",
+                        )
+                    )
+                    if round_number == 1:
+                        db.exec(user_stats_upsert("sqlite", user_id, games=1))  # type: ignore
+                    game.current_question_count = round_number
+                    db.add(game)
+                    db.commit()
+                    with lock:
+                        counts["moves"] += 1
+        except OperationalError as e:
+            with lock:
+                key = "locked" if "locked" in str(e) else "other_errors"
+                counts[key] += 1
+
+
+def browse(engine, stop: threading.Event, counts: dict[str, int], lock) -> None:
+    while not stop.is_set():
+        try:
+            with Session(engine) as db:
+                db.exec(
+                    select(GameSession).order_by(col(GameSession.session_id).desc()).limit(20)
+                ).all()
+            with lock:
+                counts["reads"] += 1
+        except OperationalError:
+            with lock:
+                counts["read_errors"] += 1
+
+
+def run(label: str, engine, writers: int, readers: int, seconds: float) -> None:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([User(id=f"stress{i}", hashed_password="x") for i in range(writers)])
+        db.commit()
+
+    counts = {"moves": 0, "locked": 0, "other_errors": 0, "reads": 0, "read_errors": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=play, args=(engine, f"stress{i}", stop, counts, lock))
+        for i in range(writers)
+    ]
+    threads += [
+        threading.Thread(target=browse, args=(engine, stop, counts, lock)) for _ in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    failed = counts["locked"] + counts["other_errors"]
+    print(f"{label}:")
+    print(
+        f"  moves/s={counts['moves'] / seconds:.0f} reads/s={counts['reads'] / seconds:.0f} "
+        f"locked={counts['locked']} other_errors={counts['other_errors']} "
+        f"error_rate={failed / max(1, failed + counts['moves']):.1%}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bare = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bare.db')}", connect_args={"check_same_thread": False}
+        )
+        run("bare engine (rollback journal, synchronous=FULL)", bare, **vars(args))
+        tuned = create_db_engine(f"sqlite:///{os.path.join(tmp, 'tuned.db')}")
+        run("create_db_engine (WAL, synchronous=NORMAL, pooled)", tuned, **vars(args))
+
+
+if __name__ == "__main__":
+    main()
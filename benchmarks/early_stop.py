@@ -0,0 +1,92 @@
+"""
+Early-stop streaming and adaptive max_tokens versus full completions.
+
+A fake LLM generates tokens at a fixed rate: a short preamble, the boxed
+answer, then a trailing explanation. Each mode asks the same questions and
+reports answer latency, completion tokens and the max_tokens reserved.
+
+Usage: python -m benchmarks.early_stop [--questions 40] [--trailing 120]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+from app.services.llm_service import LLMService
+from benchmarks._common import summarize
+
+TOKEN_LATENCY = 0.002
+
+
+class StreamingCompletions:
+    """Fake completions API that generates one token every TOKEN_LATENCY seconds."""
+
+    def __init__(self, trailing: int):
+        self.tokens = ["Thinking", " it", " through", ":", " \\boxed{", "Ja", "}"]
+        self.tokens += [" word"] * trailing
+
+    async def create(self, max_tokens: int, stream: bool = False, **kwargs):
+        tokens = self.tokens[:max_tokens]
+        if stream:
+            return _Stream(tokens)
+        await asyncio.sleep(TOKEN_LATENCY * len(tokens))
+        message = SimpleNamespace(content="".join(tokens))
+        usage = SimpleNamespace(prompt_tokens=0, completion_tokens=len(tokens))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class _Stream:
+    def __init__(self, tokens: list[str]):
+        self._tokens = iter(tokens)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        token = next(self._tokens, None)
+        if token is None:
+            raise StopAsyncIteration
+        await asyncio.sleep(TOKEN_LATENCY)
+        choice = SimpleNamespace(delta=SimpleNamespace(content=token), finish_reason=None)
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    async def close(self) -> None:
+        pass
+
+
+async def run_mode(label: str, stream: bool, questions: int, trailing: int) -> None:
+    os.environ["LLM_STREAM_ENABLED"] = "true" if stream else "false"
+    service = LLMService()
+    service.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=StreamingCompletions(trailing))
+    )
+    service.answer_cache = None
+    latencies = []
+    for i in range(questions):
+        began = time.monotonic()
+        await service.ask_god("True", {"Yes": "Ja", "No": "Da"}, f"Question {i}?")
+        latencies.append(time.monotonic() - began)
+    usage = service.usage_summary()
+    budget = usage["token_budget"]["True"]["max_tokens"]
+    print(f"{label}:")
+    print(f"  latency: {summarize(latencies)}")
+    print(
+        f"  completion_tokens={usage['completion_tokens']} early_stops={usage['early_stops']} "
+        f"max_tokens now={budget} (reserved {usage['max_tokens_reduction']} fewer tokens)"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--trailing", type=int, default=120)
+    args = parser.parse_args()
+
+    await run_mode("full completions", False, args.questions, args.trailing)
+    await run_mode("streamed with early stop", True, args.questions, args.trailing)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""
+Move writes under concurrency: one transaction per /game/ask versus group commit.
+
+Many players ask questions at once against a near-instant fake LLM, so the
+write path dominates. Runs once with a commit per request and once with
+MOVE_GROUP_COMMIT, and reports moves written per second and /game/ask latency.
+
+Usage: python -m benchmarks.group_commit [--players 64] [--games 5]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from app.services.game_service import game_engine
+from benchmarks._common import bench_client, create_user, install_fake_llm, summarize
+
+LLM_LATENCY = 0.001
+
+
+async def run_scenario(label: str, players: int, games: int) -> None:
+    async with bench_client() as (client, engine):
+        headers = [create_user(engine, f"player{i}", "x") for i in range(players)]
+        latencies: list[float] = []
+
+        async def player(auth: dict[str, str]) -> None:
+            for _ in range(games):
+                start = await client.post("/game/start", headers=auth)
+                ask = {"session_id": start.json()["session_id"], "god_index": 0, "question": "Q?"}
+                for _ in range(3):
+                    began = time.perf_counter()
+                    response = await client.post("/game/ask", headers=auth, json=ask)
+                    latencies.append(time.perf_counter() - began)
+                    assert response.status_code == 200, response.text
+
+        began = time.perf_counter()
+        await asyncio.gather(*(player(auth) for auth in headers))
+        elapsed = time.perf_counter() - began
+        print(f"{label}:")
+        print(f"  {len(latencies) / elapsed:8.1f} moves/s  /game/ask {summarize(latencies)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=64)
+    parser.add_argument("--games", type=int, default=5)
+    args = parser.parse_args()
+
+    install_fake_llm(LLM_LATENCY)
+    os.environ["MOVE_GROUP_COMMIT"] = "false"
+    await run_scenario("commit per request", args.players, args.games)
+    os.environ["MOVE_GROUP_COMMIT"] = "true"
+    await run_scenario("group commit", args.players, args.games)
+    print(f"  batches: {game_engine.move_writer.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
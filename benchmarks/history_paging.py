@@ -0,0 +1,96 @@
+"""
+/history page cost by depth: OFFSET pagination versus the keyset cursor.
+
+Seeds one user with many played games (plus other users' games as noise) and
+times fetching a page at increasing depths with the old OFFSET query and the
+current `before` cursor query. Keyset pages should cost the same at any depth.
+
+Usage: python -m benchmarks.history_paging [--games 20000] [--page 20]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlmodel import Session, col, select
+
+from app.models import GameMove, GameSession, User
+from benchmarks._common import make_engine
+
+REPEATS = 50
+
+
+def _played():
+    return select(GameMove.session_id).where(GameMove.session_id == GameSession.session_id).exists()
+
+
+def offset_page(db: Session, user_id: str, depth: int, page: int) -> list[GameSession]:
+    statement = (
+        select(GameSession)
+        .where(GameSession.user_id == user_id, _played())
+        .order_by(col(GameSession.session_id).desc())
+        .offset(depth)
+        .limit(page)
+    )
+    return list(db.exec(statement).all())
+
+
+def cursor_page(db: Session, user_id: str, before: int, page: int) -> list[GameSession]:
+    statement = (
+        select(GameSession)
+        .where(GameSession.user_id == user_id, _played(), col(GameSession.session_id) < before)
+        .order_by(col(GameSession.session_id).desc())
+        .limit(page)
+    )
+    return list(db.exec(statement).all())
+
+
+def seed(engine, games: int) -> list[int]:
+    with Session(engine) as db:
+        db.add_all([User(id="heavy", hashed_password="x"), User(id="other", hashed_password="x")])
+        db.commit()
+        rows = [{"user_id": "heavy" if i % 4 else "other"} for i in range(games)]
+        db.exec(insert(GameSession), params=rows)  # type: ignore[call-overload]
+        ids = db.exec(select(GameSession.session_id).where(GameSession.user_id == "heavy")).all()
+        moves = [
+            {"session_id": session_id, "round": 1, "god_index": 0, "question": "Q?", "answer": "Ja"}
+            for session_id in ids
+        ]
+        db.exec(insert(GameMove), params=moves)  # type: ignore[call-overload]
+        db.commit()
+    return sorted(ids, reverse=True)
+
+
+def timed(func) -> float:
+    began = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - began) / REPEATS * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--page", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "history.db"))
+        ids = seed(engine, args.games)
+        print(f"{len(ids)} played games for one user, page size {args.page}")
+        with Session(engine) as db:
+            for depth in (0, len(ids) // 4, len(ids) // 2, len(ids) - args.page):
+                before = ids[depth - 1] if depth else ids[0] + 1
+                by_offset = timed(lambda: offset_page(db, "heavy", depth, args.page))
+                by_cursor = timed(lambda: cursor_page(db, "heavy", before, args.page))
+                assert [g.session_id for g in offset_page(db, "heavy", depth, args.page)] == [
+                    g.session_id for g in cursor_page(db, "heavy", before, args.page)
+                ]
+                print(f"  depth {depth:>6}: offset {by_offset:.2f} ms  cursor {by_cursor:.2f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Eager versus lazy game start.
+
+Plays games from concurrent players where most games are abandoned right
+after /game/start and the rest ask one question, once inserting the
+GameSession at /game/start and once with LAZY_GAME_START (stateless game
+token, row written with the first question). Reports /game/start latency,
+committed write transactions and the GameSession rows left behind.
+
+Usage: python -m benchmarks.lazy_start [--games 400] [--players 20] [--abandoned 0.6]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, func, select
+
+from app.models import GameSession
+from benchmarks._common import bench_client, create_user, install_fake_llm, summarize
+
+LLM_LATENCY = 0.01
+
+commits = 0
+
+
+@event.listens_for(Engine, "commit")
+def _count_commit(connection) -> None:
+    global commits
+    commits += 1
+
+
+async def run_scenario(label: str, games: int, players: int, abandoned: float) -> None:
+    global commits
+    async with bench_client() as (client, engine):
+        headers = create_user(engine, "player")
+        rng = random.Random(7)
+        plays = [rng.random() >= abandoned for _ in range(games)]
+        start_latencies: list[float] = []
+        queue = iter(plays)
+
+        async def player() -> None:
+            for play in queue:
+                began = time.perf_counter()
+                start = (await client.post("/game/start", headers=headers)).json()
+                start_latencies.append(time.perf_counter() - began)
+                if play:
+                    game = {
+                        "session_id": start["session_id"],
+                        "game_token": start.get("game_token"),
+                    }
+                    await client.post(
+                        "/game/ask",
+                        headers=headers,
+                        json={**game, "god_index": 0, "question": "Is Ja yes?"},
+                    )
+
+        commits = 0
+        began = time.perf_counter()
+        await asyncio.gather(*(player() for _ in range(players)))
+        elapsed = time.perf_counter() - began
+        with Session(engine) as db:
+            rows = db.exec(select(func.count()).select_from(GameSession)).one()
+        print(f"{label}:")
+        print(f"  /game/start latency: {summarize(start_latencies)}")
+        print(
+            f"  {games} games ({sum(plays)} played) in {elapsed:.2f}s: "
+            f"{commits} write transactions, {rows} GameSession rows"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=400)
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--abandoned", type=float, default=0.6)
+    args = parser.parse_args()
+
+    install_fake_llm(LLM_LATENCY)
+    os.environ["LAZY_GAME_START"] = "false"
+    await run_scenario("eager start", args.games, args.players, args.abandoned)
+    os.environ["LAZY_GAME_START"] = "true"
+    await run_scenario("lazy start", args.games, args.players, args.abandoned)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
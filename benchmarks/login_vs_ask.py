@@ -0,0 +1,77 @@
+"""
+Login throughput versus concurrent /game/ask latency.
+
+Runs a burst of /token logins while a player keeps asking questions, once with
+bcrypt inline on the event loop and once on the password worker pool.
+
+Usage: python -m benchmarks.login_vs_ask [--logins 40]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.services.password_service import password_hasher
+from benchmarks._common import bench_client, create_user, install_fake_llm, summarize
+
+LLM_LATENCY = 0.05
+
+
+async def _inline_run(func, *args):
+    return func(*args)
+
+
+async def run_scenario(logins: int) -> None:
+    async with bench_client() as (client, engine):
+        headers = create_user(engine, "player")
+        create_user(engine, "loginuser", "loginpass123")
+        ask_latencies: list[float] = []
+        burst_done = asyncio.Event()
+
+        async def player() -> None:
+            while not burst_done.is_set():
+                began = time.monotonic()
+                start = await client.post("/game/start", headers=headers)
+                session_id = start.json()["session_id"]
+                await client.post(
+                    "/game/ask",
+                    headers=headers,
+                    json={"session_id": session_id, "god_index": 0, "question": "Is Ja yes?"},
+                )
+                ask_latencies.append(time.monotonic() - began)
+
+        async def login() -> None:
+            await client.post("/token", data={"username": "loginuser", "password": "loginpass123"})
+
+        async def burst() -> float:
+            began = time.monotonic()
+            await asyncio.gather(*(login() for _ in range(logins)))
+            burst_done.set()
+            return time.monotonic() - began
+
+        elapsed, _ = await asyncio.gather(burst(), player())
+        print(f"  logins/s={logins / elapsed:.1f} total={elapsed:.2f}s")
+        print(f"  /game/start + /game/ask latency: {summarize(ask_latencies)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    args = parser.parse_args()
+
+    install_fake_llm(LLM_LATENCY)
+
+    pooled_run = password_hasher.run
+    print("bcrypt inline on the event loop:")
+    password_hasher.run = _inline_run  # type: ignore[method-assign]
+    await run_scenario(args.logins)
+
+    print(f"bcrypt on {password_hasher.kind} pool ({password_hasher.max_workers} workers):")
+    password_hasher.run = pooled_run  # type: ignore[method-assign]
+    await run_scenario(args.logins)
+    print(f"  pool stats: {password_hasher.stats()}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+Cost of the per-route metrics middleware.
+
+Plays games (start plus three questions against an instant fake LLM) one
+request at a time, so the database and framework work is all there is to
+measure. Rounds alternate METRICS_ENABLED off and on to cancel out drift,
+and the report gives the median over rounds of the mean time per request.
+
+Usage: python -m benchmarks.metrics_overhead [--games 200] [--rounds 9]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from app.core.metrics import route_metrics
+from benchmarks._common import bench_client, create_user, install_fake_llm
+
+
+async def play(client, headers: dict[str, str], games: int) -> float:
+    """Mean seconds per request over games games."""
+    requests = 0
+    began = time.perf_counter()
+    for _ in range(games):
+        start = await client.post("/game/start", headers=headers)
+        ask = {"session_id": start.json()["session_id"], "god_index": 0, "question": "Q?"}
+        for _ in range(3):
+            await client.post("/game/ask", headers=headers, json=ask)
+        requests += 4
+    return (time.perf_counter() - began) / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=9)
+    args = parser.parse_args()
+
+    install_fake_llm(0.0)
+    results: dict[str, list[float]] = {"false": [], "true": []}
+    async with bench_client() as (client, engine):
+        headers = create_user(engine, "player")
+        await play(client, headers, 20)  # warm up
+        for _ in range(args.rounds):
+            for enabled, samples in results.items():
+                os.environ["METRICS_ENABLED"] = enabled
+                samples.append(await play(client, headers, args.games))
+
+    off = statistics.median(results["false"])
+    on = statistics.median(results["true"])
+    print(f"metrics off: {off * 1e6:8.1f} us/request")
+    print(f"metrics on:  {on * 1e6:8.1f} us/request")
+    print(f"overhead:    {(on - off) * 1e6:8.1f} us/request ({(on - off) / off:+.1%})")
+    print(f"/metrics body: {len(route_metrics.render())} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Write amplification and read cost of move history: JSON blob versus GameMove rows.
+
+The JSON path is the old one: load the blob, append a move, dump and rewrite
+it. The row path inserts one GameMove per move. Bytes are the statement
+parameters sent to SQLite, so they count what each append actually writes.
+fsync is turned off so timings reflect the statements rather than the disk.
+
+Usage: python -m benchmarks.move_history [--sessions 200] [--moves 10]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, col, create_engine, select
+
+from app.models import GameMove, GameSession, User
+
+
+def _move(round_number: int) -> dict[str, object]:
+    return {
+        "round": round_number,
+        "god_index": round_number % 3,
+        "question": f"If I asked you whether god {round_number % 3} is Random, would you say Ja?",
+        "answer": "Ja",
+        "is_masked": False,
+    }
+
+
+def _append_json(db: Session, session: GameSession, round_number: int) -> None:
+    history = json.loads(session.move_history)
+    history.append(_move(round_number))
+    session.move_history = json.dumps(history)
+    db.add(session)
+    db.commit()
+
+
+def _append_row(db: Session, session: GameSession, round_number: int) -> None:
+    assert session.session_id is not None
+    db.add(GameMove(session_id=session.session_id, **_move(round_number)))
+    db.commit()
+
+
+def _read_json(db: Session, session_id: int) -> list[dict[str, object]]:
+    session = db.get(GameSession, session_id)
+    assert session is not None
+    return json.loads(session.move_history)
+
+
+def _read_rows(db: Session, session_id: int) -> list[dict[str, object]]:
+    statement = (
+        select(GameMove).where(GameMove.session_id == session_id).order_by(col(GameMove.round))
+    )
+    return [move.to_dict() for move in db.exec(statement).all()]
+
+
+def run(label: str, append, read, sessions: int, moves: int, tmp: str) -> None:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, label)}.db")
+    written = [0]
+
+    @event.listens_for(engine, "connect")
+    def no_fsync(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_bytes(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(("INSERT", "UPDATE")):
+            written[0] += sum(len(str(value)) for value in parameters)
+
+    SQLModel.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as db:
+        db.add(User(id="bench", hashed_password="x"))
+        games = [GameSession(user_id="bench") for _ in range(sessions)]
+        db.add_all(games)
+        db.commit()
+        written[0] = 0
+
+        began = time.perf_counter()
+        for round_number in range(1, moves + 1):
+            for game in games:
+                append(db, game, round_number)
+        write_time = time.perf_counter() - began
+
+        db.expunge_all()
+        began = time.perf_counter()
+        for game in games:
+            assert len(read(db, game.session_id)) == moves
+        read_time = time.perf_counter() - began
+
+    total_moves = sessions * moves
+    print(f"{label}:")
+    print(
+        f"  append: {written[0] / total_moves:.0f} bytes/move, "
+        f"{write_time / total_moves * 1e6:.0f} us/move"
+    )
+    print(f"  read history: {read_time / sessions * 1e6:.0f} us/game")
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--moves", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("json_blob", _append_json, _read_json, args.sessions, args.moves, tmp)
+        run("game_move_rows", _append_row, _read_rows, args.sessions, args.moves, tmp)
+
+
+if __name__ == "__main__":
+    main()
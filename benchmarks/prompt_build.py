@@ -0,0 +1,49 @@
+"""
+System prompt construction: built per request versus precomputed at startup.
+
+Usage: python -m benchmarks.prompt_build [--number 20000]
+"""
+
+import argparse
+import timeit
+from itertools import cycle, permutations
+
+from app.services.prompts import GOD_IDENTITIES, PromptConfig, PromptTemplates
+
+
+def _configs() -> list[PromptConfig]:
+    configs = []
+    for identities in permutations(GOD_IDENTITIES):
+        for god_index, god_identity in enumerate(identities):
+            if god_identity != "Random":
+                configs.append(
+                    PromptConfig(
+                        yes_word="Ja",
+                        no_word="Da",
+                        god_identity=god_identity,
+                        all_identities=list(identities),
+                        god_index=god_index,
+                    )
+                )
+    return configs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    configs = cycle(_configs())
+    built = timeit.timeit(lambda: PromptTemplates._build(next(configs)), number=args.number)
+    cached_count = PromptTemplates.precompute()
+    cached = timeit.timeit(lambda: PromptTemplates.build_prompt(next(configs)), number=args.number)
+
+    print(f"built per request: {built / args.number * 1e6:.2f} us/prompt")
+    print(f"precomputed ({cached_count} prompts): {cached / args.number * 1e6:.2f} us/prompt")
+    print(
+        f"shared static prefix: {len(PromptTemplates._build(next(configs)).split('YOUR WORDS')[0])} chars"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,51 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { useTranslation } from 'react-i18next';
-import { UserCheck, UserX, Loader2 } from 'lucide-react';
+import { UserCheck, UserX, Loader2, ArrowDown, ArrowUp } from 'lucide-react';
 import { adminApi } from '../../services/api';
-import type { AdminUser } from '../../types';
+import type { AdminUser, AdminUserSort } from '../../types';
+
+const PAGE_SIZE = 50;
 
 export function UserList() {
   const { t } = useTranslation();
   const [users, setUsers] = useState<AdminUser[]>([]);
   const [loading, setLoading] = useState(true);
+  const [sort, setSort] = useState<AdminUserSort>('id');
+  const [order, setOrder] = useState<'asc' | 'desc'>('asc');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
-  useEffect(() => {
-    const loadUsers = async () => {
+  const loadUsers = useCallback(
+    async (after?: string) => {
+      setLoading(true);
       try {
-        const data = await adminApi.getUsers();
-        setUsers(data);
+        const page = await adminApi.getUsers(PAGE_SIZE, sort, order, after);
+        setUsers((prev) => (after ? [...prev, ...page.items] : page.items));
+        setNextCursor(page.nextCursor);
       } finally {
         setLoading(false);
       }
-    };
-    loadUsers();
-  }, []);
+    },
+    [sort, order]
+  );
+
+  useEffect(() => {
+    void loadUsers();
+  }, [loadUsers]);
+
+  const sortBy = (column: AdminUserSort) => {
+    if (column === sort) {
+      setOrder((prev) => (prev === 'asc' ? 'desc' : 'asc'));
+    } else {
+      setSort(column);
+      setOrder(column === 'id' ? 'asc' : 'desc');
+    }
+  };
+
+  const sortIcon = (column: AdminUserSort) => {
+    if (column !== sort) return null;
+    const Icon = order === 'asc' ? ArrowUp : ArrowDown;
+    return <Icon className="w-3 h-3 ml-1 inline" />;
+  };
 
   const toggleUser = async (userId: string) => {
     try {
@@ -32,7 +58,7 @@ export function UserList() {
     }
   };
 
-  if (loading) {
+  if (loading && users.length === 0) {
     return (
       <div className="flex items-center justify-center h-32">
         <Loader2 className="w-6 h-6 text-indigo-400 animate-spin" />
@@ -45,17 +71,33 @@ export function UserList() {
       <table className="w-full">
         <thead className="bg-gray-700">
           <tr>
-            <th className="px-4 py-3 text-left text-sm font-medium text-gray-300">
+            <th
+              className="px-4 py-3 text-left text-sm font-medium text-gray-300 cursor-pointer select-none"
+              onClick={() => sortBy('id')}
+            >
               {t('admin.userId')}
+              {sortIcon('id')}
             </th>
-            <th className="px-4 py-3 text-left text-sm font-medium text-gray-300">
+            <th
+              className="px-4 py-3 text-left text-sm font-medium text-gray-300 cursor-pointer select-none"
+              onClick={() => sortBy('created_at')}
+            >
               {t('admin.createdAt')}
+              {sortIcon('created_at')}
             </th>
-            <th className="px-4 py-3 text-left text-sm font-medium text-gray-300">
+            <th
+              className="px-4 py-3 text-left text-sm font-medium text-gray-300 cursor-pointer select-none"
+              onClick={() => sortBy('total_games')}
+            >
               {t('admin.gamesPlayed')}
+              {sortIcon('total_games')}
             </th>
-            <th className="px-4 py-3 text-left text-sm font-medium text-gray-300">
+            <th
+              className="px-4 py-3 text-left text-sm font-medium text-gray-300 cursor-pointer select-none"
+              onClick={() => sortBy('win_rate')}
+            >
               {t('admin.winRate')}
+              {sortIcon('win_rate')}
             </th>
             <th className="px-4 py-3 text-left text-sm font-medium text-gray-300">
               {t('admin.status')}
@@ -112,6 +154,17 @@ export function UserList() {
           ))}
         </tbody>
       </table>
+      {nextCursor && (
+        <div className="text-center py-3">
+          <button
+            onClick={() => loadUsers(nextCursor)}
+            disabled={loading}
+            className="text-indigo-400 hover:text-indigo-300 disabled:opacity-50"
+          >
+            {loading ? t('common.loading') : t('game.loadMore')}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -5,11 +5,11 @@ import { gameApi } from '../../services/api';
 import { GodCard } from './GodCard';
 import { QuestionArea } from './QuestionArea';
 import { ResultModal } from './ResultModal';
-import type { MoveHistory, GameResult } from '../../types';
+import type { GameRef, MoveHistory, GameResult } from '../../types';
 
 export function GameBoard() {
   const { t } = useTranslation();
-  const [sessionId, setSessionId] = useState<number | null>(null);
+  const [game, setGame] = useState<GameRef | null>(null);
   const [selectedGod, setSelectedGod] = useState<number | null>(null);
   const [guesses, setGuesses] = useState<string[]>(['Unsure', 'Unsure', 'Unsure']);
   const [history, setHistory] = useState<MoveHistory[]>([]);
@@ -23,7 +23,7 @@ export function GameBoard() {
     setLoading(true);
     try {
       const session = await gameApi.startGame();
-      setSessionId(session.session_id);
+      setGame(session);
       setSelectedGod(null);
       setGuesses(['Unsure', 'Unsure', 'Unsure']);
       setHistory([]);
@@ -43,18 +43,18 @@ export function GameBoard() {
 
   const handleAsk = async (question: string, overrideGodIndex?: number) => {
     const targetGod = overrideGodIndex !== undefined ? overrideGodIndex : selectedGod;
-    if (sessionId === null || targetGod === null) return;
-    const response = await gameApi.askQuestion(sessionId, targetGod, question);
+    if (game === null || targetGod === null) return;
+    const response = await gameApi.askQuestionStream(game, targetGod, question);
     setHistory(response.history);
     setQuestionsLeft(response.questions_left);
   };
 
   const handleSubmit = async () => {
-    if (sessionId === null) return;
+    if (game === null) return;
     if (guesses.includes('Unsure')) {
       if (!window.confirm(t('game.confirmIncomplete'))) return;
     }
-    const gameResult = await gameApi.submitGuess(sessionId, guesses);
+    const gameResult = await gameApi.submitGuess(game, guesses);
     setResult(gameResult);
   };
 
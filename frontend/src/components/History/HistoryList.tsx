@@ -13,20 +13,20 @@ export function HistoryList({ onSelectGame }: HistoryListProps) {
   const [games, setGames] = useState<GameHistoryItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [hasMore, setHasMore] = useState(true);
-  const offsetRef = useRef(0);
+  const cursorRef = useRef<number | undefined>(undefined);
 
   const loadGames = useCallback(async (reset = false) => {
     setLoading(true);
     try {
-      const newOffset = reset ? 0 : offsetRef.current;
-      const data = await historyApi.getHistory(20, newOffset);
+      const before = reset ? undefined : cursorRef.current;
+      const page = await historyApi.getHistory(20, before);
       if (reset) {
-        setGames(data);
+        setGames(page.items);
       } else {
-        setGames((prev) => [...prev, ...data]);
+        setGames((prev) => [...prev, ...page.items]);
       }
-      setHasMore(data.length === 20);
-      offsetRef.current = newOffset + data.length;
+      setHasMore(page.nextCursor !== null);
+      cursorRef.current = page.nextCursor ?? undefined;
     } finally {
       setLoading(false);
     }
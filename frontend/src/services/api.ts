@@ -2,12 +2,17 @@ import axios from 'axios';
 import type {
   TokenResponse,
   User,
+  GameRef,
   GameSession,
   AskResponse,
+  AskStreamEvent,
   GameResult,
   GameHistoryItem,
+  HistoryPage,
   GameDetail,
   AdminUser,
+  AdminUserPage,
+  AdminUserSort,
   AdminStats,
 } from '../types';
 import { useAuthStore } from '../store/authStore';
@@ -44,6 +49,25 @@ api.interceptors.response.use(
   }
 );
 
+export class ApiStreamError extends Error {
+  response: { status: number; data: { detail?: string } };
+
+  constructor(status: number, detail?: string) {
+    super(detail || `Request failed with status ${status}`);
+    this.response = { status, data: { detail } };
+  }
+}
+
+const parseSseEvent = (chunk: string): AskStreamEvent | null => {
+  let event = '';
+  let data = '';
+  for (const line of chunk.split('\n')) {
+    if (line.startsWith('event: ')) event = line.slice('event: '.length);
+    else if (line.startsWith('data: ')) data += line.slice('data: '.length);
+  }
+  return event && data ? ({ event, data: JSON.parse(data) } as AskStreamEvent) : null;
+};
+
 export const authApi = {
   login: async (username: string, password: string): Promise<TokenResponse> => {
     const formData = new URLSearchParams();
@@ -83,18 +107,75 @@ export const gameApi = {
     return response.data;
   },
 
-  askQuestion: async (sessionId: number, godIndex: number, question: string): Promise<AskResponse> => {
+  askQuestion: async (game: GameRef, godIndex: number, question: string): Promise<AskResponse> => {
     const response = await api.post<AskResponse>('/game/ask', {
-      session_id: sessionId,
+      session_id: game.session_id,
+      game_token: game.game_token,
       god_index: godIndex,
       question,
     });
     return response.data;
   },
 
-  submitGuess: async (sessionId: number, guesses: string[]): Promise<GameResult> => {
+  askQuestionStream: async (
+    game: GameRef,
+    godIndex: number,
+    question: string,
+    onEvent?: (event: AskStreamEvent) => void
+  ): Promise<AskResponse> => {
+    const token = localStorage.getItem('token');
+    const response = await fetch(`${API_BASE}/game/ask/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify({
+        session_id: game.session_id,
+        game_token: game.game_token,
+        god_index: godIndex,
+        question,
+      }),
+    });
+    if (!response.ok || !response.body) {
+      if (response.status === 401) {
+        localStorage.removeItem('token');
+        window.location.href = '/';
+      }
+      const data = await response.json().catch(() => ({}));
+      throw new ApiStreamError(response.status, data?.detail);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const event = parseSseEvent(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+        if (!event) continue;
+        onEvent?.(event);
+        if (event.event === 'answer') {
+          await reader.cancel();
+          return event.data;
+        }
+        if (event.event === 'error') {
+          await reader.cancel();
+          throw new ApiStreamError(event.data.status_code, event.data.detail);
+        }
+      }
+    }
+    throw new ApiStreamError(502, 'Answer stream ended unexpectedly');
+  },
+
+  submitGuess: async (game: GameRef, guesses: string[]): Promise<GameResult> => {
     const response = await api.post<GameResult>('/game/submit', {
-      session_id: sessionId,
+      session_id: game.session_id,
+      game_token: game.game_token,
       guesses,
     });
     return response.data;
@@ -102,11 +183,12 @@ export const gameApi = {
 };
 
 export const historyApi = {
-  getHistory: async (limit = 20, offset = 0): Promise<GameHistoryItem[]> => {
+  getHistory: async (limit = 20, before?: number): Promise<HistoryPage> => {
     const response = await api.get<GameHistoryItem[]>('/history', {
-      params: { limit, offset },
+      params: { limit, before },
     });
-    return response.data;
+    const cursor = response.headers['x-next-cursor'];
+    return { items: response.data, nextCursor: cursor ? Number(cursor) : null };
   },
 
   getGameDetail: async (sessionId: number): Promise<GameDetail> => {
@@ -116,11 +198,16 @@ export const historyApi = {
 };
 
 export const adminApi = {
-  getUsers: async (limit = 50, offset = 0): Promise<AdminUser[]> => {
+  getUsers: async (
+    limit = 50,
+    sort: AdminUserSort = 'id',
+    order: 'asc' | 'desc' = 'asc',
+    after?: string
+  ): Promise<AdminUserPage> => {
     const response = await api.get<AdminUser[]>('/admin/users', {
-      params: { limit, offset },
+      params: { limit, sort, order, after },
     });
-    return response.data;
+    return { items: response.data, nextCursor: response.headers['x-next-cursor'] ?? null };
   },
 
   getStats: async (): Promise<AdminStats> => {
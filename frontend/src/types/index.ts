@@ -13,8 +13,14 @@ export interface TokenResponse {
   is_admin: boolean;
 }
 
-export interface GameSession {
-  session_id: number;
+// A game is named by its session id, or by a game token when the server
+// starts games lazily (the session id is then null until it is written)
+export interface GameRef {
+  session_id: number | null;
+  game_token?: string;
+}
+
+export interface GameSession extends GameRef {
   message: string;
 }
 
@@ -24,6 +30,12 @@ export interface AskResponse {
   history: MoveHistory[];
 }
 
+export type AskStreamEvent =
+  | { event: 'ack'; data: { session_id: number | null; god_index: number; question: string } }
+  | { event: 'progress'; data: { status: string; elapsed: number } }
+  | { event: 'answer'; data: AskResponse }
+  | { event: 'error'; data: { status_code: number; detail: string } };
+
 export interface MoveHistory {
   round: number;
   god_index: number;
@@ -46,6 +58,11 @@ export interface GameHistoryItem {
   questions_asked: number;
 }
 
+export interface HistoryPage {
+  items: GameHistoryItem[];
+  nextCursor: number | null;
+}
+
 export interface GameDetail {
   id: number;
   date: string;
@@ -67,6 +84,13 @@ export interface AdminUser {
   win_rate: number;
 }
 
+export type AdminUserSort = 'id' | 'created_at' | 'total_games' | 'wins' | 'win_rate';
+
+export interface AdminUserPage {
+  items: AdminUser[];
+  nextCursor: string | null;
+}
+
 export interface AdminStats {
   total_users: number;
   total_games: number;
@@ -2,36 +2,205 @@
 Pytest configuration and fixtures for Three Gods Riddle tests.
 """
 
+import importlib.util
+import os
+import shutil
+import socket
+import subprocess
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Optional
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
+from app.core.database import (
+    SyncSessionAdapter,
+    async_url,
+    create_async_db_engine,
+    create_db_engine,
+)
 from app.main import app, get_db
+from app.migrations import run_migrations
 from app.models import User
+from app.services.auth_cache import auth_cache
+from app.services.llm_service import LLMService
+
+
+@pytest.fixture(scope="session")
+def postgres_server(tmp_path_factory):
+    """
+    Base URL of a throwaway PostgreSQL cluster made with initdb and pg_ctl.
+
+    Set PG_BIN to their directory if they are not on PATH. Tests using it are
+    skipped when PostgreSQL or psycopg2 is not available.
+    """
+    pytest.importorskip("psycopg2")
+    bin_dir = os.getenv("PG_BIN")
+    initdb = shutil.which("initdb", path=bin_dir)
+    pg_ctl = shutil.which("pg_ctl", path=bin_dir)
+    if not (initdb and pg_ctl):
+        pytest.skip("PostgreSQL initdb/pg_ctl not found (set PG_BIN)")
+
+    root = tmp_path_factory.mktemp("postgres")
+    data = root / "data"
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    options = f"-p {port} -k {root} -c listen_addresses=127.0.0.1 -F"
+    try:
+        subprocess.run(
+            [initdb, "-D", str(data), "-U", "postgres", "-A", "trust", "--no-sync"],
+            check=True,
+            capture_output=True,
+        )
+        subprocess.run(
+            [pg_ctl, "-D", str(data), "-l", str(root / "server.log"), "-o", options, "-w", "start"],
+            check=True,
+            capture_output=True,
+        )
+    except subprocess.CalledProcessError as e:
+        pytest.skip(f"Could not start PostgreSQL: {e.stderr.decode().strip()}")
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}"
+    finally:
+        subprocess.run(
+            [pg_ctl, "-D", str(data), "-m", "immediate", "-w", "stop"], capture_output=True
+        )
+
+
+@contextmanager
+def postgres_database(server_url: str):
+    """A migrated database of its own on the test cluster, dropped afterwards."""
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(f"{server_url}/postgres", isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f'CREATE DATABASE "{name}"'))
+    engine = create_db_engine(f"{server_url}/{name}")
+    run_migrations(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.connect() as connection:
+            connection.execute(text(f'DROP DATABASE "{name}"'))
+        admin.dispose()
+
+
+POSTGRES_AVAILABLE = bool(
+    shutil.which("initdb", path=os.getenv("PG_BIN")) and importlib.util.find_spec("psycopg2")
+)
+
+
+@pytest.fixture(params=["sync", "async"] + (["postgres"] if POSTGRES_AVAILABLE else []))
+def db_mode(request):
+    """
+    Run API tests against the adapted sync session, the async one, and
+    PostgreSQL when it is installed locally.
+
+    For the postgres mode, install psycopg2 and asyncpg and put initdb and
+    pg_ctl on PATH or in PG_BIN; PostgreSQL refuses to run as root.
+    """
+    return request.param
 
 
 @pytest.fixture(name="session")
-def session_fixture():
-    """Create a fresh database session for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def session_fixture(request, tmp_path):
+    """
+    Create a fresh database session for each test.
+
+    In-memory by default; API tests in async mode share a SQLite file with
+    the app's async engine instead, and postgres mode gets its own database.
+    """
+    mode = request.getfixturevalue("db_mode") if "db_mode" in request.fixturenames else "sync"
+    if mode == "postgres":
+        with postgres_database(request.getfixturevalue("postgres_server")) as engine:
+            with Session(engine, expire_on_commit=False) as session:
+                yield session
+        return
+    if mode == "async":
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    else:
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
     SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
+    # Like the app's get_db, so objects stay loaded across commits.
+    with Session(engine, expire_on_commit=False) as session:
         yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def app_sessions():
+    """Sessions handed to request handlers, in order."""
+    return []
+
+
+@pytest.fixture
+def app_engine(session: Session, db_mode: str):
+    """The engine request handlers run on: the test session's, or an async one on its database."""
+    url = session.get_bind().url.render_as_string(hide_password=False)
+    if db_mode == "sync" or async_url(url) is None:
+        return session.get_bind()
+    # Each TestClient request runs on its own event loop, so never pool.
+    return create_async_db_engine(url, poolclass=NullPool)
+
+
+class QueryCounter:
+    """Records the SQL statements run on an engine."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    @contextmanager
+    def exactly(self, count: int):
+        """Assert the block runs exactly count statements, so a new round trip fails the test."""
+        self.statements.clear()
+        yield
+        assert len(self.statements) == count, "\n".join(
+            [f"expected {count} statements, ran {len(self.statements)}:", *self.statements]
+        )
+
+
+@pytest.fixture
+def queries(app_engine):
+    """Counts the queries request handlers run, e.g. `with queries.exactly(3): client.post(...)`."""
+    counter = QueryCounter()
+    engine = app_engine.sync_engine if isinstance(app_engine, AsyncEngine) else app_engine
+    event.listen(engine, "before_cursor_execute", counter.record)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter.record)
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(session: Session, app_engine, app_sessions: list):
     """Create a test client with database session override."""
+    async_engine = app_engine if isinstance(app_engine, AsyncEngine) else None
 
-    def get_session_override():
-        return session
+    async def get_session_override():
+        if async_engine is None:
+            app_sessions.append(SyncSessionAdapter(session))
+            yield app_sessions[-1]
+            return
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            app_sessions.append(db)
+            yield db
 
     app.dependency_overrides[get_db] = get_session_override
+    auth_cache.clear()
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -76,8 +245,29 @@ def admin_user(session: Session):
 @pytest.fixture
 def auth_headers(client: TestClient, test_user: User):
     """Get authentication headers for test user."""
-    response = client.post(
-        "/token", data={"username": "testuser", "password": "testpass123"}
-    )
+    response = client.post("/token", data={"username": "testuser", "password": "testpass123"})
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Install a fake OpenAI client whose chat completions call create(**kwargs).
+
+    fake_llm(create) returns a fresh LLMService without an answer cache;
+    fake_llm(create, service) patches an existing one, such as llm_service.
+    """
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    def install(create, service: Optional[LLMService] = None) -> LLMService:
+        if service is None:
+            service = LLMService()
+            service.answer_cache = None
+        completions = SimpleNamespace(create=create)
+        monkeypatch.setattr(
+            service, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        )
+        return service
+
+    return install
@@ -0,0 +1,163 @@
+"""
+Integration tests for admin API endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models import User, UserStats
+
+
+@pytest.fixture
+def admin_headers(client: TestClient, admin_user: User) -> dict:
+    response = client.post("/token", data={"username": "admin", "password": "adminpass123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def players(session: Session):
+    """Users with (games, completed, wins) counters; 'idle' has no stats row."""
+    counters = {
+        "ann": (10, 10, 5),
+        "bob": (4, 3, 3),
+        "cat": (6, 4, 1),
+        "dan": (3, 3, 1),
+        "eve": (8, 8, 4),
+    }
+    for user_id, (games, completed, wins) in counters.items():
+        session.add(User(id=user_id, hashed_password="x"))
+        session.add(UserStats(user_id=user_id, games=games, completed_games=completed, wins=wins))
+    session.add(User(id="idle", hashed_password="x"))
+    session.commit()
+
+
+def fetch_all(client: TestClient, headers: dict, params: str) -> list[dict]:
+    users, cursor = [], None
+    while True:
+        url = f"/admin/users?limit=2&{params}" + (f"&after={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        users += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return users
+
+
+@pytest.mark.integration
+class TestAdminStats:
+    """Test the /admin/stats dashboard."""
+
+    def test_counts_only_played_games(
+        self, client: TestClient, auth_headers: dict, admin_headers: dict, monkeypatch
+    ):
+        """Test that the dashboard counts only games with answered questions."""
+        monkeypatch.setattr("app.main.llm_service.get_simulated_delay", lambda: 0.01)
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        client.post("/game/start", headers=auth_headers)
+        client.post(
+            "/game/ask",
+            headers=auth_headers,
+            json={"session_id": session_id, "god_index": 0, "question": "Is Ja yes?"},
+        )
+        client.post(
+            "/game/submit",
+            headers=auth_headers,
+            json={"session_id": session_id, "guesses": ["Nobody"] * 3},
+        )
+
+        response = client.get("/admin/stats", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "total_users": 2,
+            "total_games": 1,
+            "completed_games": 1,
+            "total_wins": 0,
+            "overall_win_rate": 0,
+        }
+
+
+@pytest.mark.integration
+class TestAdminUsers:
+    """Test the joined, sorted and keyset-paged /admin/users listing."""
+
+    def test_sorted_by_win_rate(self, client: TestClient, admin_headers: dict, players):
+        """Test paging through users by win rate, ties broken by id in the same order."""
+        users = fetch_all(client, admin_headers, "sort=win_rate&order=desc")
+
+        assert [u["id"] for u in users] == ["bob", "eve", "ann", "dan", "cat", "idle", "admin"]
+        bob = users[0]
+        assert (bob["total_games"], bob["wins"], bob["win_rate"]) == (4, 3, 100)
+        assert users[-1]["total_games"] == 0
+
+    def test_sorted_by_games_ascending(self, client: TestClient, admin_headers: dict, players):
+        """Test ascending sort on a counter column."""
+        users = fetch_all(client, admin_headers, "sort=total_games")
+        assert [u["id"] for u in users] == ["admin", "idle", "dan", "bob", "cat", "eve", "ann"]
+
+    def test_single_query_per_page(
+        self, client: TestClient, admin_headers: dict, players, app_engine
+    ):
+        """Test that a page is one SELECT regardless of how many users it holds."""
+        statements = []
+        bind = getattr(app_engine, "sync_engine", app_engine)
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "JOIN userstats" in statement:
+                statements.append(statement)
+
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            response = client.get("/admin/users?limit=50", headers=admin_headers)
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+        assert len(response.json()) == 7
+        assert len(statements) == 1
+
+    def test_invalid_cursor(self, client: TestClient, admin_headers: dict):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/admin/users?after=not-a-cursor", headers=admin_headers)
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestAuthState:
+    """Test that cached and token-carried auth state follows admin changes."""
+
+    def test_disable_applies_to_cached_user(
+        self, client: TestClient, auth_headers: dict, admin_headers: dict
+    ):
+        """Test that disabling a user takes effect while their state is cached."""
+        assert client.get("/history", headers=auth_headers).status_code == 200
+
+        response = client.patch("/admin/users/testuser/disable", headers=admin_headers)
+        assert response.json()["is_disabled"] is True
+
+        assert client.get("/history", headers=auth_headers).status_code == 403
+
+    def test_claims_skip_user_lookup(
+        self, client: TestClient, test_user: User, admin_headers: dict, app_engine, monkeypatch
+    ):
+        """Test that signed claims authenticate without loading the user."""
+        monkeypatch.setenv("AUTH_TOKEN_CLAIMS", "true")
+        response = client.post("/token", data={"username": "testuser", "password": "testpass123"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        user_queries = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if 'FROM "user"' in statement or "FROM user" in statement:
+                user_queries.append(statement)
+
+        bind = getattr(app_engine, "sync_engine", app_engine)
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            assert client.get("/history", headers=headers).status_code == 200
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+        assert user_queries == []
+
+        client.patch("/admin/users/testuser/disable", headers=admin_headers)
+        assert client.get("/history", headers=headers).status_code == 403
@@ -2,8 +2,16 @@
 Integration tests for game API endpoints.
 """
 
+import json
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import GameMove, GameSession
+from app.services.game_state import GameState
+from app.services.reaper import archive_games
 
 
 @pytest.mark.integration
@@ -45,6 +53,320 @@ class TestGameEndpoints:
         assert "questions_left" in data
         assert data["questions_left"] == 2
 
+    def test_queries_per_request(self, client: TestClient, auth_headers: dict, queries):
+        """Test that starting and playing a game runs no extra round trips."""
+        client.post("/game/start", headers=auth_headers)  # warms the auth cache
+
+        with queries.exactly(1):  # INSERT gamesession
+            session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        ask = {"session_id": session_id, "god_index": 0, "question": "Q?"}
+        # SELECT gamesession, SELECT moves, upsert userstats, INSERT move, UPDATE count
+        with queries.exactly(5):
+            assert client.post("/game/ask", headers=auth_headers, json=ask).status_code == 200
+        with queries.exactly(4):  # the userstats upsert only comes with the first question
+            response = client.post("/game/ask", headers=auth_headers, json=ask)
+        assert response.json()["questions_left"] == 1
+        assert [move["round"] for move in response.json()["history"]] == [1, 2]
+
+    def test_random_god_waits_without_db_session(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        session: Session,
+        app_sessions: list,
+        monkeypatch,
+    ):
+        """Test that the Random god delay runs after the DB session is released."""
+        start_response = client.post("/game/start", headers=auth_headers)
+        session_id = start_response.json()["session_id"]
+        identities = GameState.from_session(session.get(GameSession, session_id)).identities
+
+        waits = []
+
+        async def fake_sleep(delay: float):
+            waits.append((delay, app_sessions[-1].in_transaction()))
+
+        monkeypatch.setattr("app.main.asyncio.sleep", fake_sleep)
+        response = client.post(
+            "/game/ask",
+            headers=auth_headers,
+            json={
+                "session_id": session_id,
+                "god_index": identities.index("Random"),
+                "question": "Is Ja yes?",
+            },
+        )
+
+        assert response.status_code == 200
+        assert len(waits) == 1
+        delay, in_transaction = waits[0]
+        assert delay > 0
+        assert in_transaction is False
+
+    def test_history_reads_moves(
+        self, client: TestClient, auth_headers: dict, session: Session, monkeypatch
+    ):
+        """Test that asked questions are stored as moves and shown in history."""
+
+        async def no_sleep(delay: float):
+            pass
+
+        monkeypatch.setattr("app.main.asyncio.sleep", no_sleep)
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        for god_index, question in enumerate(["Q1?", "Q2?", "Q3?"]):
+            response = client.post(
+                "/game/ask",
+                headers=auth_headers,
+                json={"session_id": session_id, "god_index": god_index, "question": question},
+            )
+            assert response.status_code == 200
+        assert len(response.json()["history"]) == 3
+        client.post(
+            "/game/submit",
+            headers=auth_headers,
+            json={"session_id": session_id, "guesses": ["True", "False", "Random"]},
+        )
+
+        history = client.get("/history", headers=auth_headers).json()
+        assert [game["id"] for game in history] == [session_id]
+        detail = client.get(f"/history/{session_id}", headers=auth_headers).json()
+        assert [move["question"] for move in detail["move_history"]] == ["Q1?", "Q2?", "Q3?"]
+        assert [move["round"] for move in detail["move_history"]] == [1, 2, 3]
+        assert session.get(GameSession, session_id).move_history == "[]"
+
+    def test_ask_with_group_commit(
+        self, client: TestClient, auth_headers: dict, session: Session, monkeypatch
+    ):
+        """Test that group-committed moves count questions the same way."""
+
+        async def no_sleep(delay: float):
+            pass
+
+        monkeypatch.setattr("app.main.asyncio.sleep", no_sleep)
+        monkeypatch.setenv("MOVE_GROUP_COMMIT", "true")
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        ask = {"session_id": session_id, "god_index": 1, "question": "Q?"}
+        for questions_left in (2, 1, 0):
+            response = client.post("/game/ask", headers=auth_headers, json=ask)
+            assert response.json()["questions_left"] == questions_left
+        assert client.post("/game/ask", headers=auth_headers, json=ask).status_code == 400
+
+        session.expire_all()
+        assert session.get(GameSession, session_id).current_question_count == 3
+        moves = session.exec(select(GameMove).where(GameMove.session_id == session_id)).all()
+        assert [move.round for move in moves] == [1, 2, 3]
+
+    def test_history_pages_by_cursor(
+        self, client: TestClient, auth_headers: dict, session: Session, test_user
+    ):
+        """Test that unplayed games are skipped in SQL and pages follow the cursor."""
+        played = []
+        for number in range(7):
+            game = GameSession(user_id=test_user.id)
+            session.add(game)
+            session.commit()
+            if number % 2 == 0:
+                session.add(
+                    GameMove(
+                        session_id=game.session_id, round=1, god_index=0, question="Q?", answer="Ja"
+                    )
+                )
+                session.commit()
+                played.append(game.session_id)
+
+        first = client.get("/history?limit=2", headers=auth_headers)
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/history?limit=2&before={cursor}", headers=auth_headers)
+
+        assert [game["id"] for game in first.json()] == played[::-1][:2]
+        assert [game["id"] for game in second.json()] == played[::-1][2:]
+        assert "X-Next-Cursor" in second.headers
+        last = client.get(
+            f"/history?limit=2&before={second.headers['X-Next-Cursor']}", headers=auth_headers
+        )
+        assert last.json() == []
+        assert "X-Next-Cursor" not in last.headers
+
+    def test_history_includes_archived_games(
+        self, client: TestClient, auth_headers: dict, session: Session, test_user
+    ):
+        """Test that archived games still page in id order and open in detail."""
+        played = []
+        for number in range(5):
+            game = GameSession(
+                user_id=test_user.id,
+                current_question_count=1,
+                is_completed=True,
+                created_at=datetime(2020, 1, 1) if number % 2 else datetime.utcnow(),
+            )
+            session.add(game)
+            session.commit()
+            session.add(
+                GameMove(
+                    session_id=game.session_id, round=1, god_index=0, question="Q?", answer="Ja"
+                )
+            )
+            session.commit()
+            played.append(game.session_id)
+
+        assert archive_games(session, datetime(2021, 1, 1)) == (2, 2)
+
+        first = client.get("/history?limit=3", headers=auth_headers)
+        second = client.get(
+            f"/history?limit=3&before={first.headers['X-Next-Cursor']}", headers=auth_headers
+        )
+        assert [game["id"] for game in first.json() + second.json()] == played[::-1]
+        detail = client.get(f"/history/{played[1]}", headers=auth_headers).json()
+        assert [move["question"] for move in detail["move_history"]] == ["Q?"]
+
+
+def parse_sse(lines) -> list[tuple[str, dict]]:
+    """Parse Server-Sent Events lines into (event, data) pairs."""
+    events, event = [], None
+    for line in lines:
+        if line.startswith("event: "):
+            event = line[len("event: ") :]
+        elif line.startswith("data: "):
+            events.append((event, json.loads(line[len("data: ") :])))
+    return events
+
+
+@pytest.mark.integration
+class TestStreamingAsk:
+    """Test the SSE and WebSocket variants of /game/ask."""
+
+    @pytest.fixture(autouse=True)
+    def short_random_delay(self, monkeypatch):
+        monkeypatch.setattr("app.main.llm_service.get_simulated_delay", lambda: 0.01)
+
+    def test_sse_stream(self, client: TestClient, auth_headers: dict):
+        """Test that the SSE endpoint acknowledges, reports progress and answers."""
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+
+        with client.stream(
+            "POST",
+            "/game/ask/stream",
+            headers=auth_headers,
+            json={"session_id": session_id, "god_index": 1, "question": "Is Ja yes?"},
+        ) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse_sse(response.iter_lines())
+
+        names = [event for event, _ in events]
+        assert names[0] == "ack"
+        assert names[1] == "progress"
+        assert names[-1] == "answer"
+        answer = events[-1][1]
+        assert answer["questions_left"] == 2
+        assert len(answer["history"]) == 1
+
+    def test_sse_rejects_foreign_session(self, client: TestClient, auth_headers: dict):
+        """Test that session checks happen before the stream starts."""
+        response = client.post(
+            "/game/ask/stream",
+            headers=auth_headers,
+            json={"session_id": 9999, "god_index": 0, "question": "Is Ja yes?"},
+        )
+        assert response.status_code == 404
+
+    def test_websocket_ask(self, client: TestClient, auth_headers: dict):
+        """Test asking questions over a WebSocket connection."""
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        token = auth_headers["Authorization"].split(" ", 1)[1]
+
+        with client.websocket_connect(f"/game/ws?token={token}") as websocket:
+            websocket.send_json({"session_id": session_id, "god_index": 2, "question": "Q1?"})
+            messages = [websocket.receive_json()]
+            while messages[-1]["event"] not in ("answer", "error"):
+                messages.append(websocket.receive_json())
+
+            assert messages[0]["event"] == "ack"
+            assert messages[-1]["event"] == "answer"
+            assert messages[-1]["data"]["questions_left"] == 2
+
+            websocket.send_json({"session_id": session_id})
+            error = websocket.receive_json()
+            assert error["event"] == "error"
+            assert error["data"]["status_code"] == 422
+
+    def test_websocket_reloads_game_between_messages(self, client: TestClient, auth_headers: dict):
+        """Test that a WebSocket ask sees moves and guesses made over HTTP meanwhile."""
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        token = auth_headers["Authorization"].split(" ", 1)[1]
+        ask = {"session_id": session_id, "god_index": 0, "question": "Q?"}
+
+        def ask_over(websocket) -> dict:
+            websocket.send_json(ask)
+            message = websocket.receive_json()
+            while message["event"] not in ("answer", "error"):
+                message = websocket.receive_json()
+            return message
+
+        with client.websocket_connect(f"/game/ws?token={token}") as websocket:
+            assert ask_over(websocket)["data"]["questions_left"] == 2
+            for _ in range(2):
+                assert client.post("/game/ask", headers=auth_headers, json=ask).status_code == 200
+            client.post(
+                "/game/submit",
+                headers=auth_headers,
+                json={"session_id": session_id, "guesses": ["True", "False", "Random"]},
+            )
+            error = ask_over(websocket)
+
+        assert error["data"] == {"status_code": 400, "detail": "Game already completed"}
+        detail = client.get(f"/history/{session_id}", headers=auth_headers).json()
+        assert [move["round"] for move in detail["move_history"]] == [1, 2, 3]
+
+    def test_websocket_requires_token(self, client: TestClient):
+        """Test that unauthenticated WebSocket connections are refused."""
+        from starlette.websockets import WebSocketDisconnect
+
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/game/ws?token=invalid") as websocket:
+                websocket.receive_json()
+
+
+@pytest.mark.integration
+class TestLazyStart:
+    """Test games started with a stateless game token."""
+
+    def test_row_is_written_with_the_first_question(
+        self, client: TestClient, auth_headers: dict, session: Session, monkeypatch
+    ):
+        """Test that /game/start writes nothing and the token then names one game."""
+        monkeypatch.setenv("LAZY_GAME_START", "true")
+        start = client.post("/game/start", headers=auth_headers).json()
+        assert start["session_id"] is None
+        assert session.exec(select(GameSession)).all() == []
+
+        ask = {"game_token": start["game_token"], "god_index": 0, "question": "Q?"}
+        for questions_left in (2, 1):
+            response = client.post("/game/ask", headers=auth_headers, json=ask)
+            assert response.json()["questions_left"] == questions_left
+        games = session.exec(select(GameSession)).all()
+        assert len(games) == 1 and games[0].current_question_count == 2
+
+        identities = GameState.from_session(games[0]).identities
+        guess = {"game_token": start["game_token"], "guesses": identities}
+        assert client.post("/game/submit", headers=auth_headers, json=guess).json()["win"] is True
+        replay = client.post("/game/ask", headers=auth_headers, json=ask)
+        assert replay.status_code == 400
+
+    def test_tokens_are_checked(self, client: TestClient, auth_headers: dict, monkeypatch):
+        """Test that a tampered token is rejected and a game token does not authenticate."""
+        monkeypatch.setenv("LAZY_GAME_START", "true")
+        token = client.post("/game/start", headers=auth_headers).json()["game_token"]
+
+        ask = {"game_token": token[:-2] + "xx", "god_index": 0, "question": "Q?"}
+        assert client.post("/game/ask", headers=auth_headers, json=ask).status_code == 400
+        missing = client.post(
+            "/game/ask", headers=auth_headers, json={"god_index": 0, "question": "Q?"}
+        )
+        assert missing.status_code == 422
+        as_bearer = client.post("/game/start", headers={"Authorization": f"Bearer {token}"})
+        assert as_bearer.status_code == 401
+
 
 @pytest.mark.integration
 class TestHealthEndpoints:
@@ -67,3 +389,29 @@ class TestHealthEndpoints:
         assert "status" in data
         assert "checks" in data
         assert "database" in data["checks"]
+
+    def test_metrics(self, client: TestClient, auth_headers: dict, monkeypatch):
+        """Test that /metrics reports per-route counts and costs in Prometheus format."""
+        from app.core.metrics import route_metrics
+
+        monkeypatch.setattr("app.main.llm_service.get_simulated_delay", lambda: 0.01)
+        route_metrics.clear()
+        session_id = client.post("/game/start", headers=auth_headers).json()["session_id"]
+        for god_index in range(3):
+            ask = {"session_id": session_id, "god_index": god_index, "question": "Q?"}
+            client.post("/game/ask", headers=auth_headers, json=ask)
+        client.get(f"/history/{session_id}", headers=auth_headers)
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        samples = dict(line.rsplit(" ", 1) for line in response.text.splitlines() if line[0] != "#")
+        ask = 'method="POST",route="/game/ask"'
+        assert samples[f'http_requests_total{{{ask},status="200"}}'] == "3"
+        assert samples[f"http_request_duration_seconds_count{{{ask}}}"] == "3"
+        # No request in this test runs 16 queries or more
+        assert samples[f'http_request_db_queries_bucket{{{ask},le="16"}}'] == "3"
+        assert float(samples[f"http_request_db_queries_sum{{{ask}}}"]) >= 3 * 4
+        assert float(samples[f"http_request_db_seconds_total{{{ask}}}"]) > 0
+        assert float(samples[f"http_request_random_delay_seconds_total{{{ask}}}"]) >= 0.01
+        assert 'route="/history/{session_id}"' in response.text
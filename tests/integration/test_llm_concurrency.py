@@ -0,0 +1,92 @@
+"""
+Load tests for the async LLM path of /game/ask.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.database import SyncSessionAdapter
+from app.main import app, create_access_token, get_db, hash_password
+from app.models import User
+from app.services.llm_service import llm_service
+
+LLM_LATENCY = 0.5
+CONCURRENT_ASKS = 10
+
+
+class SlowCompletions:
+    """Fake async completions API that answers after a fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        message = SimpleNamespace(content="\\boxed{Ja}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """File-backed engine so each request gets its own session and connection."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'load.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id="loaduser", hashed_password=hash_password("loadpass123")))
+        db.commit()
+
+    async def get_session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield SyncSessionAdapter(session)
+
+    app.dependency_overrides[get_db] = get_session_override
+    yield engine
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def slow_llm(fake_llm, monkeypatch):
+    completions = SlowCompletions(LLM_LATENCY)
+    fake_llm(completions.create, llm_service)
+    # Keep the Random god in line with the fake LLM latency.
+    monkeypatch.setattr(llm_service, "get_simulated_delay", lambda: LLM_LATENCY)
+    return completions
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_concurrent_asks_do_not_serialize(file_engine, slow_llm):
+    """N concurrent asks should finish in about one LLM round trip, not N."""
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'loaduser'})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        session_ids = []
+        for _ in range(CONCURRENT_ASKS):
+            response = await client.post("/game/start", headers=headers)
+            session_ids.append(response.json()["session_id"])
+
+        async def ask(session_id: int) -> httpx.Response:
+            return await client.post(
+                "/game/ask",
+                headers=headers,
+                json={"session_id": session_id, "god_index": 0, "question": "Is Ja yes?"},
+            )
+
+        started = time.monotonic()
+        responses = await asyncio.gather(*(ask(session_id) for session_id in session_ids))
+        elapsed = time.monotonic() - started
+
+    assert all(response.status_code == 200 for response in responses)
+    assert elapsed < LLM_LATENCY * 3, (
+        f"{CONCURRENT_ASKS} concurrent asks took {elapsed:.2f}s; "
+        f"serialized execution would take ~{LLM_LATENCY * CONCURRENT_ASKS:.1f}s"
+    )
@@ -0,0 +1,157 @@
+"""
+Unit tests for the LLM answer cache.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.answer_cache import (
+    AnswerCache,
+    AnswerKey,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    normalize_question,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_key(question: str = "Is Ja yes?", yes_word: str = "Ja") -> AnswerKey:
+    no_word = "Da" if yes_word == "Ja" else "Ja"
+    return AnswerKey.build(
+        "gpt-test", "True", ["True", "False", "Random"], 0, yes_word, no_word, question
+    )
+
+
+class TestAnswerKey:
+    """Test cache key construction."""
+
+    def test_normalize_question(self):
+        """Test that whitespace, case and trailing punctuation are ignored."""
+        assert normalize_question("  Is  Ja\tYES?? ") == "is ja yes"
+
+    def test_equivalent_questions_share_digest(self):
+        """Test that rephrasings differing only in formatting hit the same key."""
+        assert make_key("Is Ja yes?").digest() == make_key("is ja   yes").digest()
+
+    def test_language_map_changes_digest(self):
+        """Test that a different Yes/No mapping produces a different key."""
+        assert make_key(yes_word="Ja").digest() != make_key(yes_word="Da").digest()
+
+
+class TestMemoryCacheBackend:
+    """Test in-process LRU/TTL eviction."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", "Ja")
+        backend.set("b", "Da")
+        backend.get("a")
+        backend.set("c", "Ja")
+        assert backend.get("b") is None
+        assert backend.get("a") == "Ja"
+        assert backend.evictions == 1
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        clock = FakeClock()
+        backend = MemoryCacheBackend(max_entries=10, ttl_seconds=60, clock=clock)
+        backend.set("a", "Ja")
+        clock.now += 59
+        assert backend.get("a") == "Ja"
+        clock.now += 2
+        assert backend.get("a") is None
+
+
+class TestSQLiteCacheBackend:
+    """Test the persistent SQLite backend."""
+
+    def test_survives_restart(self, tmp_path):
+        """Test that entries written by one instance are read by the next."""
+        path = str(tmp_path / "cache.db")
+        first = SQLiteCacheBackend(path, max_entries=10)
+        first.set("a", "Da")
+        first.close()
+
+        second = SQLiteCacheBackend(path, max_entries=10)
+        assert second.get("a") == "Da"
+        second.close()
+
+    def test_lru_eviction_and_ttl(self, tmp_path):
+        """Test size-bounded LRU eviction and TTL expiry."""
+        clock = FakeClock()
+        backend = SQLiteCacheBackend(
+            str(tmp_path / "cache.db"), max_entries=2, ttl_seconds=60, clock=clock
+        )
+        backend.set("a", "Ja")
+        clock.now += 1
+        backend.set("b", "Da")
+        clock.now += 1
+        backend.get("a")
+        clock.now += 1
+        backend.set("c", "Ja")
+        assert len(backend) == 2
+        assert backend.get("b") is None
+        clock.now += 120
+        assert backend.get("a") is None
+        backend.close()
+
+
+@pytest.fixture
+def cached_service(fake_llm):
+    """LLMService with a fresh memory cache and a fake client answering Da."""
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="\\boxed{Da}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    service = fake_llm(create)
+    service.answer_cache = AnswerCache(MemoryCacheBackend(max_entries=10))
+    return service, calls
+
+
+class TestLLMServiceCaching:
+    """Test that cache hits skip the LLM entirely."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_network(self, cached_service):
+        """Test that a repeated question is answered without a second LLM call."""
+        service, calls = cached_service
+        language_map = {"Yes": "Ja", "No": "Da"}
+        identities = ["True", "False", "Random"]
+
+        first = await service.ask_god("True", language_map, "Is Da yes?", identities, 0)
+        second = await service.ask_god("True", language_map, "is da yes", identities, 0)
+
+        assert first.text == second.text == "Da"
+        assert (first.cached, second.cached) == (False, True)
+        assert len(calls) == 1
+        assert service.answer_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_swapped_language_maps_share_answers(self, cached_service):
+        """Test that mirrored questions under swapped maps reuse one LLM answer."""
+        service, calls = cached_service
+        identities = ["True", "False", "Random"]
+
+        canonical = await service.ask_god(
+            "True", {"Yes": "Ja", "No": "Da"}, "Does Ja mean yes?", identities, 0
+        )
+        mirrored = await service.ask_god(
+            "True", {"Yes": "Da", "No": "Ja"}, "Does Da mean yes?", identities, 0
+        )
+
+        assert canonical.text == "Da"
+        assert mirrored.text == "Ja"
+        assert len(calls) == 1
+        assert calls[0]["messages"][1]["content"] == "Does Ja mean yes?"
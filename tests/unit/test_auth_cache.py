@@ -0,0 +1,54 @@
+"""
+Unit tests for the auth state cache.
+"""
+
+from app.services.auth_cache import AuthPrincipal, AuthStateCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_and_evict():
+    """Test TTL expiry and the LRU bound."""
+    clock = FakeClock()
+    cache = AuthStateCache(max_entries=2, ttl_seconds=30, clock=clock)
+    for user_id in ("ann", "bob", "cat"):
+        cache.set(AuthPrincipal(id=user_id))
+
+    assert cache.get("ann") is None
+    assert cache.get("bob") == AuthPrincipal(id="bob")
+    clock.now += 31
+    assert cache.get("cat") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_zero_ttl_disables_caching():
+    cache = AuthStateCache(max_entries=10, ttl_seconds=0)
+    cache.set(AuthPrincipal(id="ann"))
+    assert cache.get("ann") is None
+
+
+def test_invalidate_distrusts_older_claims():
+    """Test that invalidation drops the entry and claims issued before it."""
+    clock = FakeClock()
+    cache = AuthStateCache(max_entries=10, ttl_seconds=30, clock=clock)
+    cache.set(AuthPrincipal(id="ann", is_admin=True))
+    assert cache.trusts_claims("ann", 990)
+
+    cache.invalidate("ann")
+
+    assert cache.get("ann") is None
+    assert not cache.trusts_claims("ann", 1000)
+    assert cache.trusts_claims("ann", 1001)
+    assert not cache.trusts_claims("ann", None)
+
+
+def test_claims_round_trip():
+    principal = AuthPrincipal(id="ann", is_admin=True, must_change_password=True)
+    assert AuthPrincipal.from_claims({"sub": "ann", **principal.to_claims()}) == principal
+    assert AuthPrincipal.from_claims({"sub": "ann"}) is None
@@ -0,0 +1,67 @@
+"""
+Unit tests for the database engine factory.
+"""
+
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.core.database import create_db_engine
+
+
+def pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_file_engine_applies_pragmas(tmp_path, monkeypatch):
+    """Test WAL, synchronous, busy timeout and cache size on a file database."""
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "1234")
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1
+    assert pragma(engine, "busy_timeout") == 1234
+    assert pragma(engine, "cache_size") == -65536
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 7
+    engine.dispose()
+
+
+def test_memory_engine_skips_file_pragmas():
+    """Test that in-memory databases keep their journal and default pool."""
+    engine = create_db_engine("sqlite://")
+
+    assert pragma(engine, "journal_mode") == "memory"
+    assert pragma(engine, "busy_timeout") == 5000
+    assert not isinstance(engine.pool, QueuePool)
+
+
+def test_concurrent_writers_do_not_lock(tmp_path):
+    """Test that concurrent write transactions wait for each other instead of failing."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'stress.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE counter (n INTEGER)"))
+    errors = []
+
+    def write():
+        try:
+            for _ in range(20):
+                with engine.begin() as connection:
+                    connection.execute(text("SELECT count(*) FROM counter")).scalar()
+                    connection.execute(text("INSERT INTO counter VALUES (1)"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM counter")).scalar() == 160
+    engine.dispose()
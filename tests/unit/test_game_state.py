@@ -0,0 +1,55 @@
+"""
+Unit tests for the game setup encoding.
+"""
+
+import json
+import random
+
+import pytest
+
+from app.core.database import SyncSessionAdapter
+from app.models import GameSession, User
+from app.services.game_service import GameEngine
+from app.services.game_state import GOD_ORDERS, GameState
+
+STATES = {GameState(order, swapped) for order in range(6) for swapped in (False, True)}
+
+
+def test_every_state_round_trips_through_the_columns():
+    """Test all 6 god orders x 2 language maps read back from a GameSession."""
+    for state in STATES:
+        stored = GameSession(
+            user_id="player", god_order=state.order, language_swapped=state.swapped
+        )
+        decoded = GameState.from_session(stored)
+        assert decoded is GameState.from_session(stored)
+        assert decoded == state
+        assert sorted(decoded.identities) == ["False", "Random", "True"]
+    assert len(GOD_ORDERS) == 6
+    assert {GameState.deal(random.Random(seed)) for seed in range(200)} == STATES
+
+
+def test_legacy_json_decodes_to_the_same_state():
+    """Test the decoder the compaction migration uses for the old JSON columns."""
+    for state in STATES:
+        decoded = GameState.from_json(json.dumps(state.identities), json.dumps(state.language_map))
+        assert decoded == state
+    with pytest.raises(ValueError):
+        GameState.from_json("[]", "{}")
+
+
+@pytest.mark.asyncio
+async def test_engine_stores_the_dealt_state(session):
+    """Test that a new game is stored as god_order/language_swapped and judged by them."""
+    session.add(User(id="player", hashed_password="x"))
+    session.commit()
+    engine = GameEngine()
+    db = SyncSessionAdapter(session)
+
+    game = await engine.start_new_game("player", db)
+    session.expire_all()
+    stored = session.get(GameSession, game.session_id)
+    state = engine.game_state(stored)
+    assert (state.order, state.swapped) == (stored.god_order, stored.language_swapped)
+
+    assert await engine.submit_guess(stored, state.identities, db) is True
@@ -0,0 +1,44 @@
+"""
+Unit tests for stateless game tokens.
+"""
+
+import jwt
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import InvalidGameTokenError
+from app.services.game_state import GameState
+from app.services.game_token import issue_game_token, read_game_token
+
+
+def test_every_state_round_trips():
+    """Test that each of the 12 setups comes back from its token."""
+    for order in range(6):
+        for swapped in (False, True):
+            user_id, token_id, state = read_game_token(
+                issue_game_token("player", GameState(order, swapped))
+            )
+            assert (user_id, state) == ("player", GameState(order, swapped))
+            assert token_id
+
+
+def test_setup_is_not_readable_from_the_token():
+    """Test that one setup is sent under many different values."""
+    state = GameState(2, True)
+    sent = {
+        jwt.decode(issue_game_token("player", state), options={"verify_signature": False})["setup"]
+        for _ in range(200)
+    }
+    assert len(sent) > 6
+
+
+def test_other_tokens_are_rejected():
+    """Test that an access token or a token signed with the plain secret is not a game token."""
+    forged = jwt.encode(
+        {"typ": "game", "sub": "player", "jti": "x", "setup": 0},
+        settings.secret_key,
+        algorithm=settings.algorithm,
+    )
+    for token in (forged, "not-a-token"):
+        with pytest.raises(InvalidGameTokenError):
+            read_game_token(token)
@@ -0,0 +1,98 @@
+"""
+Unit tests for group-committed game moves.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.core.database import SyncSessionAdapter
+from app.models import GameMove, GameSession, User, UserStats
+from app.services.group_commit import GroupCommitWriter, MoveWrite
+
+
+@pytest.fixture
+def games(session):
+    session.add(User(id="player", hashed_password="x"))
+    session.commit()
+    games = [GameSession(user_id="player") for _ in range(3)]
+    session.add_all(games)
+    session.commit()
+    return [game.session_id for game in games]
+
+
+def move_write(session_id: int, round_number: int, question_count=None) -> MoveWrite:
+    move = {
+        "session_id": session_id,
+        "round": round_number,
+        "god_index": 0,
+        "question": f"Q{round_number}?",
+        "answer": "Ja",
+        "is_masked": question_count is None,
+    }
+    return MoveWrite(move, "player", question_count)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(session, games):
+    """Test that moves queued together are written in a single transaction."""
+    commits = []
+    event.listen(session.get_bind(), "commit", lambda connection: commits.append(1))
+    writer = GroupCommitWriter(max_delay=0.05, max_batch=10)
+    db = SyncSessionAdapter(session)
+
+    await asyncio.gather(
+        writer.write(db, move_write(games[0], 1, question_count=1)),
+        writer.write(db, move_write(games[1], 1, question_count=1)),
+        writer.write(db, move_write(games[2], 1)),
+    )
+
+    assert len(commits) == 1
+    assert writer.stats()["batches"] == 1 and writer.stats()["writes"] == 3
+    session.expire_all()
+    assert [session.get(GameSession, game).current_question_count for game in games] == [1, 1, 0]
+    assert len(session.exec(select(GameMove)).all()) == 3
+    assert session.get(UserStats, "player").games == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_singly(session, games):
+    """Test that one bad move fails only its own request."""
+    writer = GroupCommitWriter(max_delay=0.05, max_batch=10)
+    db = SyncSessionAdapter(session)
+    await writer.write(db, move_write(games[0], 1, question_count=1))
+
+    duplicate, fresh = await asyncio.gather(
+        writer.write(db, move_write(games[0], 1, question_count=2)),
+        writer.write(db, move_write(games[1], 1, question_count=1)),
+        return_exceptions=True,
+    )
+
+    assert isinstance(duplicate, IntegrityError)
+    assert fresh is None
+    session.expire_all()
+    assert session.get(GameSession, games[0]).current_question_count == 1
+    assert session.get(GameSession, games[1]).current_question_count == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_round_in_batch_fails_alone(session, games):
+    """Test that two moves for one round in a batch fail only the later request."""
+    writer = GroupCommitWriter(max_delay=0.05, max_batch=10)
+    db = SyncSessionAdapter(session)
+
+    first, duplicate, other = await asyncio.gather(
+        writer.write(db, move_write(games[0], 1, question_count=1)),
+        writer.write(db, move_write(games[0], 1, question_count=1)),
+        writer.write(db, move_write(games[1], 1, question_count=1)),
+        return_exceptions=True,
+    )
+
+    assert (first, other) == (None, None)
+    assert isinstance(duplicate, IntegrityError)
+    session.expire_all()
+    assert len(session.exec(select(GameMove)).all()) == 2
+    assert session.get(UserStats, "player").games == 2
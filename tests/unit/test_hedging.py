@@ -0,0 +1,89 @@
+"""
+Unit tests for hedged LLM requests in the game engine.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import LLMAnswerError
+from app.services.game_service import GameEngine
+from app.services.llm_service import GodAnswer, llm_service
+
+IDENTITIES = ["True", "False", "Random"]
+LANGUAGE_MAP = {"Yes": "Ja", "No": "Da"}
+
+
+def scripted_llm(monkeypatch, script):
+    """Replace ask_god with calls that follow (delay, answer) steps in order."""
+    calls = {"started": 0, "cancelled": 0, "coalesce": []}
+
+    async def fake_ask_god(*args, **kwargs):
+        calls["coalesce"].append(kwargs.get("coalesce", True))
+        delay, answer = script[calls["started"]]
+        calls["started"] += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls["cancelled"] += 1
+            raise
+        if isinstance(answer, Exception):
+            raise answer
+        return GodAnswer(answer)
+
+    monkeypatch.setattr(llm_service, "ask_god", fake_ask_god)
+    return calls
+
+
+async def ask(engine: GameEngine) -> str:
+    answer = await engine._ask_hedged("True", LANGUAGE_MAP, "Is Ja yes?", IDENTITIES, 0)
+    return answer.text
+
+
+class TestHedgedRequests:
+    """Test racing hedged requests for one answer."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_slow_primary(self, monkeypatch):
+        """Test that a fast hedge answers and the slow primary is cancelled."""
+        monkeypatch.setenv("LLM_HEDGE_DELAY", "0.05")
+        calls = scripted_llm(monkeypatch, [(5.0, "Ja"), (0.01, "Da")])
+        engine = GameEngine()
+
+        assert await ask(engine) == "Da"
+        assert calls["cancelled"] == 1
+        assert calls["coalesce"] == [True, False]
+        assert engine.hedge_stats == {"questions": 1, "hedges_sent": 1, "hedges_won": 1}
+
+    @pytest.mark.asyncio
+    async def test_primary_answer_sends_no_hedge(self, monkeypatch):
+        """Test that an answer before the hedge delay launches nothing else."""
+        monkeypatch.setenv("LLM_HEDGE_DELAY", "1")
+        calls = scripted_llm(monkeypatch, [(0.01, "Ja")])
+        engine = GameEngine()
+
+        assert await ask(engine) == "Ja"
+        assert calls["started"] == 1
+        assert engine.hedge_stats["hedges_sent"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_triggers_immediate_hedge(self, monkeypatch):
+        """Test that Unknown answers are replaced without waiting for the delay."""
+        monkeypatch.setenv("LLM_HEDGE_DELAY", "10")
+        monkeypatch.setenv("LLM_HEDGE_MAX_REQUESTS", "3")
+        scripted_llm(monkeypatch, [(0.0, "Unknown"), (0.0, "Unknown"), (0.0, "Unknown")])
+        engine = GameEngine()
+
+        assert await asyncio.wait_for(ask(engine), timeout=1) == "Unknown"
+        assert engine.hedge_stats["hedges_sent"] == 2
+        assert engine.hedge_stats["hedges_won"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_raise_when_nothing_answers(self, monkeypatch):
+        """Test that an LLM error surfaces when no request produces an answer."""
+        monkeypatch.setenv("LLM_HEDGE_DELAY", "0")
+        monkeypatch.setenv("LLM_HEDGE_MAX_REQUESTS", "2")
+        scripted_llm(monkeypatch, [(0.0, LLMAnswerError()), (0.0, "Unknown")])
+
+        with pytest.raises(LLMAnswerError):
+            await ask(GameEngine())
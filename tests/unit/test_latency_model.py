@@ -0,0 +1,121 @@
+"""
+Unit tests for the answer latency model.
+"""
+
+import bisect
+import math
+import random
+
+import pytest
+
+from app.core.database import SyncSessionAdapter
+from app.models import GameSession, User
+from app.services.game_service import game_engine
+from app.services.game_state import GameState
+from app.services.latency_model import MIN_MODEL_SAMPLES, LatencyModel, LatencySketch
+from app.services.llm_service import GodAnswer, llm_service
+
+
+def ks_statistic(first: list[float], second: list[float]) -> float:
+    """Two-sample Kolmogorov-Smirnov statistic."""
+    first, second = sorted(first), sorted(second)
+    return max(
+        abs(
+            bisect.bisect_right(first, value) / len(first)
+            - bisect.bisect_right(second, value) / len(second)
+        )
+        for value in first + second
+    )
+
+
+def ks_critical_value(n: int, m: int, alpha_coefficient: float = 1.628) -> float:
+    """Critical KS distance at alpha=0.01 for sample sizes n and m."""
+    return alpha_coefficient * math.sqrt((n + m) / (n * m))
+
+
+def llm_latency(rng: random.Random, god_type: str) -> float:
+    """Skewed, god-dependent answer times similar to real LLM calls."""
+    median = 1.8 if god_type == "True" else 2.4
+    return rng.lognormvariate(math.log(median), 0.45)
+
+
+class TestLatencySketch:
+    """Test the streaming quantile sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test that sketch quantiles track exact quantiles within 1%."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(0.5, 0.6) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch has no quantiles or samples."""
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.sample(random.Random(0)) is None
+
+
+class TestLatencyModel:
+    """Test Random-god delay sampling."""
+
+    def test_fallback_before_enough_samples(self):
+        """Test the uniform fallback while the model is still warming up."""
+        model = LatencyModel(rng=random.Random(1))
+        for _ in range(MIN_MODEL_SAMPLES - 1):
+            model.record("gpt-test", "True", 0.01)
+        assert 1.0 <= model.sample_delay("gpt-test") <= 5.0
+
+    def test_random_delays_indistinguishable_from_llm_answers(self):
+        """Test that Random-god delays pass a two-sample KS test against LLM gods."""
+        rng = random.Random(42)
+        model = LatencyModel(rng=random.Random(43))
+        for _ in range(3000):
+            god_type = rng.choice(["True", "False"])
+            model.record("gpt-test", god_type, llm_latency(rng, god_type))
+
+        observed = [llm_latency(rng, rng.choice(["True", "False"])) for _ in range(2000)]
+        simulated = [model.sample_delay("gpt-test") for _ in range(2000)]
+
+        statistic = ks_statistic(observed, simulated)
+        assert statistic < ks_critical_value(len(observed), len(simulated))
+
+    def test_models_are_tracked_separately(self):
+        """Test that delays follow the latency of the configured model only."""
+        model = LatencyModel(rng=random.Random(5))
+        for _ in range(100):
+            model.record("fast-model", "True", 0.2)
+            model.record("slow-model", "True", 8.0)
+
+        assert model.sample_delay("fast-model") == pytest.approx(0.2, rel=0.05)
+        assert model.sample_delay("slow-model") == pytest.approx(8.0, rel=0.05)
+        assert set(model.stats()) == {"fast-model/True", "slow-model/True"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cached", [False, True])
+async def test_only_fresh_answers_are_recorded(session, monkeypatch, cached):
+    """Test that cache hits and coalesced answers stay out of the latency model."""
+    session.add(User(id="player", hashed_password="x"))
+    game = GameSession(user_id="player")
+    session.add(game)
+    session.commit()
+    recorded = []
+
+    async def answer(*args, **kwargs):
+        return GodAnswer("Ja", cached=cached)
+
+    monkeypatch.setattr(llm_service, "ask_god", answer)
+    monkeypatch.setattr(
+        llm_service, "record_answer_latency", lambda god, seconds: recorded.append(god)
+    )
+    god_index = GameState.from_session(game).identities.index("True")
+    await game_engine.process_question(game, god_index, "Q?", SyncSessionAdapter(session))
+
+    assert recorded == ([] if cached else ["True"])
@@ -0,0 +1,71 @@
+"""
+Unit tests for per-route request metrics.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from app.core.metrics import Histogram, MetricsMiddleware, RouteMetrics, timed
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0, 1, 3, 9):
+        histogram.observe(value)
+    assert list(histogram.samples("q", 'route="/"')) == [
+        'q_bucket{route="/",le="1"} 2',
+        'q_bucket{route="/",le="5"} 3',
+        'q_bucket{route="/",le="+Inf"} 4',
+        'q_sum{route="/"} 13.0',
+        'q_count{route="/"} 4',
+    ]
+
+
+@pytest.fixture
+def instrumented():
+    """A small app behind MetricsMiddleware with its own registry."""
+    engine = create_engine("sqlite://")
+    metrics = RouteMetrics()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as connection:
+            for _ in range(item_id):
+                connection.execute(text("SELECT 1"))
+        with timed("llm"):
+            pass
+        return {"item_id": item_id}
+
+    yield TestClient(app), metrics
+    engine.dispose()
+
+
+def test_middleware_records_cost_per_route_template(instrumented):
+    client, metrics = instrumented
+    client.get("/items/2")
+    client.get("/items/3")
+    client.get("/missing")
+
+    items = metrics.routes[("GET", "/items/{item_id}")]
+    assert items.statuses == {200: 2}
+    assert items.queries.sum == 5
+    assert items.seconds["db"] > 0
+    assert items.seconds["llm"] > 0
+    assert metrics.routes[("GET", "unmatched")].statuses == {404: 1}
+
+
+def test_metrics_can_be_turned_off(instrumented, monkeypatch):
+    client, metrics = instrumented
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+    client.get("/items/1")
+    assert metrics.routes == {}
+
+
+def test_timed_outside_a_request_is_a_no_op():
+    with timed("bcrypt"):
+        pass
@@ -0,0 +1,107 @@
+"""
+Unit tests for the versioned migration runner.
+"""
+
+import json
+
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, select
+
+from app.core.database import create_db_engine
+from app.migrations import MIGRATIONS, applied_versions, run_migrations
+from app.models import GameMove, GameSession, User, UserStats
+from app.services.game_state import GameState
+
+LATEST = [migration.version for migration in MIGRATIONS]
+
+# GameSession as created before migration 5, with the setup stored as JSON.
+LEGACY_GAMESESSION = """
+CREATE TABLE gamesession (
+    session_id INTEGER PRIMARY KEY,
+    user_id VARCHAR NOT NULL REFERENCES user (id),
+    god_identities VARCHAR NOT NULL,
+    language_map VARCHAR NOT NULL,
+    current_question_count INTEGER NOT NULL,
+    move_history VARCHAR NOT NULL,
+    user_guesses VARCHAR,
+    is_completed BOOLEAN NOT NULL,
+    is_win BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL
+)
+"""
+
+
+def index_names(engine, table: str) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_new_database_is_created_and_stamped(tmp_path):
+    """Test that an empty database gets the full schema and every version at once."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'new.db'}")
+
+    assert run_migrations(engine) == LATEST
+    assert run_migrations(engine) == []
+
+    assert "ix_gamesession_created_at" in index_names(engine, "gamesession")
+    with Session(engine) as db:
+        assert applied_versions(db) == set(LATEST)
+    engine.dispose()
+
+
+def test_unversioned_database_runs_every_migration(tmp_path):
+    """Test upgrading a database created before schema_version existed."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, GameSession.__table__])
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_gamesession_created_at")
+    moves = [{"round": 1, "god_index": 0, "question": "Q?", "answer": "Ja"}]
+    with Session(engine) as db:
+        db.add(User(id="legacy", hashed_password="x"))
+        db.add(
+            GameSession(
+                user_id="legacy",
+                current_question_count=1,
+                is_completed=True,
+                is_win=True,
+                move_history=json.dumps(moves),
+            )
+        )
+        db.commit()
+
+    assert run_migrations(engine) == LATEST
+    assert run_migrations(engine) == []
+
+    assert "ix_gamesession_created_at" in index_names(engine, "gamesession")
+    with Session(engine) as db:
+        assert [move.question for move in db.exec(select(GameMove))] == ["Q?"]
+        stats = db.get(UserStats, "legacy")
+        assert (stats.games, stats.completed_games, stats.wins) == (1, 1, 1)
+    engine.dispose()
+
+
+def test_json_game_setup_is_compacted(tmp_path):
+    """Test that migration 5 rewrites the JSON setup columns as god_order/language_swapped."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'json.db'}")
+    SQLModel.metadata.create_all(engine, tables=[User.__table__])
+    states = [GameState(order, swapped) for order in range(6) for swapped in (False, True)]
+    with Session(engine) as db:
+        db.add(User(id="legacy", hashed_password="x"))
+        db.commit()
+    with engine.begin() as connection:
+        connection.exec_driver_sql(LEGACY_GAMESESSION)
+        connection.exec_driver_sql(
+            "INSERT INTO gamesession (user_id, god_identities, language_map, "
+            "current_question_count, move_history, is_completed, is_win, created_at) "
+            "VALUES ('legacy', ?, ?, 0, '[]', 0, 0, '2024-01-01 00:00:00')",
+            [(json.dumps(s.identities), json.dumps(s.language_map)) for s in states],
+        )
+
+    assert run_migrations(engine) == LATEST
+
+    columns = {column["name"] for column in inspect(engine).get_columns("gamesession")}
+    assert {"god_order", "language_swapped"} <= columns
+    assert not {"god_identities", "language_map"} & columns
+    with Session(engine) as db:
+        games = db.exec(select(GameSession).order_by(GameSession.session_id)).all()
+        assert [GameState.from_session(game) for game in games] == states
+    engine.dispose()
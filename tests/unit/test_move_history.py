@@ -0,0 +1,73 @@
+"""
+Unit tests for migrating JSON move history into GameMove rows.
+"""
+
+import asyncio
+import json
+
+import pytest
+from sqlmodel import Session, SQLModel, select
+
+from app.core.database import SyncSessionAdapter, create_db_engine
+from app.core.exceptions import ConcurrentMoveError
+from app.models import GameMove, GameSession, User, migrate_move_history
+from app.services.game_service import game_engine
+from app.services.llm_service import GodAnswer, llm_service
+
+
+def test_migrate_move_history_is_idempotent(session):
+    """Test that legacy blobs become ordered moves exactly once."""
+    session.add(User(id="legacy", hashed_password="x"))
+    moves = [
+        {"round": 1, "god_index": 0, "question": "Q1?", "answer": "Unknown", "is_masked": True},
+        {"round": 2, "god_index": 2, "question": "Q2?", "answer": "Ja", "is_masked": False},
+    ]
+    legacy = GameSession(user_id="legacy", move_history=json.dumps(moves))
+    empty = GameSession(user_id="legacy")
+    session.add(legacy)
+    session.add(empty)
+    session.commit()
+
+    assert migrate_move_history(session) == 1
+    assert migrate_move_history(session) == 0
+
+    rows = session.exec(select(GameMove).order_by(GameMove.round)).all()
+    assert [row.to_dict() for row in rows] == moves
+    assert {row.session_id for row in rows} == {legacy.session_id}
+    assert session.get(GameSession, legacy.session_id).move_history == "[]"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("group_commit", ["false", "true"])
+async def test_concurrent_asks_on_one_game_conflict(tmp_path, monkeypatch, group_commit):
+    """Test that two asks racing for the same round give one move and one 409."""
+    monkeypatch.setenv("MOVE_GROUP_COMMIT", group_commit)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'race.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id="racer", hashed_password="x"))
+        game = GameSession(user_id="racer")
+        db.add(game)
+        db.commit()
+        session_id = game.session_id
+
+    async def slow_answer(*args, **kwargs):
+        await asyncio.sleep(0.05)  # both requests read the moves before either writes
+        return GodAnswer("Ja")
+
+    monkeypatch.setattr(llm_service, "ask_god", slow_answer)
+
+    async def ask():
+        with Session(engine, expire_on_commit=False) as sync_db:
+            db = SyncSessionAdapter(sync_db)
+            game = await db.get(GameSession, session_id)
+            return await game_engine.process_question(game, 0, "Q?", db)
+
+    results = await asyncio.gather(ask(), ask(), return_exceptions=True)
+
+    assert sorted(type(result).__name__ for result in results) == ["ConcurrentMoveError", "dict"]
+    assert next(r for r in results if isinstance(r, ConcurrentMoveError)).status_code == 409
+    with Session(engine) as db:
+        assert len(db.exec(select(GameMove)).all()) == 1
+        assert db.get(GameSession, session_id).current_question_count == 1
+    engine.dispose()
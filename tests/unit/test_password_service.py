@@ -0,0 +1,53 @@
+"""
+Unit tests for the bounded password hashing pool.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import PasswordServiceBusyError
+from app.services.password_service import PasswordHasher
+
+
+class TestPasswordHasher:
+    """Test offloaded bcrypt hashing."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_roundtrip(self):
+        """Test hashing then verifying on the pool."""
+        hasher = PasswordHasher(max_workers=2, max_queue=2)
+        hashed = await hasher.hash("secret123")
+        assert await hasher.verify("secret123", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+
+        stats = hasher.stats()
+        assert stats["submitted"] == 3
+        assert stats["completed"] == 3
+        assert stats["pending"] == 0
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test that work beyond workers + queue depth is rejected."""
+        hasher = PasswordHasher(max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        blocked = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(PasswordServiceBusyError):
+            await hasher.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*blocked)
+        stats = hasher.stats()
+        assert stats["rejected"] == 1
+        assert stats["peak_pending"] == 2
+        hasher.shutdown()
+
+    def test_unknown_pool_kind(self):
+        """Test that an unsupported pool kind is refused."""
+        with pytest.raises(ValueError):
+            PasswordHasher(kind="fiber")
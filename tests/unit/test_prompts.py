@@ -2,7 +2,8 @@
 Unit tests for prompt templates and validation.
 """
 
-from app.services.prompts import PromptTemplates, PromptConfig
+from app.services.prompts import SHARED_RULES, TRUTH_GOD_ROLE, PromptConfig, PromptTemplates
+from app.services.prompts.canonical import CanonicalFrame
 from app.services.prompts.validator import PromptValidator
 
 
@@ -27,6 +28,13 @@ class TestPromptValidator:
         result = PromptValidator.extract_boxed_answer(response)
         assert result is None
 
+    def test_first_definite_answer_skips_placeholders(self):
+        """Test that the first boxed yes or no word is found, skipping other boxes."""
+        response = "Format \\boxed{Answer}, \\boxed{Unknown}, so \\boxed{da}, later \\boxed{Ja}"
+        assert PromptValidator.first_definite_answer(response, "Ja", "Da") == "Da"
+        assert PromptValidator.first_definite_answer("\\boxed{Ja", "Ja", "Da") is None
+        assert PromptValidator.first_definite_answer("\\boxed{Unknown}", "Ja", "Da") is None
+
     def test_validate_answer_yes(self):
         """Test validating yes answer."""
         is_valid, normalized = PromptValidator.validate_answer("Ja", "Ja", "Da")
@@ -57,9 +65,7 @@ class TestPromptTemplates:
 
     def test_build_truth_god_prompt(self):
         """Test building prompt for Truth god."""
-        config = PromptConfig(
-            yes_word="Ja", no_word="Da", god_identity="True"
-        )
+        config = PromptConfig(yes_word="Ja", no_word="Da", god_identity="True")
         prompt = PromptTemplates.build_prompt(config)
         assert "God of Truth" in prompt
         assert "Ja" in prompt
@@ -67,18 +73,91 @@ class TestPromptTemplates:
 
     def test_build_false_god_prompt(self):
         """Test building prompt for False god."""
-        config = PromptConfig(
-            yes_word="Ja", no_word="Da", god_identity="False"
-        )
+        config = PromptConfig(yes_word="Ja", no_word="Da", god_identity="False")
         prompt = PromptTemplates.build_prompt(config)
         assert "God of Falsehood" in prompt
         assert "ALWAYS lie" in prompt
 
     def test_build_random_god_prompt(self):
         """Test building prompt for Random god."""
-        config = PromptConfig(
-            yes_word="Ja", no_word="Da", god_identity="Random"
-        )
+        config = PromptConfig(yes_word="Ja", no_word="Da", god_identity="Random")
         prompt = PromptTemplates.build_prompt(config, forced_answer="Ja")
         assert "Random God" in prompt
         assert "Ja" in prompt
+
+    def test_shared_prefix_is_stable(self):
+        """Test that every god's prompt starts with the same static rules."""
+        prompts = [
+            PromptTemplates.build_prompt(
+                PromptConfig(
+                    yes_word=yes_word,
+                    no_word=no_word,
+                    god_identity=identity,
+                    all_identities=["True", "False", "Random"],
+                    god_index=index,
+                )
+            )
+            for yes_word, no_word in (("Ja", "Da"), ("Da", "Ja"))
+            for index, identity in ((0, "True"), (1, "False"))
+        ]
+        for prompt in prompts:
+            assert prompt.startswith(SHARED_RULES)
+            assert "Ja" not in prompt[: len(SHARED_RULES)]
+
+    def test_session_details_follow_role(self):
+        """Test that per-session words and identities come after the role text."""
+        config = PromptConfig(
+            yes_word="Da",
+            no_word="Ja",
+            god_identity="True",
+            all_identities=["Random", "True", "False"],
+            god_index=1,
+        )
+        prompt = PromptTemplates.build_prompt(config)
+        role_end = prompt.index(TRUTH_GOD_ROLE) + len(TRUTH_GOD_ROLE)
+        assert prompt.index("YES-word: 'Da'") > role_end
+        assert prompt.index("God B: You (True)") > role_end
+
+    def test_precomputed_prompts_match_built(self):
+        """Test that precomputed prompts are identical to freshly built ones."""
+        assert PromptTemplates.precompute() == 12
+        config = PromptConfig(
+            yes_word="Ja",
+            no_word="Da",
+            god_identity="False",
+            all_identities=["Random", "True", "False"],
+            god_index=2,
+        )
+        cached = PromptTemplates.build_prompt(config)
+        assert cached is PromptTemplates.build_prompt(config)
+        assert cached == PromptTemplates._build(config)
+
+
+class TestCanonicalFrame:
+    """Test mapping questions into the canonical Ja=Yes frame."""
+
+    def test_canonical_map_is_unchanged(self):
+        """Test that Ja=Yes games pass through untouched."""
+        frame = CanonicalFrame.for_language_map({"Yes": "Ja", "No": "Da"})
+        assert frame.to_canonical("Does Da mean yes?") == "Does Da mean yes?"
+        assert frame.from_canonical("Da") == "Da"
+
+    def test_swapped_map_rewrites_words(self):
+        """Test that Ja and Da swap while keeping case and other words intact."""
+        frame = CanonicalFrame.for_language_map({"Yes": "Da", "No": "Ja"})
+        question = "If I asked whether DA means yes, would you say ja? Jade, Dad."
+        assert frame.to_canonical(question) == (
+            "If I asked whether JA means yes, would you say da? Jade, Dad."
+        )
+
+    def test_swapped_map_restores_answer(self):
+        """Test that canonical answers map back to the game's words."""
+        frame = CanonicalFrame.for_language_map({"Yes": "Da", "No": "Ja"})
+        assert frame.from_canonical("Ja") == "Da"
+        assert frame.from_canonical("Da") == "Ja"
+        assert frame.from_canonical("Unknown") == "Unknown"
+
+    def test_words_next_to_cjk_text(self):
+        """Test that words adjacent to non-Latin text are still recognized."""
+        frame = CanonicalFrame.for_language_map({"Yes": "Da", "No": "Ja"})
+        assert frame.to_canonical("Ja是肯定吗") == "Da是肯定吗"
@@ -0,0 +1,108 @@
+"""
+Unit tests for the abandoned-session reaper and game archiving.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from app.models import GameMove, GameMoveArchive, GameSession, GameSessionArchive, User
+from app.services.reaper import SessionReaper, archive_games
+
+NOW = datetime(2025, 6, 1)
+
+
+def add_game(session, age: timedelta, questions: int = 0, completed: bool = False) -> int:
+    game = GameSession(
+        user_id="player",
+        current_question_count=questions,
+        is_completed=completed,
+        created_at=NOW - age,
+    )
+    session.add(game)
+    session.commit()
+    for round_number in range(1, questions + 1):
+        session.add(
+            GameMove(
+                session_id=game.session_id,
+                round=round_number,
+                god_index=0,
+                question=f"Q{round_number}?",
+                answer="Ja",
+            )
+        )
+    session.commit()
+    return game.session_id
+
+
+def test_reaper_deletes_unplayed_and_archives_old_games(session, db_mode):
+    """Test one run against games of every age and state, then an idle run."""
+    session.add(User(id="player", hashed_password="x"))
+    session.commit()
+    add_game(session, timedelta(days=2))
+    add_game(session, timedelta(days=2), completed=True)
+    fresh_unplayed = add_game(session, timedelta(hours=1))
+    masked_only = add_game(session, timedelta(days=2))
+    session.add(
+        GameMove(
+            session_id=masked_only,
+            round=1,
+            god_index=0,
+            question="Q?",
+            answer="Unknown",
+            is_masked=True,
+        )
+    )
+    session.commit()
+    archived = add_game(session, timedelta(days=40), questions=2, completed=True)
+    recent = add_game(session, timedelta(days=1), questions=3, completed=True)
+
+    reaper = SessionReaper(
+        session.get_bind(), abandoned_ttl_seconds=86400, archive_after_days=30, batch_size=1
+    )
+    report = reaper.run_once(NOW)
+
+    assert (report.abandoned_deleted, report.games_archived, report.moves_archived) == (2, 1, 2)
+    session.expire_all()
+    hot = session.exec(select(GameSession.session_id).order_by(GameSession.session_id)).all()
+    assert hot == [fresh_unplayed, masked_only, recent]
+    assert session.get(GameSessionArchive, archived).is_completed is True
+    moves = session.exec(select(GameMoveArchive).order_by(GameMoveArchive.round)).all()
+    assert [move.to_dict()["question"] for move in moves] == ["Q1?", "Q2?"]
+    assert {move.session_id for move in session.exec(select(GameMove))} == {masked_only, recent}
+
+    assert reaper.run_once(NOW).abandoned_deleted == 0
+    assert reaper.stats()["runs"] == 2
+    assert reaper.stats()["totals"]["games_archived"] == 1
+
+
+def test_archive_leaves_unfinished_games_hot(session, db_mode):
+    """Test that an old game still in progress keeps its moves in the hot tables."""
+    session.add(User(id="player", hashed_password="x"))
+    session.commit()
+    unfinished = add_game(session, timedelta(days=40), questions=2)
+
+    assert archive_games(session, NOW - timedelta(days=30)) == (0, 0)
+    session.expire_all()
+    assert session.get(GameSession, unfinished) is not None
+    assert session.get(GameSessionArchive, unfinished) is None
+    assert len(session.exec(select(GameMove)).all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_only_the_lock_holder_runs(session, tmp_path, monkeypatch):
+    """Test that one of two workers sharing a lock file reaps, until it stops."""
+    lock_path = str(tmp_path / "reaper.lock")
+    workers = [SessionReaper(session.get_bind(), 3600, 30, lock_path=lock_path) for _ in range(2)]
+    for worker in workers:
+        monkeypatch.setattr(worker, "run_once", lambda: None)
+        worker.start(0.01)
+    await asyncio.sleep(0.1)
+
+    assert [worker.stats()["leader"] for worker in workers] == [True, False]
+    await workers[0].stop()
+    await asyncio.sleep(0.1)
+    assert workers[1].stats()["leader"]
+    await workers[1].stop()
@@ -0,0 +1,103 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test sharing one in-flight call between concurrent callers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Test that identical concurrent keys run the function once."""
+        flight: SingleFlight[str] = SingleFlight()
+        runs = []
+
+        async def work() -> str:
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return "Ja"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        assert results == ["Ja"] * 5
+        assert len(runs) == 1
+        stats = flight.stats()
+        assert stats["upstream_calls"] == 1
+        assert stats["coalesced"] == 4
+        assert stats["coalescing_ratio"] == pytest.approx(0.8)
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        """Test that distinct keys get their own calls."""
+        flight: SingleFlight[str] = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0.01)
+            return "Da"
+
+        await asyncio.gather(flight.do("a", work), flight.do("b", work))
+        assert flight.stats()["upstream_calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test that a failed shared call raises for all waiting callers."""
+        flight: SingleFlight[str] = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", work), flight.do("key", work), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_keeps_flight_alive(self):
+        """Test that cancelling one caller does not cancel the shared call."""
+        flight: SingleFlight[str] = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0.05)
+            return "Ja"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "Ja"
+
+
+@pytest.mark.asyncio
+async def test_llm_service_coalesces_identical_questions(fake_llm):
+    """Test that concurrent identical asks send one LLM request."""
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.05)
+        message = SimpleNamespace(content="\\boxed{Ja}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    service = fake_llm(create)
+    language_map = {"Yes": "Ja", "No": "Da"}
+    identities = ["True", "False", "Random"]
+
+    answers = await asyncio.gather(
+        *(service.ask_god("True", language_map, "Is Ja yes?", identities, 0) for _ in range(4)),
+        service.ask_god("True", language_map, "Is Ja yes?", identities, 0, coalesce=False),
+    )
+
+    assert [answer.text for answer in answers] == ["Ja"] * 5
+    assert [answer.cached for answer in answers] == [False, True, True, True, False]
+    assert len(calls) == 2
+    assert service.inflight.stats()["coalesced"] == 3
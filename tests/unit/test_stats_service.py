@@ -0,0 +1,71 @@
+"""
+Unit tests for the incrementally maintained game counters.
+"""
+
+import pytest
+from sqlmodel import delete
+
+from app.core.database import SyncSessionAdapter
+from app.models import User, UserStats, backfill_user_stats
+from app.services.game_service import GameEngine
+from app.services.stats_service import global_stats
+
+
+@pytest.fixture
+def player(session):
+    session.add(User(id="player", hashed_password="x"))
+    session.commit()
+    return "player"
+
+
+async def _play(engine: GameEngine, db: SyncSessionAdapter, user_id: str, questions: int):
+    game = await engine.start_new_game(user_id, db)
+    for _ in range(questions):
+        await engine.process_question(game, 0, "Is Ja yes?", db)
+    return game
+
+
+class TestUserStats:
+    """Test that counters follow questions and guesses."""
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_games(self, session, player):
+        """Test counting played, completed and won games, including resubmission."""
+        engine = GameEngine()
+        db = SyncSessionAdapter(session)
+        won = await _play(engine, db, player, 2)
+        lost = await _play(engine, db, player, 1)
+        unplayed = await _play(engine, db, player, 0)
+        await _play(engine, db, player, 1)
+
+        await engine.submit_guess(won, engine.game_state(won).identities, db)
+        await engine.submit_guess(lost, ["Nobody"] * 3, db)
+        await engine.submit_guess(unplayed, engine.game_state(unplayed).identities, db)
+
+        stats = session.get(UserStats, player)
+        assert (stats.games, stats.completed_games, stats.wins) == (3, 2, 1)
+
+        await engine.submit_guess(won, ["Nobody"] * 3, db)
+        await engine.submit_guess(lost, engine.game_state(lost).identities, db)
+        await engine.submit_guess(lost, engine.game_state(lost).identities, db)
+        session.refresh(stats)
+        assert (stats.games, stats.completed_games, stats.wins) == (3, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_backfill_matches_counters(self, session, player):
+        """Test that backfilling from GameSession gives the same totals."""
+        engine = GameEngine()
+        db = SyncSessionAdapter(session)
+        for questions in (1, 3, 0, 2):
+            game = await _play(engine, db, player, questions)
+            await engine.submit_guess(game, engine.game_state(game).identities, db)
+        maintained = await global_stats(db)
+
+        session.exec(delete(UserStats))
+        session.commit()
+        assert backfill_user_stats(session) == 1
+        assert backfill_user_stats(session) == 0
+
+        assert await global_stats(db) == maintained
+        assert maintained["total_games"] == 3
+        assert maintained["overall_win_rate"] == 100
@@ -0,0 +1,150 @@
+"""
+Unit tests for adaptive max_tokens and early-stop streaming.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.token_budget import MIN_BUDGET_SAMPLES, TokenBudget
+
+
+class TestTokenBudget:
+    """Test the per-god max_tokens budget."""
+
+    def test_ceiling_until_enough_samples(self):
+        """Test that the configured ceiling is used while the budget warms up."""
+        budget = TokenBudget(ceiling=4096, floor=64)
+        for _ in range(MIN_BUDGET_SAMPLES - 1):
+            budget.record("True", 30)
+        assert budget.max_tokens("True") == 4096
+
+    def test_budget_follows_observed_lengths(self):
+        """Test that the budget settles a little above the observed tail."""
+        budget = TokenBudget(ceiling=4096, floor=16)
+        for tokens in range(1, 101):
+            budget.record("True", tokens)
+        assert 190 <= budget.max_tokens("True") <= 210
+        assert budget.max_tokens("False") == 4096
+
+    def test_budget_respects_floor_and_disable(self):
+        """Test the floor and the disabled mode."""
+        budget = TokenBudget(ceiling=4096, floor=64)
+        disabled = TokenBudget(ceiling=4096, floor=64, enabled=False)
+        for _ in range(MIN_BUDGET_SAMPLES):
+            budget.record("True", 5)
+            disabled.record("True", 5)
+        assert budget.max_tokens("True") == 64
+        assert disabled.max_tokens("True") == 4096
+
+    def test_truncation_backs_off_to_ceiling(self):
+        """Test that a truncated answer pushes the budget back to the ceiling."""
+        budget = TokenBudget(ceiling=4096, floor=16)
+        for _ in range(MIN_BUDGET_SAMPLES):
+            budget.record("False", 20)
+        budget.record("False", 40, truncated=True)
+        assert budget.max_tokens("False") == 4096
+        assert budget.stats()["False"]["truncations"] == 1
+
+
+class FakeStream:
+    """Async stream of chat completion chunks."""
+
+    def __init__(self, deltas: list[str]):
+        self.deltas = deltas
+        self.sent = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent == len(self.deltas):
+            raise StopAsyncIteration
+        delta = SimpleNamespace(content=self.deltas[self.sent])
+        self.sent += 1
+        finish_reason = "stop" if self.sent == len(self.deltas) else None
+        choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestEarlyStop:
+    """Test that streamed answers stop at the first valid boxed answer."""
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_after_answer(self, monkeypatch, fake_llm):
+        """Test that the stream is closed before the trailing tokens arrive."""
+        monkeypatch.setenv("LLM_STREAM_ENABLED", "true")
+        stream = FakeStream(["The ", "answer ", "is ", "\\boxed{", "Da", "}", " because", " ..."])
+
+        async def create(**kwargs):
+            assert kwargs["stream"] is True
+            return stream
+
+        service = fake_llm(create)
+        answer = await service.ask_god("True", {"Yes": "Ja", "No": "Da"}, "Is Da yes?")
+
+        assert answer.text == "Da"
+        assert stream.sent == 6
+        assert stream.closed
+        assert service.usage_stats["early_stops"] == 1
+        assert service.usage_stats["completion_tokens"] == 6
+
+    @pytest.mark.asyncio
+    async def test_invalid_box_does_not_stop(self, monkeypatch, fake_llm):
+        """Test that a boxed placeholder does not end the stream early."""
+        monkeypatch.setenv("LLM_STREAM_ENABLED", "true")
+        stream = FakeStream(["Format: \\boxed{Answer}", ". So ", "\\boxed{Ja}", " done"])
+
+        async def create(**kwargs):
+            return stream
+
+        service = fake_llm(create)
+        answer = await service.ask_god("True", {"Yes": "Ja", "No": "Da"}, "Is Ja yes?")
+
+        assert answer.text == "Ja"
+        assert stream.sent == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_box_does_not_stop(self, monkeypatch, fake_llm):
+        """Test that the stream reads on past Unknown, as the full completion would."""
+        monkeypatch.setenv("LLM_STREAM_ENABLED", "true")
+        stream = FakeStream(["\\boxed{Unknown}", " on reflection ", "\\boxed{Da}", " done"])
+
+        async def create(**kwargs):
+            return stream
+
+        service = fake_llm(create)
+        answer = await service.ask_god("True", {"Yes": "Ja", "No": "Da"}, "Is Da yes?")
+
+        assert answer.text == "Da"
+        assert stream.sent == 3
+
+    @pytest.mark.asyncio
+    async def test_truncated_answer_retries_with_ceiling(self, monkeypatch, fake_llm):
+        """Test that an answer cut off by the adaptive budget is retried in full."""
+        budgets = []
+
+        async def create(**kwargs):
+            budgets.append(kwargs["max_tokens"])
+            if kwargs["max_tokens"] < 4096:
+                message = SimpleNamespace(content="Let me think about")
+                choice = SimpleNamespace(message=message, finish_reason="length")
+            else:
+                message = SimpleNamespace(content="\\boxed{Ja}")
+                choice = SimpleNamespace(message=message, finish_reason="stop")
+            return SimpleNamespace(choices=[choice], usage=None)
+
+        monkeypatch.setenv("OPENAI_MAX_TOKENS", "4096")
+        service = fake_llm(create)
+        for _ in range(MIN_BUDGET_SAMPLES):
+            service.token_budget.record("True", 10)
+
+        answer = await service.ask_god("True", {"Yes": "Ja", "No": "Da"}, "Is Ja yes?")
+
+        assert answer.text == "Ja"
+        assert budgets == [64, 4096]
+        assert service.token_budget.max_tokens("True") == 4096